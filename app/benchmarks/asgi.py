@@ -0,0 +1,74 @@
+import json
+from http.cookies import SimpleCookie
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import FastAPI
+
+
+async def asgi_request(
+    app: FastAPI,
+    method: str,
+    path: str,
+    body: Optional[Any] = None,
+    headers: Optional[Dict[str, str]] = None,
+    cookies: Optional[Dict[str, str]] = None,
+) -> Tuple[int, Dict[str, str], bytes]:
+    """Выполняет HTTP запрос к ASGI приложению напрямую, без сети и HTTP клиента.
+
+    cookies работает как хранилище клиента: отправляется в заголовке Cookie
+    и пополняется значениями из Set-Cookie ответа.
+    """
+    raw_body = json.dumps(body).encode() if body is not None else b""
+    raw_headers: List[Tuple[bytes, bytes]] = [(b"host", b"benchmark")]
+    if body is not None:
+        raw_headers.append((b"content-type", b"application/json"))
+    for key, value in (headers or {}).items():
+        raw_headers.append((key.lower().encode(), value.encode()))
+    if cookies:
+        cookie_header = "; ".join(f"{key}={value}" for key, value in cookies.items())
+        raw_headers.append((b"cookie", cookie_header.encode()))
+
+    path, _, query = path.partition("?")
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "root_path": "",
+        "headers": raw_headers,
+        "client": ("127.0.0.1", 50000),
+        "server": ("benchmark", 80),
+    }
+
+    request_sent = False
+    status_code = 500
+    response_headers: Dict[str, str] = {}
+    chunks: List[bytes] = []
+
+    async def receive():
+        nonlocal request_sent
+        if request_sent:
+            return {"type": "http.disconnect"}
+        request_sent = True
+        return {"type": "http.request", "body": raw_body, "more_body": False}
+
+    async def send(message):
+        nonlocal status_code
+        if message["type"] == "http.response.start":
+            status_code = message["status"]
+            for key, value in message.get("headers", []):
+                response_headers[key.decode().lower()] = value.decode()
+                # Заголовков Set-Cookie несколько, в словаре остался бы только последний
+                if cookies is not None and key.lower() == b"set-cookie":
+                    for name, morsel in SimpleCookie(value.decode()).items():
+                        cookies[name] = morsel.value
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+
+    return status_code, response_headers, b"".join(chunks)
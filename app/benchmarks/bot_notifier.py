@@ -0,0 +1,105 @@
+"""Задержка уведомления бота о заказе: новая ClientSession на запрос против общего пула.
+
+Запуск из директории app (БД не нужна, бот заменяется локальной заглушкой):
+    python -m benchmarks.bot_notifier --orders 500 --concurrency 10
+
+Уведомление отправляется внутри запроса POST /order, поэтому его время
+входит в задержку создания заказа. Раньше на каждый запрос создавалась
+своя ClientSession: новый пул, TCP-соединение с telegram-bot:8001 и его
+закрытие. Теперь сессия одна на процесс, соединения переиспользуются
+(keep-alive), и на заказ остается только сам POST.
+"""
+import argparse
+import asyncio
+import sys
+import time
+from typing import List
+
+from aiohttp import ClientSession, web
+
+from src.config import get_config
+from src.domain.enums.enums import OrderAction
+from src.infrastructure.adapters.notification.http_notifier import HttpOrderNotifier
+from src.ioc.providers.http_provider import HTTPProvider
+
+
+def percentile(values: List[float], percent: float) -> float:
+    values = sorted(values)
+    index = min(int(len(values) * percent / 100), len(values) - 1)
+    return values[index]
+
+
+async def start_bot_stub() -> tuple[web.AppRunner, int]:
+    async def notification(request: web.Request) -> web.Response:
+        await request.json()
+        return web.json_response({"success": True}, status=201)
+
+    app = web.Application()
+    app.router.add_post("/bot/notifications/order", notification)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, port
+
+
+async def measure(send, orders: int, concurrency: int) -> List[float]:
+    latencies: List[float] = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(order_id: int) -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            await send(order_id)
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    await asyncio.gather(*(one(order_id) for order_id in range(orders)))
+    return latencies
+
+
+async def run(orders: int, concurrency: int) -> None:
+    runner, port = await start_bot_stub()
+    config = get_config()
+    config.bot.environment = "development"
+    config.bot.bot_host = "127.0.0.1"
+    config.bot.bot_port = port
+
+    async def per_request_session(order_id: int) -> None:
+        # Как было: сессия в scope запроса
+        async with ClientSession() as session:
+            notifier = HttpOrderNotifier(session, config)
+            await notifier.send_order_info_to_bot(1, order_id, "benchmark", "created", OrderAction.TAKEAWAY)
+
+    session_provider = HTTPProvider().get_session(config)
+    shared_session = await anext(session_provider)
+    shared_notifier = HttpOrderNotifier(shared_session, config)
+
+    async def shared_pool(order_id: int) -> None:
+        await shared_notifier.send_order_info_to_bot(1, order_id, "benchmark", "created", OrderAction.TAKEAWAY)
+
+    try:
+        print(f"{'client':<24} {'orders/s':>9} {'p50 ms':>8} {'p99 ms':>8}")
+        for name, send in (("session per request", per_request_session), ("shared pool", shared_pool)):
+            started = time.perf_counter()
+            latencies = await measure(send, orders, concurrency)
+            elapsed = time.perf_counter() - started
+            print(
+                f"{name:<24} {orders / elapsed:>9.0f} "
+                f"{percentile(latencies, 50):>8.2f} {percentile(latencies, 99):>8.2f}"
+            )
+    finally:
+        await session_provider.aclose()
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--orders", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=10)
+    args = parser.parse_args()
+
+    if sys.platform == "win32":
+        asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+
+    asyncio.run(run(args.orders, args.concurrency))
@@ -0,0 +1,70 @@
+"""Запросы в секунду для справочников с кэшем готовых ответов и без него.
+
+Запуск из директории app (нужна БД из .env с данными):
+    python -m benchmarks.catalog_responses --requests 500
+
+Для каждого маршрута три режима:
+    cold - кэш сбрасывается перед каждым запросом (как было до кэша:
+           запрос в БД и сериализация через response_model);
+    warm - ответ отдается готовыми байтами из памяти процесса;
+    304  - клиент прислал If-None-Match, тело не передается.
+"""
+import argparse
+import asyncio
+import sys
+import time
+
+from main import create_application
+from benchmarks.asgi import asgi_request
+from src.application.interfaces.cache.response_cache import IResponseCache
+
+
+ROUTES = [
+    "/city",
+    "/restaurant/city/1",
+    "/category",
+    "/category/restaurant/1",
+    "/feature",
+    "/ingredient/addings/1",
+]
+
+
+async def measure(app, path: str, requests: int, before_request=None, headers=None) -> float:
+    started = time.perf_counter()
+    for _ in range(requests):
+        if before_request:
+            before_request()
+        await asgi_request(app, "GET", path, headers=headers)
+
+    return requests / (time.perf_counter() - started)
+
+
+async def run(requests: int) -> None:
+    app = create_application()
+    response_cache: IResponseCache = await app.state.dishka_container.get(IResponseCache)
+
+    print(f"{'route':<28} {'status':>6} {'cold rps':>10} {'warm rps':>10} {'304 rps':>10}")
+    for path in ROUTES:
+        status_code, headers, _ = await asgi_request(app, "GET", path)
+        if status_code != 200:
+            print(f"{path:<28} {status_code:>6}")
+            continue
+
+        cold = await measure(app, path, requests, before_request=response_cache.invalidate)
+        warm = await measure(app, path, requests)
+        not_modified = await measure(app, path, requests, headers={"If-None-Match": headers["etag"]})
+
+        print(f"{path:<28} {status_code:>6} {cold:>10.0f} {warm:>10.0f} {not_modified:>10.0f}")
+
+    await app.state.dishka_container.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+
+    if sys.platform == "win32":
+        asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+
+    asyncio.run(run(args.requests))
@@ -0,0 +1,83 @@
+"""Стоимость сборки конфигурации: на каждый запрос против одного раза при старте.
+
+Запуск из директории app (БД не нужна):
+    python -m benchmarks.config_overhead --requests 2000
+
+Раньше exception_middleware вызывал create_config() на каждый HTTP-запрос:
+шесть классов pydantic_settings заново читали окружение и .env с диска.
+Теперь конфиг собирается один раз (get_config), лежит в app.state и в
+APP-скоупе dishka, а перечитывается только по SIGHUP.
+
+Скрипт печатает время одной сборки конфига и пропускную способность
+служебного эндпоинта /metrics бота с прежним поведением (middleware,
+собирающий конфиг) и без него.
+"""
+import argparse
+import asyncio
+import sys
+import time
+
+import httpx
+
+from src.config import create_config, get_config
+
+
+def measure_build(iterations: int) -> None:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        create_config()
+    per_call = (time.perf_counter() - started) / iterations * 1e6
+
+    get_config()
+    started = time.perf_counter()
+    for _ in range(iterations):
+        get_config()
+    cached = (time.perf_counter() - started) / iterations * 1e6
+
+    print(f"create_config(): {per_call:.1f} us/call, get_config(): {cached:.3f} us/call")
+
+
+async def measure_requests(requests: int, per_request_config: bool) -> float:
+    from telegram_bot_main import create_application
+
+    app = create_application()
+    if per_request_config:
+        # Прежнее поведение exception_middleware
+        async def parse_config(request, call_next):
+            create_config()
+            return await call_next(request)
+
+        app.middleware("http")(parse_config)
+
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bot") as client:
+            await client.get("/metrics")
+            started = time.perf_counter()
+            for _ in range(requests):
+                response = await client.get("/metrics")
+                response.raise_for_status()
+            return requests / (time.perf_counter() - started)
+    finally:
+        await app.state.dishka_container.close()
+
+
+async def run(requests: int, iterations: int) -> None:
+    measure_build(iterations)
+
+    print(f"{'config':<24} {'requests/s':>11}")
+    for name, per_request_config in (("parsed per request", True), ("built once", False)):
+        rate = await measure_requests(requests, per_request_config)
+        print(f"{name:<24} {rate:>11.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args()
+
+    if sys.platform == "win32":
+        asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+
+    asyncio.run(run(args.requests, args.iterations))
@@ -0,0 +1,104 @@
+import json
+from typing import Any, Dict
+
+import psycopg
+from psycopg import sql
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from benchmarks.order_create import build_request
+from src.config import get_config
+from src.infrastructure.drivers.db.base import Base
+from src.infrastructure.drivers.db.tables import (
+    City,
+    Feature,
+    Food,
+    MenuCategory,
+    Restaurant,
+    WorkingHours,
+)
+
+
+async def recreate_database(database: str, drop_only: bool = False) -> None:
+    """Пересоздает отдельную базу для проверки: нужен пользователь с правом CREATEDB"""
+    admin = get_config().postgres.model_copy(update={"db": "postgres"})
+    async with await psycopg.AsyncConnection.connect(
+        admin.build_conninfo(), autocommit=True, connect_timeout=10
+    ) as connection:
+        await connection.execute(
+            sql.SQL("DROP DATABASE IF EXISTS {} WITH (FORCE)").format(sql.Identifier(database))
+        )
+        if not drop_only:
+            await connection.execute(sql.SQL("CREATE DATABASE {}").format(sql.Identifier(database)))
+
+
+async def seed(app) -> async_sessionmaker[AsyncSession]:
+    # Импорт создает свой контейнер, поэтому только после переключения базы
+    from vivat_data_generator import generate_data
+
+    engine: AsyncEngine = await app.state.dishka_container.get(AsyncEngine)
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+
+    session_maker = async_sessionmaker(engine, expire_on_commit=False)
+    async with session_maker() as session:
+        await generate_data(session)
+        await session.commit()
+
+    return session_maker
+
+
+async def sample_ids(session_maker: async_sessionmaker[AsyncSession]) -> Dict[str, Any]:
+    async with session_maker() as session:
+        return {
+            "city_id": await session.scalar(select(City.id).limit(1)),
+            "coords": (await session.execute(select(City.latitude, City.longitude).limit(1))).one(),
+            "feature_id": await session.scalar(select(Feature.id).limit(1)),
+            "restaurant_id": await session.scalar(
+                select(Restaurant.id).where(Restaurant.is_active == True).limit(1)
+            ),
+            "category_id": await session.scalar(
+                select(MenuCategory.id).where(MenuCategory.need_addings == True).limit(1)
+            ),
+            "food_id": await session.scalar(select(Food.id).limit(1)),
+        }
+
+
+async def order_body(session_maker: async_sessionmaker[AsyncSession], positions: int) -> dict:
+    async with session_maker() as session:
+        order_request, _ = await build_request(session, positions)
+    return json.loads(order_request.model_dump_json())
+
+
+async def add_restaurants(session_maker: async_sessionmaker[AsyncSession], city_id: int, count: int) -> None:
+    async with session_maker() as session:
+        template = await session.scalar(select(Restaurant).where(Restaurant.city_id == city_id).limit(1))
+        hours = list(await session.scalars(
+            select(WorkingHours).where(WorkingHours.restaurant_id == template.id)
+        ))
+        for index in range(count):
+            restaurant = Restaurant(
+                name=f"budget-{index}",
+                phone=template.phone,
+                address=f"{template.address} {index}",
+                city_id=city_id,
+                latitude=template.latitude,
+                longitude=template.longitude,
+                has_delivery=True,
+                has_takeaway=True,
+                has_dine_in=True,
+                delivery_price=template.delivery_price,
+            )
+            session.add(restaurant)
+            await session.flush()
+            session.add_all(
+                WorkingHours(
+                    restaurant_id=restaurant.id,
+                    day_of_week=wh.day_of_week,
+                    opens_at=wh.opens_at,
+                    closes_at=wh.closes_at,
+                    is_holiday=wh.is_holiday,
+                )
+                for wh in hours
+            )
+        await session.commit()
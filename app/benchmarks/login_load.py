@@ -0,0 +1,119 @@
+"""Нагрузка входом: p99 логина и влияние Argon2 на параллельное чтение каталога.
+
+Запуск из директории app (нужна БД из .env):
+    python -m benchmarks.login_load --logins 200 --concurrency 20
+
+Сначала измеряется задержка GET /city без нагрузки, затем то же самое
+на фоне параллельных POST /auth/login. Пока Argon2 выполнялся в event loop,
+каждый вход останавливал все запросы воркера на время хэширования
+(десятки миллисекунд при ARGON2_MEMORY_COST=65536), и p99 каталога рос
+вместе с числом входов. Теперь хэширование идет в пуле потоков, и задержка
+каталога под нагрузкой должна оставаться близкой к базовой.
+"""
+import argparse
+import asyncio
+import sys
+import time
+from collections import Counter
+from typing import List
+
+from main import create_application
+from benchmarks.asgi import asgi_request
+from src.application.interfaces.password_hasher import IPasswordHasher
+
+
+PHONE = "+79780000000"
+PASSWORD = "benchmark"
+CATALOG_PATH = "/city"
+
+
+def percentile(values: List[float], percent: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    index = min(int(len(values) * percent / 100), len(values) - 1)
+    return values[index]
+
+
+def print_latency(name: str, values: List[float]) -> None:
+    print(
+        f"{name:<28} n={len(values):<6} "
+        f"p50={percentile(values, 50):>8.1f}ms "
+        f"p99={percentile(values, 99):>8.1f}ms "
+        f"max={max(values, default=0):>8.1f}ms"
+    )
+
+
+async def timed_request(app, method: str, path: str, body=None) -> tuple[int, float]:
+    started = time.perf_counter()
+    status_code, _, _ = await asgi_request(app, method, path, body=body)
+    return status_code, (time.perf_counter() - started) * 1000
+
+
+async def catalog_reader(app, latencies: List[float], stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        _, elapsed = await timed_request(app, "GET", CATALOG_PATH)
+        latencies.append(elapsed)
+        await asyncio.sleep(0.005)
+
+
+async def queue_sampler(password_hasher: IPasswordHasher, samples: List[int], stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        samples.append(password_hasher.queue_depth)
+        await asyncio.sleep(0.005)
+
+
+async def run(logins: int, concurrency: int, readers: int) -> None:
+    app = create_application()
+    password_hasher: IPasswordHasher = await app.state.dishka_container.get(IPasswordHasher)
+
+    # Пользователь для входа, 400 - уже зарегистрирован
+    await asgi_request(app, "POST", "/auth/register", body={"phone": PHONE, "password": PASSWORD})
+
+    baseline: List[float] = []
+    for _ in range(200):
+        baseline.append((await timed_request(app, "GET", CATALOG_PATH))[1])
+
+    login_latencies: List[float] = []
+    catalog_latencies: List[float] = []
+    queue_depths: List[int] = []
+    statuses = Counter()
+    semaphore = asyncio.Semaphore(concurrency)
+    stop = asyncio.Event()
+
+    async def login() -> None:
+        async with semaphore:
+            status_code, elapsed = await timed_request(
+                app, "POST", "/auth/login", body={"phone": PHONE, "password": PASSWORD}
+            )
+            statuses[status_code] += 1
+            login_latencies.append(elapsed)
+
+    background_tasks = [asyncio.create_task(catalog_reader(app, catalog_latencies, stop)) for _ in range(readers)]
+    background_tasks.append(asyncio.create_task(queue_sampler(password_hasher, queue_depths, stop)))
+    started = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(logins)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await asyncio.gather(*background_tasks)
+
+    print(f"logins: {logins}, concurrency: {concurrency}, {logins / elapsed:.1f} logins/s, statuses: {dict(statuses)}")
+    print(f"argon2 queue depth: max={max(queue_depths, default=0)}, p99={percentile(queue_depths, 99):.0f}")
+    print_latency("POST /auth/login", login_latencies)
+    print_latency(f"GET {CATALOG_PATH} (idle)", baseline)
+    print_latency(f"GET {CATALOG_PATH} (under login)", catalog_latencies)
+
+    await app.state.dishka_container.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--readers", type=int, default=4)
+    args = parser.parse_args()
+
+    if sys.platform == "win32":
+        asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+
+    asyncio.run(run(args.logins, args.concurrency, args.readers))
@@ -0,0 +1,369 @@
+"""Нагрузка обеденного часа: смесь запросов, как от реальных клиентов.
+
+Запуск из директории app против локального uvicorn:
+    python -m benchmarks.lunch_rush --base-url http://127.0.0.1:8000 --users 50 --duration 120
+
+против стенда docker-compose (API через nginx, /metrics напрямую с backend):
+    python -m benchmarks.lunch_rush --base-url http://127.0.0.1/api \\
+        --metrics-url http://127.0.0.1:8000/metrics --users 200 --duration 300
+
+Каждый виртуальный пользователь регистрируется (или входит, если телефон
+уже занят после прошлого прогона) и в цикле повторяет визит: город ->
+рестораны города -> категории ресторана -> позиции и добавки 1-3 категорий.
+Часть визитов заканчивается заказом с добавками и убранными ингредиентами,
+собранным через OrderRequest по ценам из ответов API, часть начинается
+с повторного входа или обновления токена, часть смотрит историю заказов.
+Доли задаются флагами, случайность - через --seed, поэтому прогоны
+с одинаковыми параметрами повторяют одну и ту же смесь.
+
+В конце печатаются пропускная способность, p50/p95/p99 по каждому маршруту
+и загрузка пула соединений БД из /metrics: максимум занятых соединений,
+емкость пула и доля ожиданий соединения дольше 1 мс. Метрики в памяти
+воркера, поэтому при нескольких воркерах gunicorn каждый опрос попадает
+в один из них - это выборка, а не сумма. Если занятых соединений почти
+столько же, сколько емкость, и растут ожидания, узкое место - пул
+(POSTGRES_POOL_SIZE/POSTGRES_MAX_OVERFLOW); если пул свободен, а p99
+растет - воркеры (BACKEND_WORKERS).
+
+Заказы оформляются на "asap": вне часов работы ресторанов API их
+отклоняет, поэтому для ночных прогонов backend запускается
+с REJECT_ORDERS_OUTSIDE_HOURS=false.
+"""
+import argparse
+import asyncio
+import random
+import sys
+import time
+from collections import defaultdict
+from http.cookies import SimpleCookie
+from math import ceil
+from typing import Dict, List, Optional
+
+import httpx
+
+from src.domain.dto.order_dto import OrderRequest
+
+
+PASSWORD = "lunch-rush1"
+
+
+def percentile(values: List[float], percent: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    index = min(int(len(values) * percent / 100), len(values) - 1)
+    return values[index]
+
+
+class Stats:
+    def __init__(self) -> None:
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+
+    def record(self, name: str, elapsed_ms: float, ok: bool) -> None:
+        self.latencies[name].append(elapsed_ms)
+        if not ok:
+            self.errors[name] += 1
+
+    def print(self, elapsed: float) -> None:
+        total = sum(len(values) for values in self.latencies.values())
+        errors = sum(self.errors.values())
+        print(f"{'route':<46} {'count':>7} {'err':>5} {'rps':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+        for name in sorted(self.latencies):
+            values = self.latencies[name]
+            print(
+                f"{name:<46} {len(values):>7} {self.errors[name]:>5} {len(values) / elapsed:>7.1f} "
+                f"{percentile(values, 50):>8.1f} {percentile(values, 95):>8.1f} "
+                f"{percentile(values, 99):>8.1f} {max(values):>8.1f}"
+            )
+        print()
+        print(f"total: {total} requests, {errors} errors, {total / elapsed:.1f} req/s over {elapsed:.1f}s")
+
+
+class PoolSampler:
+    """Опрашивает /metrics и запоминает загрузку пула соединений"""
+
+    def __init__(self, client: httpx.AsyncClient, url: str, interval: float) -> None:
+        self._client = client
+        self._url = url
+        self._interval = interval
+        self.samples: List[Dict[str, float]] = []
+
+    async def sample(self) -> None:
+        try:
+            response = await self._client.get(self._url)
+        except httpx.HTTPError:
+            return
+        if response.status_code != 200:
+            return
+
+        values = {}
+        for line in response.text.splitlines():
+            if line.startswith("db_pool_") or line.startswith("argon2_queue_depth"):
+                name, _, value = line.rpartition(" ")
+                values[name] = float(value)
+        self.samples.append(values)
+
+    async def run(self, stop: asyncio.Event) -> None:
+        while not stop.is_set():
+            await self.sample()
+            try:
+                await asyncio.wait_for(stop.wait(), self._interval)
+            except asyncio.TimeoutError:
+                pass
+        await self.sample()
+
+    def print(self) -> None:
+        if not self.samples:
+            print(f"pool: {self._url} unavailable")
+            return
+
+        def peak(name: str) -> float:
+            return max(sample.get(name, 0.0) for sample in self.samples)
+
+        first, last = self.samples[0], self.samples[-1]
+        waits = last.get("db_pool_checkout_wait_seconds_count", 0) - first.get("db_pool_checkout_wait_seconds_count", 0)
+        fast_bucket = 'db_pool_checkout_wait_seconds_bucket{le="0.001"}'
+        fast = last.get(fast_bucket, 0) - first.get(fast_bucket, 0)
+
+        print(
+            f"pool: peak checked out {peak('db_pool_checked_out'):.0f} of {peak('db_pool_capacity'):.0f}, "
+            f"checkouts {waits:.0f}, waited > 1ms {max(waits - fast, 0):.0f}, "
+            f"peak argon2 queue {peak('argon2_queue_depth'):.0f} "
+            f"({len(self.samples)} samples, per worker)"
+        )
+
+
+class VirtualUser:
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        stats: Stats,
+        rng: random.Random,
+        phone: str,
+        args: argparse.Namespace,
+    ) -> None:
+        self._client = client
+        self._stats = stats
+        self._rng = rng
+        self._phone = phone
+        self._args = args
+        self._cookies: Dict[str, str] = {}
+        self._address_id: Optional[int] = None
+
+    async def request(self, name: str, method: str, path: str, body: Optional[dict] = None) -> Optional[httpx.Response]:
+        headers = {}
+        if self._cookies:
+            headers["Cookie"] = "; ".join(f"{key}={value}" for key, value in self._cookies.items())
+
+        started = time.perf_counter()
+        try:
+            response = await self._client.request(method, path, json=body, headers=headers)
+        except httpx.HTTPError:
+            self._stats.record(name, (time.perf_counter() - started) * 1000, ok=False)
+            return None
+        self._stats.record(name, (time.perf_counter() - started) * 1000, ok=response.status_code < 400)
+
+        # Cookie сохраняются вручную: в production у них Secure и домен сайта
+        for header in response.headers.get_list("set-cookie"):
+            for key, morsel in SimpleCookie(header).items():
+                self._cookies[key] = morsel.value
+        return response
+
+    async def get_json(self, name: str, path: str):
+        response = await self.request(name, "GET", path)
+        if response is None or response.status_code != 200:
+            return None
+        return response.json()
+
+    async def sign_in(self) -> None:
+        credentials = {"phone": self._phone, "password": PASSWORD}
+        response = await self.request("POST /auth/register", "POST", "/auth/register", credentials)
+        if response is None or response.status_code >= 400:
+            await self.request("POST /auth/login", "POST", "/auth/login", credentials)
+
+        addresses = await self.get_json("GET /user_address", "/user_address") or []
+        if addresses:
+            self._address_id = addresses[0]["id"]
+            return
+
+        response = await self.request(
+            "POST /user_address", "POST", "/user_address", {"address": f"ул. Обеденная, {self._rng.randint(1, 99)}"},
+        )
+        if response is not None and response.status_code == 200:
+            self._address_id = response.json()["id"]
+
+    async def visit(self) -> None:
+        roll = self._rng.random()
+        if roll < self._args.login_share:
+            await self.request(
+                "POST /auth/login", "POST", "/auth/login", {"phone": self._phone, "password": PASSWORD},
+            )
+        elif roll < self._args.login_share + self._args.refresh_share:
+            await self.request("POST /auth/refresh", "POST", "/auth/refresh")
+
+        cities = await self.get_json("GET /city", "/city")
+        if not cities or not cities.get("data"):
+            return
+        city = self._rng.choice(cities["data"])
+
+        city_restaurants = await self.get_json("GET /restaurant/city/{city_id}", f"/restaurant/city/{city['id']}")
+        restaurants = ((city_restaurants or {}).get("data") or {}).get("restaurants") or []
+        if not restaurants:
+            return
+        restaurant = self._rng.choice(restaurants)
+
+        categories = await self.get_json(
+            "GET /category/restaurant/{restaurant_id}", f"/category/restaurant/{restaurant['id']}",
+        )
+        categories = (categories or {}).get("categories") or []
+        if not categories:
+            return
+
+        # Позиции, которые клиент успел посмотреть: (позиция, добавки категории)
+        viewed = []
+        for category in self._rng.sample(categories, min(len(categories), self._rng.randint(1, 3))):
+            positions = await self.get_json(
+                "GET /food_variant/category/{category_id}",
+                f"/food_variant/category/{category['id']}?restaurant_id={restaurant['id']}",
+            )
+            addings = []
+            if category["need_addings"]:
+                addings = await self.get_json(
+                    "GET /ingredient/addings/{category_id}", f"/ingredient/addings/{category['id']}",
+                ) or []
+            for position in (positions or {}).get("positions") or []:
+                if position.get("size"):
+                    viewed.append((position, addings))
+            await self.think(0.3)
+
+        if viewed and self._rng.random() < self._args.order_share:
+            await self.order(restaurant, viewed)
+
+        if self._rng.random() < self._args.history_share:
+            await self.request("GET /order", "GET", "/order")
+
+    def build_order(self, restaurant: dict, viewed: list) -> OrderRequest:
+        order_list = []
+        for position, addings in self._rng.sample(viewed, min(len(viewed), self._rng.randint(1, 3))):
+            size = self._rng.choice(position["size"])
+            chosen = self._rng.sample(addings, min(len(addings), self._rng.randint(0, 2)))
+            amounts = {adding["id"]: self._rng.randint(1, 2) for adding in chosen}
+            removable = position.get("ingredients") or []
+            removed = [self._rng.choice(removable)["id"]] if removable and self._rng.random() < 0.3 else None
+
+            multiplier = size["price_multiplier"] or 1
+            price = size["price"] + sum(
+                ceil(adding["price"] * multiplier) * amounts[adding["id"]] for adding in chosen
+            )
+            order_list.append({
+                "name": position["name"],
+                "price": price,
+                "quantity": self._rng.randint(1, 2),
+                "size": size["id"],
+                "addings": amounts or None,
+                "removed_ingredients": removed,
+            })
+
+        actions = [action for action in restaurant["actions"] if action != "delivery" or self._address_id]
+        action = self._rng.choice(actions)
+        return OrderRequest(
+            selected_restaurant={
+                "id": restaurant["id"],
+                "action": action,
+                "address": restaurant["address"],
+                "phone": restaurant["phone"],
+            },
+            order_list=order_list,
+            user_info={"address_id": self._address_id} if action == "delivery" else None,
+            order_quantity=sum(item["quantity"] for item in order_list),
+            cook_start="asap",
+            comment=None,
+            payment_method=self._rng.choice(["cash", "card"]),
+        )
+
+    async def order(self, restaurant: dict, viewed: list) -> None:
+        order_request = self.build_order(restaurant, viewed)
+        await self.request("POST /order", "POST", "/order", order_request.model_dump(mode="json"))
+
+    async def think(self, scale: float = 1.0) -> None:
+        await asyncio.sleep(self._rng.expovariate(1000 / self._args.think_ms) * scale)
+
+    async def run(self, start_delay: float, stop: asyncio.Event) -> None:
+        await asyncio.sleep(start_delay)
+        if stop.is_set():
+            return
+        await self.sign_in()
+        while not stop.is_set():
+            await self.visit()
+            await self.think()
+
+
+async def run(args: argparse.Namespace) -> None:
+    stats = Stats()
+    stop = asyncio.Event()
+    limits = httpx.Limits(max_connections=args.users, max_keepalive_connections=args.users)
+    metrics_url = args.metrics_url or f"{args.base_url.rstrip('/')}/metrics"
+
+    async with (
+        httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=args.timeout) as client,
+        httpx.AsyncClient(timeout=args.timeout) as metrics_client,
+    ):
+        sampler = PoolSampler(metrics_client, metrics_url, args.metrics_interval)
+        users = [
+            VirtualUser(
+                client,
+                stats,
+                random.Random(args.seed * 1_000_003 + index),
+                f"+7978{args.phone_block}{index:05d}",
+                args,
+            )
+            for index in range(args.users)
+        ]
+
+        started = time.perf_counter()
+        tasks = [
+            asyncio.create_task(user.run(args.ramp_up * index / args.users, stop))
+            for index, user in enumerate(users)
+        ]
+        sampler_task = asyncio.create_task(sampler.run(stop))
+
+        await asyncio.sleep(args.duration)
+        stop.set()
+        await asyncio.gather(*tasks)
+        await sampler_task
+        elapsed = time.perf_counter() - started
+
+    print(f"users={args.users} duration={args.duration}s ramp-up={args.ramp_up}s seed={args.seed}")
+    print()
+    stats.print(elapsed)
+    sampler.print()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--metrics-url", default=None, help="по умолчанию <base-url>/metrics")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=60)
+    parser.add_argument("--ramp-up", type=float, default=10)
+    parser.add_argument("--think-ms", type=float, default=1000, help="средняя пауза между визитами")
+    parser.add_argument("--order-share", type=float, default=0.3)
+    parser.add_argument("--login-share", type=float, default=0.05)
+    parser.add_argument("--refresh-share", type=float, default=0.15)
+    parser.add_argument("--history-share", type=float, default=0.2)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--phone-block", default="10", help="2 цифры номера, разные для параллельных прогонов")
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--metrics-interval", type=float, default=1)
+    args = parser.parse_args()
+
+    if len(args.phone_block) != 2 or not args.phone_block.isdigit():
+        parser.error("--phone-block должен состоять из 2 цифр")
+    if args.users > 100_000:
+        parser.error("--users не больше 100000: номер телефона пользователя - 5 цифр")
+
+    if sys.platform == "win32":
+        asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+
+    asyncio.run(run(args))
@@ -0,0 +1,145 @@
+"""Поиск по меню: индекс в памяти против перебора всех блюд.
+
+Запуск из директории app (БД не нужна):
+    python -m benchmarks.menu_search --foods 2000 --restaurants 50
+
+Раньше поиска не было: клиент листал GET /category и позиции каждой
+категории. Теперь GET /search ищет по названию, описанию и составу блюд
+в индексе воркера: слова отсортированы, начало слова находится бинарным
+поиском, слова запроса с одной опечаткой - по словарю удалений.
+
+Скрипт собирает меню из --foods случайных блюд (--seed задает случайность),
+раскладывает их по категориям и ресторанам с отключенными блюдами и
+печатает время сборки индекса и p50/p99 одного поиска для ввода по буквам,
+запросов из нескольких слов и запросов с опечаткой - по индексу и
+перебором всех блюд с проверкой подстрок, как сделал бы ILIKE.
+"""
+import argparse
+import asyncio
+import random
+import sys
+import time
+from statistics import median, quantiles
+from typing import Dict, List, Set, Tuple
+
+from src.application.interfaces.cache.menu_search import SearchDocument, tokenize
+from src.infrastructure.adapters.cache.menu_search import build_search_index
+
+
+DISHES = ["пицца", "бургер", "ролл", "суп", "салат", "паста", "шаурма", "пирог", "лаваш", "сэндвич"]
+NAMES = ["маргарита", "пепперони", "цезарь", "карбонара", "филадельфия", "гавайская", "деревенский",
+         "греческий", "четыре сыра", "барбекю", "острый", "сливочный", "фирменный", "мясной", "грибной"]
+INGREDIENTS = ["моцарелла", "томаты", "шампиньоны", "бекон", "курица", "лосось", "огурец", "ветчина",
+               "пармезан", "халапеньо", "лук", "чеснок", "соус песто", "ананас", "маслины", "говядина"]
+DESCRIPTIONS = ["на тонком тесте", "с хрустящей корочкой", "по домашнему рецепту", "в дровяной печи",
+                "с фирменным соусом", "острое блюдо", "для всей семьи", "новинка сезона"]
+
+QUERIES = {
+    "typeahead": ["п", "пи", "пиц", "пицц", "пицца", "пицца м", "пицца мо", "пицца моц"],
+    "words": ["пицца с грибами", "ролл лосось", "суп курица", "салат цезарь", "бургер бекон острый"],
+    "typo": ["пеперони", "карбанара", "моцарела", "шампиньйоны", "чизбургер"],
+}
+
+
+def build_menu(
+    foods: int,
+    restaurants: int,
+    rng: random.Random,
+) -> Tuple[List[SearchDocument], List[Tuple[int, str]], Dict[int, Set[int]], List[Tuple[int, int]]]:
+    documents = []
+    ingredients = []
+    for food_id in range(1, foods + 1):
+        dish = rng.choice(DISHES)
+        documents.append(SearchDocument(
+            food_id=food_id,
+            category_id=DISHES.index(dish) + 1,
+            name=f"{dish.capitalize()} {rng.choice(NAMES)}",
+            description=rng.choice(DESCRIPTIONS),
+            image_url=None,
+            price_from=rng.randrange(200, 900, 10),
+        ))
+        ingredients.extend((food_id, name) for name in rng.sample(INGREDIENTS, 4))
+
+    restaurant_categories = {
+        restaurant_id: set(rng.sample(range(1, len(DISHES) + 1), 6))
+        for restaurant_id in range(1, restaurants + 1)
+    }
+    disabled = [
+        (restaurant_id, rng.randrange(1, foods + 1))
+        for restaurant_id in restaurant_categories
+        for _ in range(foods // 50)
+    ]
+    return documents, ingredients, restaurant_categories, disabled
+
+
+def scan(
+    documents: List[SearchDocument],
+    ingredients: Dict[int, str],
+    query: str,
+    limit: int,
+) -> List[SearchDocument]:
+    """Перебор всех блюд: каждое слово запроса - подстрока названия, описания или состава"""
+    terms = tokenize(query)
+    found = []
+    for document in documents:
+        text = " ".join((document.name, document.description, ingredients[document.food_id])).lower()
+        if all(term in text for term in terms):
+            found.append(document)
+    return found[:limit]
+
+
+def percentiles(samples: List[float]) -> Tuple[float, float]:
+    return median(samples), quantiles(samples, n=100)[98]
+
+
+async def run(foods: int, restaurants: int, repeat: int, limit: int, seed: int) -> None:
+    rng = random.Random(seed)
+    documents, ingredients, restaurant_categories, disabled = build_menu(foods, restaurants, rng)
+
+    started = time.perf_counter()
+    index = build_search_index(1, documents, ingredients, restaurant_categories, disabled)
+    build_ms = (time.perf_counter() - started) * 1000
+    print(f"index: {len(index.documents)} foods, {len(index.words)} words, built in {build_ms:.1f} ms")
+
+    composition: Dict[int, str] = {}
+    for food_id, name in ingredients:
+        composition[food_id] = f"{composition.get(food_id, '')} {name}"
+
+    print(f"{'queries':<10} {'index p50 us':>13} {'p99 us':>9} {'scan p50 us':>12} {'p99 us':>9} {'hits':>6}")
+    for name, queries in QUERIES.items():
+        index_samples = []
+        scan_samples = []
+        hits = 0
+        for _ in range(repeat):
+            for query in queries:
+                restaurant_id = rng.choice((None, rng.randrange(1, restaurants + 1)))
+
+                started = time.perf_counter()
+                hits += len(index.search(query, limit, restaurant_id))
+                index_samples.append((time.perf_counter() - started) * 1e6)
+
+                started = time.perf_counter()
+                scan(documents, composition, query, limit)
+                scan_samples.append((time.perf_counter() - started) * 1e6)
+
+        index_p50, index_p99 = percentiles(index_samples)
+        scan_p50, scan_p99 = percentiles(scan_samples)
+        print(
+            f"{name:<10} {index_p50:>13.1f} {index_p99:>9.1f} {scan_p50:>12.1f} {scan_p99:>9.1f} "
+            f"{hits / repeat / len(queries):>6.1f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--foods", type=int, default=2000)
+    parser.add_argument("--restaurants", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    if sys.platform == "win32":
+        asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+
+    asyncio.run(run(args.foods, args.restaurants, args.repeat, args.limit, args.seed))
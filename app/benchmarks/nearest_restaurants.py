@@ -0,0 +1,126 @@
+"""Поиск ближайших ресторанов: сетка координат против перебора всех ресторанов.
+
+Запуск из директории app (БД не нужна):
+    python -m benchmarks.nearest_restaurants --restaurants 2000 --queries 2000
+
+Раньше фронтенд на каждой странице скачивал рестораны города целиком
+и сортировал их по расстоянию сам. Теперь GET /restaurant/nearest ищет
+по сетке в памяти воркера: обходятся только ячейки вокруг точки.
+
+Скрипт раскладывает --restaurants случайных ресторанов по нескольким
+городам (--seed задает случайность), делает --queries запросов из
+случайных точек этих городов и печатает время одного поиска по сетке и
+перебором с сортировкой. Результаты обоих способов сравниваются: при
+расхождении скрипт завершается с кодом 1.
+"""
+import argparse
+import asyncio
+import random
+import sys
+import time
+from typing import List, Tuple
+
+from src.application.interfaces.cache.restaurant_locations import RestaurantLocation, distance_km
+from src.domain.enums.enums import OrderAction
+from src.infrastructure.adapters.cache.restaurant_locations import build_index
+
+
+# Центры городов: Москва, Санкт-Петербург, Симферополь, Севастополь, Новосибирск
+CITIES = [(55.75, 37.62), (59.94, 30.31), (44.95, 34.10), (44.62, 33.53), (55.03, 82.92)]
+# Разброс ресторанов и точек запроса вокруг центра города, градусов
+SPREAD = 0.3
+
+
+def random_point(rng: random.Random) -> Tuple[int, float, float]:
+    city_id = rng.randrange(len(CITIES))
+    latitude, longitude = CITIES[city_id]
+    return city_id, latitude + rng.uniform(-SPREAD, SPREAD), longitude + rng.uniform(-SPREAD, SPREAD)
+
+
+def build_locations(count: int, rng: random.Random) -> List[RestaurantLocation]:
+    locations = []
+    for restaurant_id in range(1, count + 1):
+        city_id, latitude, longitude = random_point(rng)
+        actions = {OrderAction.TAKEAWAY}
+        if rng.random() < 0.6:
+            actions.add(OrderAction.DELIVERY)
+        locations.append(RestaurantLocation(
+            id=restaurant_id,
+            city_id=city_id,
+            name=f"nearest-{restaurant_id}",
+            address=f"address {restaurant_id}",
+            phone="+79780000000",
+            latitude=latitude,
+            longitude=longitude,
+            delivery_price=rng.choice((0, 100, 200)),
+            actions=frozenset(actions),
+        ))
+    return locations
+
+
+def brute_force(
+    locations: List[RestaurantLocation],
+    latitude: float,
+    longitude: float,
+    limit: int,
+    radius_km: float,
+    action: OrderAction,
+) -> List[Tuple[float, RestaurantLocation]]:
+    found = [
+        (distance, location)
+        for location in locations
+        if action in location.actions
+        for distance in (distance_km(latitude, longitude, location.latitude, location.longitude),)
+        if distance <= radius_km
+    ]
+    found.sort(key=lambda item: item[0])
+    return found[:limit]
+
+
+async def run(restaurants: int, queries: int, limit: int, radius_km: float, seed: int) -> bool:
+    rng = random.Random(seed)
+    locations = build_locations(restaurants, rng)
+
+    started = time.perf_counter()
+    index = build_index(1, locations)
+    build_ms = (time.perf_counter() - started) * 1000
+    print(f"index: {restaurants} restaurants, {len(index.cells)} cells, built in {build_ms:.1f} ms")
+
+    points = [random_point(rng)[1:] for _ in range(queries)]
+    action = OrderAction.DELIVERY
+
+    started = time.perf_counter()
+    grid_results = [index.nearest(lat, lon, limit, radius_km, action) for lat, lon in points]
+    grid_us = (time.perf_counter() - started) / queries * 1e6
+
+    started = time.perf_counter()
+    brute_results = [brute_force(locations, lat, lon, limit, radius_km, action) for lat, lon in points]
+    brute_us = (time.perf_counter() - started) / queries * 1e6
+
+    mismatches = sum(
+        1
+        for grid, brute in zip(grid_results, brute_results)
+        if [location.id for _, location in grid] != [location.id for _, location in brute]
+    )
+
+    print(f"{'search':<12} {'us/query':>10}")
+    print(f"{'grid':<12} {grid_us:>10.1f}")
+    print(f"{'brute force':<12} {brute_us:>10.1f}")
+    print(f"mismatches: {mismatches} of {queries}")
+    return mismatches == 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--restaurants", type=int, default=2000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--limit", type=int, default=5)
+    parser.add_argument("--radius-km", type=float, default=30)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    if sys.platform == "win32":
+        asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+
+    ok = asyncio.run(run(args.restaurants, args.queries, args.limit, args.radius_km, args.seed))
+    sys.exit(0 if ok else 1)
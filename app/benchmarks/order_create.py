@@ -0,0 +1,140 @@
+"""Запросы к БД и задержка создания заказа в зависимости от числа позиций.
+
+Запуск из директории app (нужна БД из .env с рестораном и меню):
+    python -m benchmarks.order_create --repeat 20
+
+Для каждого размера заказа вызывается OrderRepository.create_order
+в транзакции, которая затем откатывается. Каждая позиция - вариант блюда
+с двумя добавками по 2 шт. и одним убранным ингредиентом. Раньше связи
+с ингредиентами писались отдельным INSERT на каждую добавку и каждый
+убранный ингредиент, и число запросов росло вместе с размером заказа.
+Теперь позиции и обе таблицы связей пишутся тремя INSERT, и число
+запросов не зависит от числа позиций.
+"""
+import argparse
+import asyncio
+import sys
+import time
+from math import ceil
+from statistics import median
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import selectinload
+
+from src.config import get_config
+from src.domain.dto.order_dto import OrderRequest
+from src.domain.enums.enums import OrderAction
+from src.infrastructure.adapters.repositories.order_repository import OrderRepository
+from src.infrastructure.drivers.db.database import create_engine
+from src.infrastructure.drivers.db.tables import (
+    Food,
+    FoodIngredientAssociation,
+    FoodVariant,
+    Restaurant,
+    User,
+)
+
+
+SIZES = [1, 5, 10, 20, 40]
+
+
+async def build_request(session, positions: int) -> tuple[OrderRequest, int]:
+    restaurant = (await session.execute(
+        select(Restaurant)
+        .where(Restaurant.is_active == True, Restaurant.has_takeaway == True)
+        .limit(1)
+    )).scalars().first()
+    user = (await session.execute(select(User).limit(1))).scalars().first()
+    variant = (await session.execute(
+        select(FoodVariant)
+        .join(FoodVariant.food)
+        .where(FoodVariant.is_active == True, Food.ingredient_associations.any())
+        .options(
+            selectinload(FoodVariant.food)
+            .selectinload(Food.ingredient_associations)
+            .selectinload(FoodIngredientAssociation.ingredient)
+        )
+        .limit(1)
+    )).scalars().first()
+
+    if not (restaurant and user and variant):
+        raise RuntimeError("Нужны активный ресторан с самовывозом, пользователь и блюдо с ингредиентами")
+
+    associations = variant.food.ingredient_associations
+    addings = {assoc.ingredient_id: 2 for assoc in associations[:2]}
+    removed = [assoc.ingredient_id for assoc in associations if assoc.is_default][:1]
+    price = variant.price + sum(
+        ceil(assoc.ingredient.price * variant.ingredient_price_modifier) * addings[assoc.ingredient_id]
+        for assoc in associations[:2]
+    )
+
+    order_request = OrderRequest(
+        selected_restaurant={
+            "id": restaurant.id,
+            "action": OrderAction.TAKEAWAY,
+            "address": restaurant.address,
+            "phone": restaurant.phone.e164,
+        },
+        order_list=[
+            {
+                "name": variant.food.name,
+                "price": price,
+                "quantity": 1,
+                "size": variant.id,
+                "addings": addings,
+                "removed_ingredients": removed,
+            }
+            for _ in range(positions)
+        ],
+        order_quantity=positions,
+        cook_start="asap",
+        comment=None,
+        payment_method="cash",
+    )
+    return order_request, user.id
+
+
+async def run(repeat: int) -> None:
+    engine = create_engine(get_config().postgres)
+    session_maker = async_sessionmaker(engine, expire_on_commit=False)
+
+    statements = 0
+
+    def on_execute(*_):
+        nonlocal statements
+        statements += 1
+
+    event.listen(engine.sync_engine, "before_cursor_execute", on_execute)
+
+    print(f"{'positions':>9} {'queries':>8} {'p50 ms':>8} {'max ms':>8}")
+    try:
+        for positions in SIZES:
+            async with session_maker() as session:
+                order_request, user_id = await build_request(session, positions)
+
+            latencies = []
+            for _ in range(repeat):
+                async with session_maker() as session:
+                    await session.begin()
+                    statements = 0
+                    started = time.perf_counter()
+                    await OrderRepository(session).create_order(order_request, user_id)
+                    latencies.append((time.perf_counter() - started) * 1000)
+                    queries = statements
+                    await session.rollback()
+
+            print(f"{positions:>9} {queries:>8} {median(latencies):>8.2f} {max(latencies):>8.2f}")
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    if sys.platform == "win32":
+        asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+
+    asyncio.run(run(args.repeat))
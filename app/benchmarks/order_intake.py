@@ -0,0 +1,137 @@
+"""Время удержания соединения из пула на один POST /order.
+
+Запуск из директории app (нужен Postgres из .env, пользователь с правом CREATEDB):
+    python -m benchmarks.order_intake --repeat 50
+
+Скрипт создает отдельную базу (--database) так же, как проверка бюджета
+запросов в tests/test_query_budget.py, регистрирует пользователя и
+оформляет заказы из 3 позиций: верный заказ
+и заказы с ошибками, которые клиент присылает чаще всего (устаревшая
+цена, чужое название, несуществующий вариант, телефон ресторана,
+количество). Для каждого случая печатается, сколько раз соединение
+бралось из пула, сколько SQL запросов выполнено и сколько миллисекунд
+соединение было занято - от выдачи из пула до возврата.
+
+Раньше заказ проверялся внутри REPEATABLE READ транзакции запросами
+ресторана, вариантов и ингредиентов, и неверный заказ держал соединение
+так же, как верный. Теперь проверка идет по таблице цен в памяти,
+и неверный заказ не берет соединение вовсе.
+"""
+import argparse
+import asyncio
+import sys
+import time
+from statistics import median
+from typing import Dict, List
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from benchmarks.asgi import asgi_request
+from benchmarks.database import order_body, recreate_database, seed
+from src.config import get_config
+
+
+PHONE = "+79785550001"
+PASSWORD = "intake-pass1"
+
+
+class ConnectionStats:
+    """Выдачи соединений из пула, SQL запросы и время удержания соединений"""
+
+    def __init__(self, engine: AsyncEngine) -> None:
+        self.checkouts = 0
+        self.queries = 0
+        self.hold_seconds = 0.0
+        pool = engine.sync_engine.pool
+        event.listen(pool, "checkout", self._checkout)
+        event.listen(pool, "checkin", self._checkin)
+        event.listen(engine.sync_engine, "before_cursor_execute", self._execute)
+
+    def reset(self) -> None:
+        self.checkouts = 0
+        self.queries = 0
+        self.hold_seconds = 0.0
+
+    def _checkout(self, dbapi_connection, connection_record, connection_proxy) -> None:
+        self.checkouts += 1
+        connection_record.info["intake_checked_out_at"] = time.perf_counter()
+
+    def _checkin(self, dbapi_connection, connection_record) -> None:
+        checked_out_at = connection_record.info.pop("intake_checked_out_at", None)
+        if checked_out_at is not None:
+            self.hold_seconds += time.perf_counter() - checked_out_at
+
+    def _execute(self, *_) -> None:
+        self.queries += 1
+
+
+def build_cases(body: dict) -> Dict[str, dict]:
+    positions: List[dict] = body["order_list"]
+    first = positions[0]
+    restaurant = body["selected_restaurant"]
+
+    return {
+        "valid": body,
+        "stale price": {**body, "order_list": [{**first, "price": first["price"] + 1}, *positions[1:]]},
+        "wrong name": {**body, "order_list": [{**first, "name": "Несуществующее блюдо"}, *positions[1:]]},
+        "unknown variant": {**body, "order_list": [{**first, "size": 10 ** 9}, *positions[1:]]},
+        "restaurant phone": {**body, "selected_restaurant": {**restaurant, "phone": "+79780000000"}},
+        "order quantity": {**body, "order_quantity": body["order_quantity"] + 1},
+    }
+
+
+async def run(database: str, repeat: int) -> None:
+    await recreate_database(database)
+    # Конфиг кэшируется на процесс: приложение и генератор данных возьмут новую базу
+    get_config().postgres.db = database
+    # Заказ "asap" должен проходить в любое время запуска
+    get_config().app.reject_orders_outside_hours = False
+
+    from main import create_application
+
+    app = create_application()
+    container = app.state.dishka_container
+    try:
+        session_maker = await seed(app)
+        stats = ConnectionStats(await container.get(AsyncEngine))
+        cookies: Dict[str, str] = {}
+
+        status_code, _, _ = await asgi_request(
+            app, "POST", "/auth/register", body={"phone": PHONE, "password": PASSWORD}, cookies=cookies,
+        )
+        if status_code >= 400:
+            raise RuntimeError(f"Регистрация пользователя: статус {status_code}")
+
+        cases = build_cases(await order_body(session_maker, 3))
+        # Прогрев: таблица цен и кэш пользователя загружаются первым заказом
+        await asgi_request(app, "POST", "/order", body=cases["valid"], cookies=cookies)
+
+        print(f"{'case':<18} {'status':>6} {'checkouts':>9} {'queries':>8} {'hold ms':>8} {'p50 ms':>8}")
+        for name, body in cases.items():
+            latencies = []
+            stats.reset()
+            for _ in range(repeat):
+                started = time.perf_counter()
+                status_code, _, _ = await asgi_request(app, "POST", "/order", body=body, cookies=cookies)
+                latencies.append((time.perf_counter() - started) * 1000)
+
+            print(
+                f"{name:<18} {status_code:>6} {stats.checkouts / repeat:>9.1f} {stats.queries / repeat:>8.1f} "
+                f"{stats.hold_seconds * 1000 / repeat:>8.2f} {median(latencies):>8.2f}"
+            )
+    finally:
+        await container.close()
+        await recreate_database(database, drop_only=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--database", default="vivat_order_intake")
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    if sys.platform == "win32":
+        asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+
+    asyncio.run(run(args.database, args.repeat))
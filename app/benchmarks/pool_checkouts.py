@@ -0,0 +1,68 @@
+"""Количество соединений, взятых из пула, на один запрос.
+
+Запуск из директории app (нужна БД из .env):
+    python -m benchmarks.pool_checkouts --requests 50
+
+До политик транзакций каждый POST держал два соединения (сессия репозиториев
+и отдельный engine.connect() с REPEATABLE READ), а статика открывала
+контейнер и транзакцию. Ожидаемый результат теперь: статика - 0,
+чтение каталога - не больше 1, запись - 1.
+"""
+import argparse
+import asyncio
+import sys
+import time
+from collections import Counter
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from main import create_application
+from benchmarks.asgi import asgi_request
+
+
+ROUTES = [
+    ("GET", "/static/images/food/benchmark.png", None),
+    ("GET", "/city", None),
+    ("GET", "/category", None),
+    ("GET", "/restaurant/city/1", None),
+    ("GET", "/food_variant/category/1", None),
+    ("POST", "/auth/login", {"phone": "+79780000000", "password": "benchmark"}),
+]
+
+
+async def run(requests_per_route: int) -> None:
+    app = create_application()
+    engine: AsyncEngine = await app.state.dishka_container.get(AsyncEngine)
+
+    checkouts = Counter()
+    current_route = None
+
+    def on_checkout(*_):
+        checkouts[current_route] += 1
+
+    event.listen(engine.sync_engine.pool, "checkout", on_checkout)
+
+    print(f"{'route':<45} {'checkouts/req':>14} {'ms/req':>10}")
+    for method, path, body in ROUTES:
+        current_route = f"{method} {path}"
+        started = time.perf_counter()
+        for _ in range(requests_per_route):
+            await asgi_request(app, method, path, body=body)
+        elapsed_ms = (time.perf_counter() - started) * 1000 / requests_per_route
+
+        per_request = checkouts[current_route] / requests_per_route
+        print(f"{current_route:<45} {per_request:>14.2f} {elapsed_ms:>10.2f}")
+
+    await app.state.dishka_container.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=50)
+    args = parser.parse_args()
+
+    if sys.platform == "win32":
+        asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+
+    asyncio.run(run(args.requests))
@@ -0,0 +1,95 @@
+"""Доставка нового заказа во все чаты ресторана: по очереди против параллельной рассылки.
+
+Запуск из директории app (БД и Telegram не нужны, бот заменяется заглушкой):
+    python -m benchmarks.telegram_fanout --chats 5 --latency-ms 150
+
+Заглушка отвечает с задержкой --latency-ms и один раз отдает 429 с
+retry_after для первого чата. Печатается время, через которое заказ
+появился в каждом чате: при последовательной отправке последний чат
+ждет сумму всех запросов, при параллельной - примерно один запрос.
+В конце выводятся метрики из /metrics бота.
+"""
+import argparse
+import asyncio
+import sys
+import time
+from typing import Dict, List
+
+from telegram.error import RetryAfter
+
+from src.domain.enums.enums import OrderAction
+from src.infrastructure.adapters.telegram.order_notifier import TelegramOrderNotifier
+from src.infrastructure.adapters.telegram.rate_limiter import TelegramRateLimiter
+from src.infrastructure.metrics import REGISTRY
+
+
+class StubBot:
+    def __init__(self, latency: float, retry_after: int) -> None:
+        self._latency = latency
+        self._retry_after = retry_after
+        self.delivered: Dict[str, float] = {}
+        self._throttled = False
+
+    async def send_message(self, chat_id: str, **kwargs) -> None:
+        await asyncio.sleep(self._latency)
+        if self._retry_after and not self._throttled:
+            self._throttled = True
+            raise RetryAfter(self._retry_after)
+        self.delivered[chat_id] = time.perf_counter()
+
+
+class StubChatRouting:
+    def __init__(self, chats: int) -> None:
+        self._chat_ids = [str(-1000 - index) for index in range(chats)]
+
+    async def get_chat_ids(self, restaurant_id: int) -> List[str]:
+        return self._chat_ids
+
+
+async def sequential(bot: StubBot, chat_routing: StubChatRouting) -> None:
+    # Прежнее поведение: чаты обходятся по одному
+    for chat_id in await chat_routing.get_chat_ids(1):
+        while True:
+            try:
+                await bot.send_message(chat_id=chat_id, text="benchmark")
+                break
+            except RetryAfter as e:
+                await asyncio.sleep(e.retry_after)
+
+
+async def run(chats: int, latency_ms: float, retry_after: int) -> None:
+    chat_routing = StubChatRouting(chats)
+
+    async def concurrent(bot: StubBot, chat_routing: StubChatRouting) -> None:
+        limiter = TelegramRateLimiter(
+            global_rate_per_second=30,
+            chat_rate_per_minute=20,
+            chat_burst=3,
+            concurrency=8,
+        )
+        notifier = TelegramOrderNotifier(bot, chat_routing, limiter, max_retries=3)
+        await notifier.send_new_order(1, 1, "benchmark", "created", OrderAction.TAKEAWAY)
+
+    print(f"{'fan-out':<12} {'first chat s':>13} {'last chat s':>12}")
+    for name, deliver in (("sequential", sequential), ("concurrent", concurrent)):
+        bot = StubBot(latency_ms / 1000, retry_after)
+        started = time.perf_counter()
+        await deliver(bot, chat_routing)
+        delays = sorted(at - started for at in bot.delivered.values())
+        print(f"{name:<12} {delays[0]:>13.3f} {delays[-1]:>12.3f}")
+
+    print()
+    print(REGISTRY.render())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--chats", type=int, default=5)
+    parser.add_argument("--latency-ms", type=float, default=150)
+    parser.add_argument("--retry-after", type=int, default=1)
+    args = parser.parse_args()
+
+    if sys.platform == "win32":
+        asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+
+    asyncio.run(run(args.chats, args.latency_ms, args.retry_after))
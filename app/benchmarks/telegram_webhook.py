@@ -0,0 +1,147 @@
+"""Прием обновлений бота через webhook на локальном фейковом сервере Telegram.
+
+Запуск из директории app (БД и Telegram не нужны):
+    python -m benchmarks.telegram_webhook --updates 200 --concurrency 20
+
+Скрипт поднимает заглушку Bot API (getMe, setWebhook, sendMessage),
+включает webhook-режим бота и отправляет на /bot/telegram/webhook команды
+/get_chat_id. Измеряется время от POST обновления до ответа бота в чат
+(sendMessage на заглушке). Дополнительно проверяется, что запрос с неверным
+секретом отклоняется (403), а переполненная очередь отвечает 503.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from typing import Dict, List
+
+import httpx
+from aiohttp import web
+
+
+TOKEN = "123456:benchmark"
+SECRET = "benchmark-secret"
+
+
+def percentile(values: List[float], percent: float) -> float:
+    values = sorted(values)
+    index = min(int(len(values) * percent / 100), len(values) - 1)
+    return values[index]
+
+
+async def start_telegram_stub(replies: Dict[int, asyncio.Future]) -> tuple[web.AppRunner, int]:
+    async def method(request: web.Request) -> web.Response:
+        name = request.match_info["method"]
+        data = dict(await request.post()) if request.content_type != "application/json" else await request.json()
+
+        if name == "getMe":
+            result = {"id": 1, "is_bot": True, "first_name": "stub", "username": "stub_bot"}
+        elif name == "sendMessage":
+            chat_id = int(data["chat_id"])
+            future = replies.pop(chat_id, None)
+            if future is not None and not future.done():
+                future.set_result(time.perf_counter())
+            result = {"message_id": 1, "date": 0, "chat": {"id": chat_id, "type": "group"}}
+        else:
+            result = True
+
+        return web.json_response({"ok": True, "result": result})
+
+    app = web.Application()
+    app.router.add_post(f"/bot{TOKEN}/{{method}}", method)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, port
+
+
+def command_update(update_id: int, chat_id: int) -> dict:
+    return {
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id,
+            "date": 0,
+            "chat": {"id": chat_id, "type": "group", "title": "Kitchen"},
+            "from": {"id": 5, "is_bot": False, "first_name": "Staff"},
+            "text": "/get_chat_id",
+            "entities": [{"type": "bot_command", "offset": 0, "length": 12}],
+        },
+    }
+
+
+async def run(updates: int, concurrency: int, queue_size: int) -> None:
+    replies: Dict[int, asyncio.Future] = {}
+    runner, port = await start_telegram_stub(replies)
+
+    os.environ.update({
+        "BOT_API_KEY": TOKEN,
+        "BOT_API_BASE_URL": f"http://127.0.0.1:{port}/bot",
+        "BOT_WEBHOOK_ENABLED": "true",
+        "BOT_WEBHOOK_URL": "https://example.invalid/bot/telegram/webhook",
+        "BOT_WEBHOOK_SECRET": SECRET,
+        "BOT_UPDATE_QUEUE_SIZE": str(queue_size),
+    })
+    from telegram_bot_main import create_application
+
+    app = create_application()
+    headers = {"X-Telegram-Bot-Api-Secret-Token": SECRET}
+    latencies: List[float] = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    try:
+        async with app.router.lifespan_context(app):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://bot") as client:
+                response = await client.post(
+                    "/telegram/webhook",
+                    json=command_update(0, -1),
+                    headers={"X-Telegram-Bot-Api-Secret-Token": "wrong"},
+                )
+                print(f"wrong secret: {response.status_code}")
+
+                async def one(update_id: int) -> None:
+                    chat_id = -1000 - update_id
+                    async with semaphore:
+                        reply = replies[chat_id] = asyncio.get_running_loop().create_future()
+                        started = time.perf_counter()
+                        response = await client.post(
+                            "/telegram/webhook", json=command_update(update_id, chat_id), headers=headers
+                        )
+                        response.raise_for_status()
+                        replied = await asyncio.wait_for(reply, 10)
+                        latencies.append((replied - started) * 1000)
+
+                started = time.perf_counter()
+                await asyncio.gather(*(one(update_id) for update_id in range(1, updates + 1)))
+                elapsed = time.perf_counter() - started
+                print(
+                    f"updates/s {updates / elapsed:.0f}  "
+                    f"p50 {percentile(latencies, 50):.2f} ms  p99 {percentile(latencies, 99):.2f} ms"
+                )
+
+                # Всплеск больше очереди без ожидания ответов: лишнее получает 503
+                statuses = await asyncio.gather(*(
+                    client.post("/telegram/webhook", json=command_update(100000 + index, -1), headers=headers)
+                    for index in range(queue_size * 4)
+                ))
+                rejected = sum(1 for response in statuses if response.status_code == 503)
+                print(f"burst of {queue_size * 4}: rejected with 503 {rejected}")
+    finally:
+        await app.state.dishka_container.close()
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--updates", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--queue-size", type=int, default=64)
+    args = parser.parse_args()
+
+    if sys.platform == "win32":
+        asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+
+    asyncio.run(run(args.updates, args.concurrency, args.queue_size))
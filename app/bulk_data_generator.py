@@ -0,0 +1,428 @@
+"""Большой набор данных через COPY: города, рестораны, пользователи, заказы.
+
+Запуск из директории app (нужна БД из .env с примененными миграциями):
+    python bulk_data_generator.py --cities 20 --restaurants-per-city 15 --users 200000 --orders 2000000 --seed 42
+
+Меню (категории, блюда, варианты, ингредиенты, фичи) берется из БД; если блюд
+еще нет, сначала выполняется vivat_data_generator.generate_data. Остальное
+пишется через COPY пачками по --batch-size строк верхнего уровня (пользователей
+или заказов со всеми их позициями и ингредиентами), каждая пачка в своей
+транзакции: память не растет вместе с объемом, а прерванный запуск оставляет
+только целые пачки.
+
+id назначаются скриптом от текущего max(id), в конце последовательности
+сдвигаются через setval. Пока скрипт работает, приложение не должно писать
+в эти таблицы. При одинаковых --seed и --end-date получается один и тот же
+набор данных. Пароль всех сгенерированных пользователей - PASSWORD.
+"""
+import argparse
+import asyncio
+import random
+import sys
+import time as timer
+from array import array
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from math import ceil
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+import psycopg
+from argon2 import PasswordHasher
+from psycopg import sql
+
+from src.config import get_config
+
+
+PASSWORD = "bulk-password"
+
+STREETS = [
+    "Ленина", "Горького", "Садовая", "Набережная", "Морская", "Гагарина",
+    "Пушкина", "Кирова", "Советская", "Школьная", "Лесная", "Зеленая",
+]
+PICKUP_LETTERS = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+# Таблицы с id, которые назначает скрипт
+SERIAL_TABLES = [
+    "city", "restaurant", "working_hours", "user", "user_address",
+    "refresh_token", "order", "order_item",
+]
+ANALYZE_TABLES = SERIAL_TABLES + [
+    "restaurant_category", "restaurant_feature", "restaurant_food_disabled",
+    "__order_item_added_ingredient", "__order_item_removed_ingredient",
+]
+
+
+@dataclass
+class Menu:
+    categories: List[int]
+    features: List[int]
+    foods: List[int]
+    # (id, food_id, price, ingredient_price_modifier)
+    variants: List[Tuple[int, int, int, float]]
+    # food_id -> [(ingredient_id, price)] - можно добавить
+    addings: Dict[int, List[Tuple[int, int]]]
+    # food_id -> [ingredient_id] - есть по умолчанию, можно убрать
+    defaults: Dict[int, List[int]]
+
+
+class Ids:
+    """Следующие свободные id таблиц, начиная с max(id) + 1"""
+
+    def __init__(self, start: Dict[str, int]) -> None:
+        self._next = dict(start)
+
+    def take(self, table: str, count: int = 1) -> int:
+        first = self._next[table]
+        self._next[table] += count
+        return first
+
+
+async def copy_rows(
+    connection: psycopg.AsyncConnection,
+    table: str,
+    columns: Sequence[str],
+    rows: Iterable[tuple],
+) -> int:
+    statement = sql.SQL("COPY {} ({}) FROM STDIN").format(
+        sql.Identifier(table),
+        sql.SQL(", ").join(map(sql.Identifier, columns)),
+    )
+    count = 0
+    async with connection.cursor() as cursor:
+        async with cursor.copy(statement) as copy:
+            for row in rows:
+                await copy.write_row(row)
+                count += 1
+    return count
+
+
+async def ensure_menu(connection: psycopg.AsyncConnection) -> None:
+    if await (await connection.execute("SELECT 1 FROM food LIMIT 1")).fetchone():
+        return
+
+    # Меню небольшое и со связями через ORM - его создает обычный генератор
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+    from src.infrastructure.drivers.db.database import create_engine
+    from vivat_data_generator import generate_data
+
+    engine = create_engine(get_config().postgres)
+    try:
+        async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+            await generate_data(session)
+            await session.commit()
+    finally:
+        await engine.dispose()
+
+
+async def load_menu(connection: psycopg.AsyncConnection) -> Menu:
+    async def column(query: str) -> List[int]:
+        return [row[0] for row in await (await connection.execute(query)).fetchall()]
+
+    variants = await (await connection.execute(
+        "SELECT id, food_id, price, coalesce(ingredient_price_modifier, 1) "
+        "FROM food_variant WHERE is_active IS NOT FALSE ORDER BY id"
+    )).fetchall()
+    associations = await (await connection.execute(
+        "SELECT fi.food_id, fi.ingredient_id, i.price, fi.is_adding, fi.is_default "
+        "FROM food_ingredient fi JOIN ingredient i ON i.id = fi.ingredient_id "
+        "WHERE i.is_available IS NOT FALSE ORDER BY fi.food_id, fi.ingredient_id"
+    )).fetchall()
+
+    addings: Dict[int, List[Tuple[int, int]]] = {}
+    defaults: Dict[int, List[int]] = {}
+    for food_id, ingredient_id, price, is_adding, is_default in associations:
+        if is_adding:
+            addings.setdefault(food_id, []).append((ingredient_id, price))
+        if is_default:
+            defaults.setdefault(food_id, []).append(ingredient_id)
+
+    return Menu(
+        categories=await column("SELECT id FROM menu_category ORDER BY id"),
+        features=await column("SELECT id FROM feature ORDER BY id"),
+        foods=await column("SELECT id FROM food ORDER BY id"),
+        variants=[(row[0], row[1], row[2], float(row[3])) for row in variants],
+        addings=addings,
+        defaults=defaults,
+    )
+
+
+async def current_ids(connection: psycopg.AsyncConnection) -> Ids:
+    start = {}
+    for table in SERIAL_TABLES:
+        query = sql.SQL("SELECT coalesce(max(id), 0) + 1 FROM {}").format(sql.Identifier(table))
+        start[table] = (await (await connection.execute(query)).fetchone())[0]
+    return Ids(start)
+
+
+class BulkGenerator:
+    def __init__(self, connection: psycopg.AsyncConnection, menu: Menu, ids: Ids, args: argparse.Namespace) -> None:
+        self._connection = connection
+        self._menu = menu
+        self._ids = ids
+        self._args = args
+        self._rng = random.Random(args.seed)
+        self._end = datetime.combine(args.end_date, time())
+        self._start = self._end - timedelta(days=args.days)
+        # (id, delivery_price, доступные способы получения)
+        self._restaurants: List[Tuple[int, int, List[str]]] = []
+        # Адреса созданных пользователей: первый id и количество, по индексу пользователя
+        self._first_user_id = 0
+        self._address_first = array("l")
+        self._address_count = array("b")
+
+    async def run(self) -> None:
+        await self._batch("restaurants", self.restaurants)
+        for first in range(0, self._args.users, self._args.batch_size):
+            await self._batch("users", self.users, min(self._args.batch_size, self._args.users - first))
+        for first in range(0, self._args.orders, self._args.batch_size):
+            await self._batch("orders", self.orders, first, min(self._args.batch_size, self._args.orders - first))
+
+    async def _batch(self, name: str, generate, *args) -> None:
+        started = timer.perf_counter()
+        async with self._connection.transaction():
+            rows = await generate(*args)
+        elapsed = timer.perf_counter() - started
+        print(f"{name:<12} {rows:>10} rows {elapsed:>7.2f}s {rows / elapsed:>10.0f} rows/s")
+
+    async def restaurants(self) -> int:
+        rng, menu = self._rng, self._menu
+        rows = 0
+
+        cities, restaurants, hours, categories, features, disabled = [], [], [], [], [], []
+        for _ in range(self._args.cities):
+            city_id = self._ids.take("city")
+            latitude, longitude = rng.uniform(43.0, 60.0), rng.uniform(30.0, 60.0)
+            cities.append((city_id, f"Город {city_id}", latitude, longitude))
+
+            for _ in range(self._args.restaurants_per_city):
+                restaurant_id = self._ids.take("restaurant")
+                has_delivery = rng.random() < 0.8
+                has_dine_in = rng.random() < 0.6
+                delivery_price = rng.choice([0, 100, 150, 200])
+                restaurants.append((
+                    restaurant_id, city_id, f"Виват {restaurant_id}", f"+7978{restaurant_id:07d}",
+                    f"ул. {rng.choice(STREETS)}, {rng.randint(1, 120)}", delivery_price,
+                    latitude + rng.uniform(-0.05, 0.05), longitude + rng.uniform(-0.05, 0.05),
+                    has_delivery, True, has_dine_in, rng.random() < 0.95,
+                ))
+                actions = ["takeaway"] + ["delivery"] * has_delivery + ["inside"] * has_dine_in
+                self._restaurants.append((restaurant_id, delivery_price, actions))
+
+                opens_at = time(rng.choice([8, 9, 10]))
+                closes_at = time(rng.choice([21, 22, 23]))
+                for day in range(7):
+                    hours.append((self._ids.take("working_hours"), restaurant_id, day, opens_at, closes_at, False))
+                categories.extend((restaurant_id, category_id) for category_id in menu.categories)
+                features.extend(
+                    (restaurant_id, feature_id)
+                    for feature_id in rng.sample(menu.features, rng.randint(0, len(menu.features)))
+                )
+                disabled.extend((restaurant_id, food_id) for food_id in menu.foods if rng.random() < 0.02)
+
+        rows += await copy_rows(self._connection, "city", ("id", "name", "latitude", "longitude"), cities)
+        rows += await copy_rows(
+            self._connection,
+            "restaurant",
+            (
+                "id", "city_id", "name", "phone", "address", "delivery_price", "latitude", "longitude",
+                "has_delivery", "has_takeaway", "has_dine_in", "is_active",
+            ),
+            restaurants,
+        )
+        rows += await copy_rows(
+            self._connection,
+            "working_hours",
+            ("id", "restaurant_id", "day_of_week", "opens_at", "closes_at", "is_holiday"),
+            hours,
+        )
+        rows += await copy_rows(self._connection, "restaurant_category", ("restaurant_id", "category_id"), categories)
+        rows += await copy_rows(self._connection, "restaurant_feature", ("restaurant_id", "feature_id"), features)
+        rows += await copy_rows(self._connection, "restaurant_food_disabled", ("restaurant_id", "food_id"), disabled)
+        return rows
+
+    async def users(self, count: int) -> int:
+        rng = self._rng
+        now = self._end
+        hashed_password = self._args.hashed_password
+
+        users, addresses, tokens = [], [], []
+        for _ in range(count):
+            user_id = self._ids.take("user")
+            if not self._first_user_id:
+                self._first_user_id = user_id
+            users.append((user_id, f"Пользователь {user_id}", f"+7999{user_id:07d}", hashed_password, False, rng.random() < 0.002))
+
+            address_count = rng.choice([0, 1, 1, 1, 2, 3])
+            first_address = self._ids.take("user_address", address_count)
+            self._address_first.append(first_address)
+            self._address_count.append(address_count)
+            for index in range(address_count):
+                addresses.append((
+                    first_address + index, user_id, f"ул. {rng.choice(STREETS)}, {rng.randint(1, 120)}",
+                    str(rng.randint(1, 6)), rng.randint(1, 16), str(rng.randint(1, 200)), index == 0, False,
+                ))
+
+            for index in range(rng.choice([0, 1, 1, 2, 3])):
+                token_id = self._ids.take("refresh_token")
+                created_at = now - timedelta(seconds=rng.randint(0, 14 * 24 * 3600))
+                # Токен действует 7 дней, старые и все, кроме последнего, отозваны
+                expires_at = created_at + timedelta(days=7)
+                tokens.append((token_id, user_id, f"bulk-{token_id}", index > 0 or expires_at < now, expires_at, created_at))
+
+        rows = await copy_rows(
+            self._connection,
+            "user",
+            ("id", "name", "phone", "hashed_password", "is_removed", "is_banned"),
+            users,
+        )
+        rows += await copy_rows(
+            self._connection,
+            "user_address",
+            ("id", "user_id", "address", "entrance", "floor", "apartment", "is_primary", "is_removed"),
+            addresses,
+        )
+        rows += await copy_rows(
+            self._connection,
+            "refresh_token",
+            ("id", "user_id", "token", "is_revoked", "expires_at", "created_at"),
+            tokens,
+        )
+        return rows
+
+    async def orders(self, first: int, count: int) -> int:
+        rng, menu = self._rng, self._menu
+        span = (self._end - self._start).total_seconds()
+        users = len(self._address_first)
+
+        orders, items, added, removed = [], [], [], []
+        for index in range(first, first + count):
+            order_id = self._ids.take("order")
+            # Заказы идут по времени, у небольшой доли пользователей большая часть заказов
+            created_at = self._start + timedelta(seconds=span * (index + rng.random()) / self._args.orders)
+            user_index = int(users * rng.random() ** 2)
+            restaurant_id, _, actions = rng.choice(self._restaurants)
+
+            action = rng.choice(actions)
+            address_id = None
+            if action == "delivery":
+                if self._address_count[user_index]:
+                    address_id = self._address_first[user_index] + rng.randrange(self._address_count[user_index])
+                else:
+                    action = "takeaway"
+
+            if self._end - created_at < timedelta(hours=1):
+                status = rng.choice(["created", "in_progress", "cooked"])
+            else:
+                status = "cancelled" if rng.random() < 0.08 else "done"
+
+            total_price = 0
+            for _ in range(1 + min(int(rng.expovariate(0.8)), 5)):
+                item_id = self._ids.take("order_item")
+                variant_id, food_id, price, modifier = rng.choice(menu.variants)
+                quantity = 1 if rng.random() < 0.8 else rng.randint(2, 3)
+
+                final_price = price
+                food_addings = menu.addings.get(food_id)
+                if food_addings and rng.random() < 0.35:
+                    for ingredient_id, ingredient_price in rng.sample(food_addings, min(len(food_addings), rng.randint(1, 2))):
+                        amount = rng.randint(1, 2)
+                        final_price += ceil(ingredient_price * modifier) * amount
+                        added.append((item_id, ingredient_id, amount))
+
+                food_defaults = menu.defaults.get(food_id)
+                if food_defaults and rng.random() < 0.2:
+                    removed.append((item_id, rng.choice(food_defaults)))
+
+                items.append((item_id, variant_id, order_id, quantity, final_price))
+                total_price += final_price * quantity
+
+            orders.append((
+                order_id, self._first_user_id + user_index, restaurant_id, address_id, action, status,
+                total_price, f"{PICKUP_LETTERS[order_id // 1000 % 26]}{order_id % 1000:03d}",
+                created_at, created_at + timedelta(minutes=rng.randint(1, 90)),
+            ))
+
+        rows = await copy_rows(
+            self._connection,
+            "order",
+            (
+                "id", "user_id", "restaurant_id", "address_id", "order_action", "status",
+                "total_price", "unique_code", "created_at", "updated_at",
+            ),
+            orders,
+        )
+        rows += await copy_rows(
+            self._connection,
+            "order_item",
+            ("id", "food_variant_id", "order_id", "quantity", "final_price"),
+            items,
+        )
+        rows += await copy_rows(
+            self._connection,
+            "__order_item_added_ingredient",
+            ("order_item_id", "added_id", "quantity"),
+            added,
+        )
+        rows += await copy_rows(
+            self._connection,
+            "__order_item_removed_ingredient",
+            ("order_item_id", "removed_id"),
+            removed,
+        )
+        return rows
+
+
+async def finish(connection: psycopg.AsyncConnection) -> None:
+    for table in SERIAL_TABLES:
+        await connection.execute(
+            sql.SQL("SELECT setval(pg_get_serial_sequence(%s, 'id'), (SELECT max(id) FROM {}))").format(
+                sql.Identifier(table)
+            ),
+            (sql.Identifier(table).as_string(connection),),
+        )
+    for table in ANALYZE_TABLES:
+        await connection.execute(sql.SQL("ANALYZE {}").format(sql.Identifier(table)))
+
+
+async def main(args: argparse.Namespace) -> None:
+    config = get_config()
+    argon = config.argon2
+    args.hashed_password = PasswordHasher(
+        time_cost=argon.argon2_time_cost,
+        memory_cost=argon.argon2_memory_cost,
+        parallelism=argon.argon2_parallelism,
+    ).hash(PASSWORD)
+
+    async with await psycopg.AsyncConnection.connect(config.postgres.build_conninfo(), autocommit=True) as connection:
+        await ensure_menu(connection)
+        menu = await load_menu(connection)
+        if not menu.variants:
+            raise RuntimeError("В меню нет активных вариантов блюд")
+
+        started = timer.perf_counter()
+        await BulkGenerator(connection, menu, await current_ids(connection), args).run()
+        await finish(connection)
+        print(f"done in {timer.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cities", type=int, default=10)
+    parser.add_argument("--restaurants-per-city", type=int, default=10)
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--orders", type=int, default=1_000_000)
+    parser.add_argument("--days", type=int, default=365, help="за сколько дней до --end-date распределены заказы")
+    parser.add_argument("--end-date", type=date.fromisoformat, default=date.today())
+    parser.add_argument("--batch-size", type=int, default=50_000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    if args.cities < 1 or args.restaurants_per_city < 1:
+        parser.error("нужен хотя бы один город и ресторан")
+    if args.orders and args.users < 1:
+        parser.error("для заказов нужен хотя бы один пользователь")
+
+    if sys.platform == "win32":
+        asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+
+    asyncio.run(main(args))
@@ -1,19 +1,23 @@
 import asyncio
 from contextlib import asynccontextmanager
+import signal
 import sys
 import os
 
 import uvicorn
+from aiohttp import ClientSession
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 from dishka.integrations.fastapi import setup_dishka
 from dishka import AsyncContainer
 
-from src.middlewares import exception_middleware, transaction_middleware
+from src.middlewares import exception_middleware, metrics_middleware, request_id_middleware, transaction_middleware
 from src.exceptions import register_exception_handlers
 from src.ioc.ioc_main import create_container
-from src.config import Config, create_config
+from src.config import Config, get_config, reload_config
+from src.infrastructure.drivers.db.notifications import PgListener
+from src.infrastructure.adapters.notification.outbox_dispatcher import OrderOutboxDispatcher
 from src.infrastructure.adapters.controllers import (
     food_controller,
     restaurant_controller,
@@ -27,7 +31,9 @@ from src.infrastructure.adapters.controllers import (
     ingredient_controller,
     user_address_controller,
     order_controller,
-    order_item_controller
+    order_item_controller,
+    search_controller,
+    metrics_controller,
 )
 from src.logger import logger
 
@@ -46,6 +52,8 @@ def setup_routers(app: FastAPI) -> None:
     app.include_router(user_address_controller.router, tags=["User Address"])
     app.include_router(order_controller.router, tags=["Order"])
     app.include_router(order_item_controller.router, tags=["Order Item"])
+    app.include_router(search_controller.router, tags=["Search"])
+    app.include_router(metrics_controller.router)
 
 
 def setup_middlewares(app: FastAPI, config: Config) -> None:
@@ -58,6 +66,8 @@ def setup_middlewares(app: FastAPI, config: Config) -> None:
     )
     app.middleware("http")(transaction_middleware.transaction_middleware) # 1-й - оборачивает в транзакцию
     app.middleware("http")(exception_middleware.exception_middleware) # затем 2-й - перехватывает все ошибки
+    app.middleware("http")(metrics_middleware.metrics_middleware) # 3-й - время запроса и счетчики БД
+    app.middleware("http")(request_id_middleware.request_id_middleware) # 4-й - id запроса, внешний: его видит и закрытие сессии
 
 
 def setup_static_files(app: FastAPI) -> None:
@@ -69,17 +79,48 @@ def setup_static_files(app: FastAPI) -> None:
     app.mount("/static", StaticFiles(directory="static"), name="static")
 
 
+def handle_config_reload() -> None:
+    """SIGHUP: перечитать .env без перезапуска воркера"""
+    config = reload_config()
+    logger.setLevel(config.app.log_level)
+    logger.info("Config reloaded")
+
+
+def install_config_reload() -> None:
+    if sys.platform != "win32":
+        asyncio.get_running_loop().add_signal_handler(signal.SIGHUP, handle_config_reload)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    container: AsyncContainer = app.state.dishka_container
+    install_config_reload()
+
+    # Слушатель NOTIFY сбрасывает кэши после изменений из других процессов (бан в боте)
+    await container.get(PgListener)
+    # Пул HTTP-соединений к боту создается до первого заказа и закрывается с контейнером
+    await container.get(ClientSession)
+    # Отправка уведомлений о заказах в бота из order_outbox
+    await container.get(OrderOutboxDispatcher)
+
+    yield
+
+    await container.close()
+
+
 def create_application() -> FastAPI:
-    config: Config = create_config()
+    config: Config = get_config()
     app: FastAPI = FastAPI(
         root_path="/api",
+        lifespan=lifespan,
         debug=True if config.app.environment == "development" else False
     )
 
     container: AsyncContainer = create_container()
+    app.state.config = config
     app.state.dishka_container = container
-    setup_dishka(container, app)
     setup_middlewares(app, config)
+    setup_dishka(container, app) # после middleware: контейнер запроса оборачивает транзакцию
     setup_static_files(app)
     register_exception_handlers(app)
     setup_routers(app)
@@ -88,7 +129,7 @@ def create_application() -> FastAPI:
 
 
 if __name__ == "__main__":
-    config: Config = create_config()
+    config: Config = get_config()
 
     if sys.platform == "win32":
         asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
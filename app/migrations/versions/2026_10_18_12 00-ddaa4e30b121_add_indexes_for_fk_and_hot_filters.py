@@ -0,0 +1,89 @@
+"""add indexes for foreign keys and hot filter columns
+
+Revision ID: ddaa4e30b121
+Revises: 4bbe71157911
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ddaa4e30b121'
+down_revision: Union[str, None] = '4bbe71157911'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (имя индекса, таблица, колонки, условие частичного индекса)
+INDEXES = [
+    ('ix_order_user_id_created_at_id', 'order', ['user_id', 'created_at', 'id'], None),
+    ('ix_order_restaurant_id_created_at', 'order', ['restaurant_id', 'created_at'], None),
+    ('ix_order_address_id', 'order', ['address_id'], None),
+    ('ix_order_item_order_id', 'order_item', ['order_id'], None),
+    ('ix_order_item_food_variant_id', 'order_item', ['food_variant_id'], None),
+    ('ix_food_variant_food_id', 'food_variant', ['food_id', 'is_active'], None),
+    ('ix_food_category_id', 'food', ['category_id'], None),
+    ('ix_food_ingredient_ingredient_id', 'food_ingredient', ['ingredient_id'], None),
+    ('ix_working_hours_restaurant_id_day_of_week', 'working_hours', ['restaurant_id', 'day_of_week'], None),
+    ('ix_refresh_token_user_id_token_active', 'refresh_token', ['user_id', 'token'], 'NOT is_revoked'),
+    ('ix_user_address_user_id', 'user_address', ['user_id', 'is_primary'], None),
+    ('ix_restaurant_city_id_active', 'restaurant', ['city_id'], 'is_active'),
+    ('ix_restaurant_category_restaurant_id', 'restaurant_category', ['restaurant_id', 'category_id'], None),
+    ('ix_restaurant_category_category_id', 'restaurant_category', ['category_id', 'restaurant_id'], None),
+    ('ix_restaurant_food_disabled_restaurant_id', 'restaurant_food_disabled', ['restaurant_id', 'food_id'], None),
+    ('ix_restaurant_food_disabled_food_id', 'restaurant_food_disabled', ['food_id'], None),
+    ('ix_restaurant_feature_restaurant_id', 'restaurant_feature', ['restaurant_id', 'feature_id'], None),
+    ('ix_restaurant_feature_feature_id', 'restaurant_feature', ['feature_id'], None),
+    ('ix_restaurant_telegram_chat_restaurant_id', 'restaurant_telegram_chat', ['restaurant_id', 'chat_id'], None),
+    ('ix_restaurant_telegram_chat_chat_id', 'restaurant_telegram_chat', ['chat_id', 'restaurant_id'], None),
+    ('ix_user_favorite_user_id', 'user_favorite', ['user_id', 'food_id'], None),
+    ('ix_user_favorite_food_id', 'user_favorite', ['food_id'], None),
+    ('ix_food_characteristic_variant_variant_id', 'food_characteristic_variant', ['variant_id', 'characteristic_id'], None),
+    ('ix_food_characteristic_variant_characteristic_id', 'food_characteristic_variant', ['characteristic_id'], None),
+    ('ix_order_item_added_ingredient_order_item_id', '__order_item_added_ingredient', ['order_item_id', 'added_id'], None),
+    ('ix_order_item_added_ingredient_added_id', '__order_item_added_ingredient', ['added_id'], None),
+    ('ix_order_item_removed_ingredient_order_item_id', '__order_item_removed_ingredient', ['order_item_id', 'removed_id'], None),
+    ('ix_order_item_removed_ingredient_removed_id', '__order_item_removed_ingredient', ['removed_id'], None),
+]
+
+
+def _drop_invalid_index(name: str) -> None:
+    # Прерванный CREATE INDEX CONCURRENTLY оставляет невалидный индекс,
+    # который IF NOT EXISTS пропустил бы при повторном запуске
+    is_invalid = op.get_bind().execute(
+        sa.text(
+            'SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid '
+            'WHERE c.relname = :name AND NOT i.indisvalid'
+        ),
+        {'name': name},
+    ).scalar()
+    if is_invalid:
+        op.drop_index(name, postgresql_concurrently=True)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY не блокирует запись в таблицы, но не работает внутри транзакции
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            if not op.get_context().as_sql:
+                _drop_invalid_index(name)
+            op.create_index(
+                name,
+                table,
+                columns,
+                postgresql_concurrently=True,
+                postgresql_where=sa.text(where) if where else None,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
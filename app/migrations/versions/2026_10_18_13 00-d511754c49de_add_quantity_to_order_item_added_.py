@@ -0,0 +1,55 @@
+"""add quantity to order item added ingredient
+
+Revision ID: d511754c49de
+Revises: ddaa4e30b121
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd511754c49de'
+down_revision: Union[str, None] = 'ddaa4e30b121'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        '__order_item_added_ingredient',
+        sa.Column('quantity', sa.Integer(), nullable=False, server_default='1'),
+    )
+
+    # Повторяющиеся строки (item, ингредиент) схлопываем в одну с количеством
+    op.execute('''
+        WITH removed AS (
+            DELETE FROM __order_item_added_ingredient
+            RETURNING order_item_id, added_id
+        )
+        INSERT INTO __order_item_added_ingredient (order_item_id, added_id, quantity)
+        SELECT order_item_id, added_id, count(*)
+        FROM removed
+        GROUP BY order_item_id, added_id
+    ''')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Разворачиваем количество обратно в повторяющиеся строки
+    op.execute('''
+        WITH removed AS (
+            DELETE FROM __order_item_added_ingredient
+            WHERE quantity > 1
+            RETURNING order_item_id, added_id, quantity
+        )
+        INSERT INTO __order_item_added_ingredient (order_item_id, added_id)
+        SELECT order_item_id, added_id
+        FROM removed, generate_series(1, removed.quantity)
+    ''')
+
+    op.drop_column('__order_item_added_ingredient', 'quantity')
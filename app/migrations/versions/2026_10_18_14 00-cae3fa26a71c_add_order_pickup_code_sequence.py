@@ -0,0 +1,38 @@
+"""add order pickup code sequence
+
+Revision ID: cae3fa26a71c
+Revises: d511754c49de
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.schema import CreateSequence, DropSequence
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'cae3fa26a71c'
+down_revision: Union[str, None] = 'd511754c49de'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+order_pickup_code_seq = sa.Sequence(
+    'order_pickup_code_seq',
+    start=0,
+    minvalue=0,
+    maxvalue=25999,
+    cycle=True,
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(CreateSequence(order_pickup_code_seq, if_not_exists=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(DropSequence(order_pickup_code_seq, if_exists=True))
@@ -0,0 +1,51 @@
+"""notify telegram routing changes
+
+Revision ID: 5e2c8d1f7a36
+Revises: b79bcfe9bc6d
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e2c8d1f7a36'
+down_revision: Union[str, None] = 'b79bcfe9bc6d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Бот держит таблицу ресторан -> чаты в памяти; чаты привязывают вручную,
+# поэтому уведомление шлет триггер, а не код приложения
+TABLES = ['telegram_chat', 'restaurant_telegram_chat']
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION notify_telegram_routing_changed() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify('telegram_routing_changed', TG_TABLE_NAME);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    for table in TABLES:
+        op.execute(
+            f"""
+            CREATE TRIGGER {table}_routing_changed
+            AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table}
+            FOR EACH STATEMENT EXECUTE FUNCTION notify_telegram_routing_changed()
+            """
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_routing_changed ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS notify_telegram_routing_changed()")
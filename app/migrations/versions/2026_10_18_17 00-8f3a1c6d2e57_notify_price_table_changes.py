@@ -0,0 +1,51 @@
+"""notify price table changes
+
+Revision ID: 8f3a1c6d2e57
+Revises: 5e2c8d1f7a36
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8f3a1c6d2e57'
+down_revision: Union[str, None] = '5e2c8d1f7a36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Каждый воркер API держит таблицу цен в памяти; меню меняют из любого
+# воркера и вручную в БД, поэтому уведомление шлет триггер
+TABLES = ['food', 'food_variant', 'food_ingredient', 'ingredient']
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION notify_price_table_changed() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify('price_table_changed', TG_TABLE_NAME);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    for table in TABLES:
+        op.execute(
+            f"""
+            CREATE TRIGGER {table}_price_table_changed
+            AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table}
+            FOR EACH STATEMENT EXECUTE FUNCTION notify_price_table_changed()
+            """
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_price_table_changed ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS notify_price_table_changed()")
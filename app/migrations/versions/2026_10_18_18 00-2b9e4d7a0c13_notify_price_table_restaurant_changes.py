@@ -0,0 +1,40 @@
+"""notify price table restaurant changes
+
+Revision ID: 2b9e4d7a0c13
+Revises: 8f3a1c6d2e57
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2b9e4d7a0c13'
+down_revision: Union[str, None] = '8f3a1c6d2e57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Заказ проверяется по таблице цен целиком: в ней теперь данные ресторанов
+# и характеристики вариантов для текста заказа
+TABLES = ['restaurant', 'food_characteristic', 'food_characteristic_variant']
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in TABLES:
+        op.execute(
+            f"""
+            CREATE TRIGGER {table}_price_table_changed
+            AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table}
+            FOR EACH STATEMENT EXECUTE FUNCTION notify_price_table_changed()
+            """
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_price_table_changed ON {table}")
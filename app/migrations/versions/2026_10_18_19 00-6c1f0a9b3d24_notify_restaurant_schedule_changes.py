@@ -0,0 +1,50 @@
+"""notify restaurant schedule changes
+
+Revision ID: 6c1f0a9b3d24
+Revises: 2b9e4d7a0c13
+Create Date: 2026-10-18 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6c1f0a9b3d24'
+down_revision: Union[str, None] = '2b9e4d7a0c13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Каждый воркер API держит скомпилированные часы работы в памяти
+TABLES = ['working_hours']
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION notify_restaurant_schedule_changed() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify('restaurant_schedule_changed', TG_TABLE_NAME);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    for table in TABLES:
+        op.execute(
+            f"""
+            CREATE TRIGGER {table}_schedule_changed
+            AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table}
+            FOR EACH STATEMENT EXECUTE FUNCTION notify_restaurant_schedule_changed()
+            """
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_schedule_changed ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS notify_restaurant_schedule_changed()")
@@ -0,0 +1,50 @@
+"""notify restaurant location changes
+
+Revision ID: 9d4e2b7f1a86
+Revises: 6c1f0a9b3d24
+Create Date: 2026-10-18 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d4e2b7f1a86'
+down_revision: Union[str, None] = '6c1f0a9b3d24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Каждый воркер API держит сетку координат ресторанов в памяти
+TABLES = ['restaurant']
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION notify_restaurant_locations_changed() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify('restaurant_locations_changed', TG_TABLE_NAME);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    for table in TABLES:
+        op.execute(
+            f"""
+            CREATE TRIGGER {table}_locations_changed
+            AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table}
+            FOR EACH STATEMENT EXECUTE FUNCTION notify_restaurant_locations_changed()
+            """
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_locations_changed ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS notify_restaurant_locations_changed()")
@@ -0,0 +1,58 @@
+"""notify menu search changes
+
+Revision ID: 3a7c5e1b9f42
+Revises: 9d4e2b7f1a86
+Create Date: 2026-10-18 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3a7c5e1b9f42'
+down_revision: Union[str, None] = '9d4e2b7f1a86'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Каждый воркер API держит поисковый индекс меню в памяти
+TABLES = [
+    'food',
+    'food_variant',
+    'food_ingredient',
+    'ingredient',
+    'restaurant',
+    'restaurant_category',
+    'restaurant_food_disabled',
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION notify_menu_search_changed() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify('menu_search_changed', TG_TABLE_NAME);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    for table in TABLES:
+        op.execute(
+            f"""
+            CREATE TRIGGER {table}_menu_search_changed
+            AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table}
+            FOR EACH STATEMENT EXECUTE FUNCTION notify_menu_search_changed()
+            """
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_menu_search_changed ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS notify_menu_search_changed()")
@@ -0,0 +1,28 @@
+"""rename food variant food id index
+
+Revision ID: 5e8b1d3f7a29
+Revises: 3a7c5e1b9f42
+Create Date: 2026-10-18 22:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e8b1d3f7a29'
+down_revision: Union[str, None] = '3a7c5e1b9f42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Индекс по (food_id, is_active): имя должно называть обе колонки
+    op.execute('ALTER INDEX ix_food_variant_food_id RENAME TO ix_food_variant_food_id_is_active')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute('ALTER INDEX ix_food_variant_food_id_is_active RENAME TO ix_food_variant_food_id')
@@ -14,6 +14,9 @@ class DatabaseException(ApplicationError):
 class IdNotValidError(ApplicationError):
     pass
 
+class CursorNotValidError(ApplicationError):
+    pass
+
 class TokenError(ApplicationError):
     def __init__(self, msg: str) -> None:
         super().__init__(msg)
\ No newline at end of file
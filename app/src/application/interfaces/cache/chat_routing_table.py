@@ -0,0 +1,16 @@
+from abc import abstractmethod
+from typing import List, Protocol
+
+
+class IChatRoutingTable(Protocol):
+    @abstractmethod
+    async def get_chat_ids(self, restaurant_id: int) -> List[str]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def refresh(self) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def invalidate(self) -> None:
+        raise NotImplementedError
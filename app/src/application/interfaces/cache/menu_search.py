@@ -0,0 +1,179 @@
+import re
+from abc import abstractmethod
+from bisect import bisect_left
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, List, Optional, Protocol, Set, Tuple
+
+
+# Вес совпадения по полю блюда
+NAME_WEIGHT = 3.0
+INGREDIENT_WEIGHT = 2.0
+DESCRIPTION_WEIGHT = 1.0
+# Слово запроса - только начало слова меню (ввод еще не закончен)
+PREFIX_FACTOR = 0.75
+# Слово запроса без окончания ("грибами" -> "гриб")
+STEM_FACTOR = 0.6
+# Слово запроса с одной опечаткой
+FUZZY_FACTOR = 0.5
+# Короче - опечатки не ищутся, слишком много ложных совпадений
+FUZZY_MIN_LENGTH = 4
+
+_WORD_RE = re.compile(r"[0-9a-zа-я]+")
+# Предлоги и союзы в запросе ("пицца на тонком тесте") не сужают поиск
+STOP_WORDS = frozenset(("и", "в", "во", "на", "из", "для", "по", "от"))
+# "с грибами" - грибы обязательны, как любое слово запроса
+WITH_WORDS = frozenset(("с", "со"))
+# "без грибов" - блюда с грибами убираются из результата
+WITHOUT_WORDS = frozenset(("без",))
+
+
+def tokenize(text: str) -> List[str]:
+    return _WORD_RE.findall(text.lower().replace("ё", "е"))
+
+
+def parse_query(query: str) -> Tuple[List[str], List[str]]:
+    """Слова запроса: (обязательные, исключенные через "без")"""
+    tokens = tokenize(query)
+    terms: List[str] = []
+    excluded: List[str] = []
+    negated = False
+    for index, token in enumerate(tokens):
+        if token in WITHOUT_WORDS:
+            negated = True
+        elif token in STOP_WORDS or token in WITH_WORDS:
+            continue
+        elif negated:
+            excluded.append(token)
+            # "без лука и чеснока" - исключаются оба
+            negated = tokens[index + 1:index + 2] == ["и"]
+        else:
+            terms.append(token)
+
+    # Запрос только из предлогов и союзов ищется как есть
+    if not terms and not excluded:
+        terms = tokens
+    return terms, excluded
+
+
+def deletes(word: str) -> Set[str]:
+    """Слово без одной буквы в каждой позиции - ключи поиска с одной опечаткой"""
+    return {word[:index] + word[index + 1:] for index in range(len(word))}
+
+
+@dataclass(frozen=True)
+class SearchDocument:
+    food_id: int
+    category_id: Optional[int]
+    name: str
+    description: str
+    image_url: Optional[str] # имя файла, URL собирает интерактор
+    price_from: int # цена самого дешевого активного варианта
+
+
+@dataclass(frozen=True)
+class MenuSearchIndex:
+    """Обратный индекс слов названий, описаний и состава блюд.
+
+    Слова отсортированы: все слова с началом из запроса - один бинарный
+    поиск. В индексе только блюда с активными вариантами, для ресторана
+    дополнительно убираются блюда чужих категорий и отключенные в нем.
+    """
+    version: int
+    documents: Dict[int, SearchDocument] # Food.id -> блюдо
+    words: Tuple[str, ...] # все слова индекса по алфавиту
+    postings: Dict[str, Dict[int, float]] # слово -> Food.id -> вес лучшего поля
+    typos: Dict[str, Tuple[str, ...]] # слово без одной буквы -> слова индекса
+    restaurant_foods: Dict[int, FrozenSet[int]] # активный ресторан -> доступные блюда
+
+    def search(
+        self,
+        query: str,
+        limit: int,
+        restaurant_id: Optional[int] = None,
+    ) -> List[Tuple[float, SearchDocument]]:
+        """До limit блюд, в которых есть все слова запроса и нет слов после "без":
+        (релевантность, блюдо)"""
+        terms, excluded = parse_query(query)
+        if not terms:
+            return []
+
+        allowed = self.restaurant_foods.get(restaurant_id) if restaurant_id is not None else None
+
+        scores: Optional[Dict[int, float]] = None
+        for term in terms:
+            term_scores = self._match(term)
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {
+                    food_id: score + term_scores[food_id]
+                    for food_id, score in scores.items()
+                    if food_id in term_scores
+                }
+            if not scores:
+                return []
+
+        # Слово после "без" ищется так же, как обязательное: в названии, описании и составе
+        for term in excluded:
+            for food_id in self._match(term):
+                scores.pop(food_id, None)
+
+        ranked = [
+            (score, self.documents[food_id])
+            for food_id, score in scores.items()
+            if allowed is None or food_id in allowed
+        ]
+        ranked.sort(key=lambda item: (-item[0], item[1].name))
+        return ranked[:limit]
+
+    def _match(self, term: str) -> Dict[int, float]:
+        """Лучший вес слова запроса для каждого блюда"""
+        scores: Dict[int, float] = defaultdict(float)
+        self._match_prefix(term, 1.0, PREFIX_FACTOR, scores)
+        if scores or len(term) < FUZZY_MIN_LENGTH:
+            return scores
+
+        # Падежные окончания: отрезаем до трех букв, пока основа не короче FUZZY_MIN_LENGTH
+        for cut in range(1, 4):
+            stem = term[:-cut]
+            if len(stem) < FUZZY_MIN_LENGTH:
+                break
+            self._match_prefix(stem, STEM_FACTOR, STEM_FACTOR, scores)
+            if scores:
+                return scores
+
+        # Ни одно слово не начинается так - ищем слова с одной опечаткой
+        candidates = set(self.typos.get(term, ()))
+        for key in deletes(term):
+            candidates.update(self.typos.get(key, ()))
+            if key in self.postings:
+                candidates.add(key)
+
+        for word in candidates:
+            for food_id, weight in self.postings[word].items():
+                scores[food_id] = max(scores[food_id], weight * FUZZY_FACTOR)
+
+        return scores
+
+    def _match_prefix(self, term: str, exact_factor: float, prefix_factor: float, scores: Dict[int, float]) -> None:
+        start = bisect_left(self.words, term)
+        end = bisect_left(self.words, term + "\uffff")
+        for word in self.words[start:end]:
+            factor = exact_factor if word == term else prefix_factor
+            for food_id, weight in self.postings[word].items():
+                scores[food_id] = max(scores[food_id], weight * factor)
+
+
+class IMenuSearch(Protocol):
+    @abstractmethod
+    async def get_index(self) -> MenuSearchIndex:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def refresh(self) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def invalidate(self) -> None:
+        raise NotImplementedError
@@ -0,0 +1,34 @@
+from abc import abstractmethod
+from dataclasses import dataclass
+from typing import Optional, Protocol
+
+
+@dataclass(frozen=True)
+class MenuSnapshot:
+    version: int
+    body: bytes # готовый JSON ответа PositionsResponse
+
+
+class IMenuSnapshotCache(Protocol):
+    @property
+    @abstractmethod
+    def version(self) -> int:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get(self, restaurant_id: Optional[int], category_id: int) -> Optional[MenuSnapshot]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def put(
+        self,
+        restaurant_id: Optional[int],
+        category_id: int,
+        body: bytes,
+        version: int
+    ) -> MenuSnapshot:
+        raise NotImplementedError
+
+    @abstractmethod
+    def invalidate(self) -> None:
+        raise NotImplementedError
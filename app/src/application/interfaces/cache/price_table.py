@@ -0,0 +1,47 @@
+from abc import abstractmethod
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Optional, Protocol
+
+from src.domain.enums.enums import OrderAction
+
+
+@dataclass(frozen=True)
+class RestaurantOrderInfo:
+    address: str
+    phone: str # E.164
+    delivery_price: int
+    actions: FrozenSet[OrderAction] # доступные типы заказа
+
+
+@dataclass(frozen=True)
+class VariantPrices:
+    food_name: str
+    measure_name: Optional[str]
+    measure_value: str # первая характеристика варианта, '' если нет
+    price: int
+    # ингредиент блюда -> ceil(ingredient.price * ingredient_price_modifier)
+    adding_prices: Dict[int, int]
+    # ингредиенты по умолчанию, только их можно убрать
+    removable_ids: FrozenSet[int]
+
+
+@dataclass(frozen=True)
+class PriceSnapshot:
+    version: int
+    variants: Dict[int, VariantPrices] # FoodVariant.id -> цены
+    ingredient_names: Dict[int, str]
+    restaurants: Dict[int, RestaurantOrderInfo]
+
+
+class IPriceTable(Protocol):
+    @abstractmethod
+    async def get_snapshot(self) -> PriceSnapshot:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def refresh(self) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def invalidate(self) -> None:
+        raise NotImplementedError
@@ -0,0 +1,29 @@
+from abc import abstractmethod
+from dataclasses import dataclass
+from typing import Hashable, Optional, Protocol
+
+
+@dataclass(frozen=True)
+class RenderedResponse:
+    version: int
+    body: bytes # готовый JSON ответа
+    etag: str # хэш содержимого в формате заголовка ETag
+
+
+class IResponseCache(Protocol):
+    @property
+    @abstractmethod
+    def version(self) -> int:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get(self, key: Hashable) -> Optional[RenderedResponse]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def put(self, key: Hashable, body: bytes, version: int) -> RenderedResponse:
+        raise NotImplementedError
+
+    @abstractmethod
+    def invalidate(self) -> None:
+        raise NotImplementedError
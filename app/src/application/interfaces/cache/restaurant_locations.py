@@ -0,0 +1,129 @@
+from abc import abstractmethod
+from dataclasses import dataclass
+from math import asin, ceil, cos, floor, radians, sin, sqrt
+from typing import Dict, FrozenSet, Iterator, List, Optional, Protocol, Tuple
+
+from src.domain.enums.enums import OrderAction
+
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = 111.32
+# Сторона ячейки сетки: ~5.5 км по широте, ~3 км по долготе на широте Москвы
+GRID_CELL_DEGREES = 0.05
+# Поиск ближайших принимает точки не ближе к полюсам: там ячейка сужается по
+# долготе до метров и обход колец до радиуса растягивается на тысячи колец.
+# Городов с ресторанами севернее нет
+MAX_LATITUDE = 80.0
+
+
+def distance_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Расстояние по поверхности Земли (формула гаверсинусов)"""
+    d_lat = radians(lat2 - lat1)
+    d_lon = radians(lon2 - lon1)
+    a = sin(d_lat / 2) ** 2 + cos(radians(lat1)) * cos(radians(lat2)) * sin(d_lon / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * asin(sqrt(a))
+
+
+def grid_cell(latitude: float, longitude: float) -> Tuple[int, int]:
+    return floor(latitude / GRID_CELL_DEGREES), floor(longitude / GRID_CELL_DEGREES)
+
+
+@dataclass(frozen=True)
+class RestaurantLocation:
+    id: int
+    city_id: int
+    name: str
+    address: str
+    phone: str # E.164
+    latitude: float
+    longitude: float
+    delivery_price: int
+    actions: FrozenSet[OrderAction] # доступные типы заказа
+
+
+@dataclass(frozen=True)
+class LocationIndex:
+    """Активные рестораны с координатами, разложенные по ячейкам сетки.
+
+    Поиск обходит кольца ячеек вокруг точки и останавливается, как только
+    следующее кольцо заведомо дальше уже найденных ресторанов или радиуса.
+    """
+    version: int
+    cells: Dict[Tuple[int, int], Tuple[RestaurantLocation, ...]]
+    # Границы занятых ячеек: за ними обход колец не нужен
+    min_row: int = 0
+    max_row: int = -1
+    min_col: int = 0
+    max_col: int = -1
+
+    def nearest(
+        self,
+        latitude: float,
+        longitude: float,
+        limit: int,
+        radius_km: float,
+        action: Optional[OrderAction] = None,
+    ) -> List[Tuple[float, RestaurantLocation]]:
+        """До limit ближайших ресторанов в радиусе: (расстояние в км, ресторан)"""
+        found: List[Tuple[float, RestaurantLocation]] = []
+        if not self.cells:
+            return found
+
+        row, col = grid_cell(latitude, longitude)
+        # Рестораны в радиусе лежат не дальше от экватора, чем edge_latitude:
+        # уже, чем у этой границы, ячейка по долготе не бывает
+        edge_latitude = min(abs(latitude) + radius_km / KM_PER_DEGREE + GRID_CELL_DEGREES, 89.0)
+        cell_km = GRID_CELL_DEGREES * KM_PER_DEGREE * cos(radians(edge_latitude))
+        # Рестораны кольца ring + 1 отделены от точки минимум ring целыми ячейками,
+        # кольца дальше max_ring заведомо за радиусом
+        max_ring = ceil(radius_km / cell_km)
+        for ring in range(max_ring + 1):
+            for cell in _ring_cells(row, col, ring):
+                for location in self.cells.get(cell, ()):
+                    if action is not None and action not in location.actions:
+                        continue
+                    distance = distance_km(latitude, longitude, location.latitude, location.longitude)
+                    if distance <= radius_km:
+                        found.append((distance, location))
+
+            reached_km = ring * cell_km
+            if len(found) >= limit:
+                found.sort(key=lambda item: item[0])
+                if found[limit - 1][0] <= reached_km:
+                    break
+            if (
+                row - ring <= self.min_row and row + ring >= self.max_row
+                and col - ring <= self.min_col and col + ring >= self.max_col
+            ):
+                break
+
+        found.sort(key=lambda item: item[0])
+        return found[:limit]
+
+
+def _ring_cells(row: int, col: int, ring: int) -> Iterator[Tuple[int, int]]:
+    """Ячейки на расстоянии ring ячеек от (row, col) по Чебышеву"""
+    if ring == 0:
+        yield row, col
+        return
+
+    for c in range(col - ring, col + ring + 1):
+        yield row - ring, c
+        yield row + ring, c
+    for r in range(row - ring + 1, row + ring):
+        yield r, col - ring
+        yield r, col + ring
+
+
+class IRestaurantLocations(Protocol):
+    @abstractmethod
+    async def get_index(self) -> LocationIndex:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def refresh(self) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def invalidate(self) -> None:
+        raise NotImplementedError
@@ -0,0 +1,75 @@
+from abc import abstractmethod
+from bisect import bisect_right
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Optional, Protocol, Tuple
+
+
+DAY_MINUTES = 24 * 60
+WEEK_MINUTES = 7 * DAY_MINUTES
+
+
+@dataclass(frozen=True)
+class WeeklySchedule:
+    """Часы работы ресторана за неделю.
+
+    Интервалы [start, end) в минутах от понедельника 00:00,
+    отсортированы и не пересекаются: проверки - бинарный поиск.
+    """
+    starts: Tuple[int, ...]
+    ends: Tuple[int, ...]
+
+    def is_open(self, minute: int) -> bool:
+        index = bisect_right(self.starts, minute) - 1
+        return index >= 0 and minute < self.ends[index]
+
+    def next_opening(self, minute: int) -> Optional[int]:
+        """Минута недели ближайшего открытия после minute, None - закрыт всю неделю"""
+        if not self.starts:
+            return None
+
+        index = bisect_right(self.starts, minute)
+        # После последнего открытия недели - первое открытие следующей
+        return self.starts[index] if index < len(self.starts) else self.starts[0]
+
+
+@dataclass(frozen=True)
+class ScheduleSnapshot:
+    version: int
+    schedules: Dict[int, WeeklySchedule] # Restaurant.id -> неделя
+    # Все минуты недели, в которые хоть один ресторан открывается или закрывается
+    transitions: Tuple[int, ...]
+
+    def period(self, minute: int) -> int:
+        """Номер отрезка недели, внутри которого не меняется ни одно is_open"""
+        return bisect_right(self.transitions, minute)
+
+    def minutes_until_change(self, minute: int) -> Optional[int]:
+        """Минут до ближайшего открытия или закрытия любого ресторана, None - is_open не меняется"""
+        if not self.transitions:
+            return None
+
+        index = bisect_right(self.transitions, minute)
+        # После последнего перехода недели - первый переход следующей
+        if index < len(self.transitions):
+            return self.transitions[index] - minute
+        return self.transitions[0] + WEEK_MINUTES - minute
+
+
+class IRestaurantSchedules(Protocol):
+    @abstractmethod
+    async def get_snapshot(self) -> ScheduleSnapshot:
+        raise NotImplementedError
+
+    @abstractmethod
+    def minute_of_week(self, moment: Optional[datetime] = None) -> int:
+        """Минута недели по времени ресторанов, по умолчанию - сейчас"""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def refresh(self) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def invalidate(self) -> None:
+        raise NotImplementedError
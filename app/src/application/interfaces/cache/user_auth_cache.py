@@ -0,0 +1,34 @@
+from abc import abstractmethod
+from dataclasses import dataclass
+from typing import Optional, Protocol
+
+
+@dataclass(frozen=True)
+class AuthUser:
+    id: int
+    phone: str
+    is_banned: bool
+    is_removed: bool
+
+
+class IUserAuthCache(Protocol):
+    @property
+    @abstractmethod
+    def version(self) -> int:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get(self, user_id: int) -> Optional[AuthUser]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def put(self, user: AuthUser, version: int) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def invalidate(self, user_id: int) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def clear(self) -> None:
+        raise NotImplementedError
@@ -1,4 +1,5 @@
 from datetime import datetime, timezone
+from typing import Optional
 
 from fastapi import HTTPException, Request, Response
 from phonenumbers import PhoneNumber
@@ -10,6 +11,7 @@ from src.infrastructure.exceptions import UserNotFoundError
 from src.domain.dto.auth_dto import CityModel, CreateUser, CreateUserResponse, CurrentUserDTO, LogOutResponse, LoginUserRequest, LoginUserResponse, LogInDTO, RestaurantModel, TokenResponse, UpdateUserResponse, UserAddressModel
 from src.application.exceptions import DatabaseException, IdNotValidError, TokenError, UnhandledException
 from src.application.interfaces.transaction_manager import ITransactionManager
+from src.application.interfaces.cache.user_auth_cache import AuthUser, IUserAuthCache
 from src.application.interfaces.repositories import auth_repository, user_address_repository, restaurant_repository, city_repository
 from src.config import Config
 from src.logger import logger
@@ -257,9 +259,11 @@ class GetCurrentUserInteractor:
     def __init__(
         self,
         auth_repository: auth_repository.IAuthRepository,
+        user_auth_cache: IUserAuthCache,
         config: Config
     ):
         self._auth_repository = auth_repository
+        self._user_auth_cache = user_auth_cache
         self._config = config
 
     async def __call__(self, request: Request) -> CurrentUserDTO:
@@ -277,21 +281,47 @@ class GetCurrentUserInteractor:
                 algorithms=[token_config.algorithm]
             )
             phone: str = payload.get("sub")
+            user_id: int = payload.get("uid")
             if not phone:
                 raise TokenError("Невалидный токен. Не удалось получить номер телефона из токена")
 
         except JWTError:
             raise TokenError("Невалидный токен")
 
-        # Получаем пользователя из репозитория
-        user = await self._auth_repository.get_user_by_phone(phone)
+        # На горячем пути пользователь берется из кэша по id из токена, без запроса в БД
+        auth_user = self._user_auth_cache.get(user_id) if user_id else None
+        if not auth_user:
+            auth_user = await self._load_auth_user(user_id, phone)
+
+        if auth_user.is_removed:
+            raise TokenError("Пользователь неактивен")
+
+        return CurrentUserDTO(
+            id=auth_user.id,
+            phone=auth_user.phone,
+            is_banned=auth_user.is_banned
+        )
+
+    async def _load_auth_user(self, user_id: Optional[int], phone: str) -> AuthUser:
+        version = self._user_auth_cache.version
+
+        # Токены, выданные до появления uid, ищем по телефону
+        if user_id:
+            user = await self._auth_repository.get_user_by_id(user_id)
+        else:
+            user = await self._auth_repository.get_user_by_phone(phone)
+
         if not user:
             raise UserNotFoundError
 
-        return CurrentUserDTO(
+        auth_user = AuthUser(
             id=user.id,
-            phone=user.phone.e164
+            phone=user.phone.e164,
+            is_banned=user.is_banned,
+            is_removed=user.is_removed
         )
+        self._user_auth_cache.put(auth_user, version)
+        return auth_user
 
 
 def _is_secure(config: Config):
@@ -5,6 +5,7 @@ from src.infrastructure.drivers.db.tables import MenuCategory
 from src.domain.dto.food_variant_dto import FoodVariantResponse, PositionsResponse, PositionItem, SizeInfo, IngredientItem
 from src.application.exceptions import DatabaseException, IdNotValidError
 from src.application.interfaces.repositories import food_variant_repository, menu_category_repository, restaurant_repository
+from src.application.interfaces.cache.menu_snapshot_cache import IMenuSnapshotCache
 from src.config import Config
 
 
@@ -36,20 +37,42 @@ class GetMenuCategoryPositionsIngredientsInteractor:
         food_variant_repository: food_variant_repository.IFoodVariantRepository,
         menu_category_repository: menu_category_repository.IMunuCategoryRepository,
         restaurant_repository: restaurant_repository.IRestaurantRepository,
+        menu_snapshot_cache: IMenuSnapshotCache,
         config: Config
     ):
         self._food_variant_repository = food_variant_repository
         self._menu_category_repository = menu_category_repository
         self._restaurant_repository = restaurant_repository
+        self._menu_snapshot_cache = menu_snapshot_cache
         self._config = config
 
-    async def __call__(self, category_id: int, restaurant_id: Optional[int]) -> PositionsResponse:
+    async def __call__(self, category_id: int, restaurant_id: Optional[int]) -> bytes:
+        """Возвращает готовый JSON PositionsResponse, при возможности - из снимка меню"""
         if category_id < 1:
             raise IdNotValidError
 
+        if restaurant_id and restaurant_id < 1:
+            raise IdNotValidError
+
+        snapshot = self._menu_snapshot_cache.get(restaurant_id, category_id)
+        if snapshot:
+            return snapshot.body
+
+        # Версия фиксируется до чтения из БД: если меню изменится во время сборки,
+        # устаревший снимок не попадет в кэш
+        version = self._menu_snapshot_cache.version
+        response = await self._build_positions(category_id, restaurant_id)
+
+        snapshot = self._menu_snapshot_cache.put(
+            restaurant_id,
+            category_id,
+            response.model_dump_json().encode(),
+            version
+        )
+        return snapshot.body
+
+    async def _build_positions(self, category_id: int, restaurant_id: Optional[int]) -> PositionsResponse:
         if restaurant_id:
-            if restaurant_id < 1:
-                raise IdNotValidError
             restaurant = await self._restaurant_repository.check_restaurant_exists(restaurant_id)
             if not restaurant:
                 raise RestaurantNotFoundError(id=restaurant_id)
@@ -1,14 +1,34 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections import defaultdict
+from datetime import datetime
 from math import ceil
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import Row
 
 from src.domain.enums.enums import OrderAction
 from src.infrastructure.drivers.db.tables import Order
-from src.infrastructure.exceptions import UserNotFoundError
-from src.application.exceptions import IdNotValidError
+from src.infrastructure.exceptions import RestaurantNotFoundError, UserNotFoundError
+from src.application.exceptions import CursorNotValidError, IdNotValidError
 from src.domain.dto.auth_dto import CurrentUserDTO
-from src.domain.dto.order_dto import GetOrderResponse, IngredientModel, OrderItemModel, OrderModel, OrderRequest, CreateOrderResponse
+from src.domain.dto.order_dto import (
+    CreateOrderResponse,
+    GetOrderResponse,
+    IngredientModel,
+    OrderedPosition,
+    OrderItemModel,
+    OrderModel,
+    OrderQuoteRequest,
+    OrderQuoteResponse,
+    OrderRequest,
+    QuotedPosition,
+)
+from src.domain.dto.restaurant_dto import OpeningTime
+from src.application.interfaces.cache.price_table import IPriceTable, PriceSnapshot, RestaurantOrderInfo
+from src.application.interfaces.cache.restaurant_schedules import DAY_MINUTES, WEEK_MINUTES, IRestaurantSchedules, ScheduleSnapshot
 from src.application.interfaces.transaction_manager import ITransactionManager
-from src.application.interfaces.repositories import order_repository, user_address_repository, users_repository
-from src.application.interfaces.notification.http_notifier import IHTTPOrderNotifier
+from src.application.interfaces.repositories import order_outbox_repository, order_repository, user_address_repository
+from src.config import Config
 from src.logger import logger
 
 
@@ -19,36 +39,38 @@ class GetUserOrdersInteractor:
     ):
         self._order_repository = order_repository
 
-    async def __call__(self, user_id: int) -> GetOrderResponse:
+    async def __call__(self, user_id: int, limit: int, after: Optional[str] = None) -> GetOrderResponse:
         if user_id < 1:
             raise IdNotValidError
 
-        orders = await self._order_repository.get_user_orders(user_id)
-        orders_list = []
+        # Запрашиваем на один заказ больше, чтобы узнать, есть ли следующая страница
+        orders = await self._order_repository.get_user_orders(user_id, limit + 1, _decode_cursor(after))
+        has_next = len(orders) > limit
+        orders = orders[:limit]
+
+        item_ids = [item.id for order in orders for item in order.items]
+        added_by_item: Dict[int, List[Row]] = defaultdict(list)
+        removed_by_item: Dict[int, List[IngredientModel]] = defaultdict(list)
+
+        # Количество одинаковых добавок уже посчитано в SQL
+        for row in await self._order_repository.get_added_ingredients(item_ids):
+            added_by_item[row.order_item_id].append(row)
+
+        for row in await self._order_repository.get_removed_ingredients(item_ids):
+            removed_by_item[row.order_item_id].append(IngredientModel(name=row.name))
 
+        orders_list = []
         for order in orders:
             order_items = []
-            status = order.status
-            delivery_address = order.address.get_full_address() if order.address else None
-            order_date = order.created_at.strftime("%d.%m.%Y")
-            total_price = order.total_price
-            restaurant_phone = order.restaurant.phone.e164
 
             for item in order.items:
-                add_ingredients_dict = {}
-                add_list = []
-                remove_list = []
-
                 food_variant = item.food_variant
                 food = food_variant.food
-
                 price_modifier = food_variant.ingredient_price_modifier
 
                 measure_value = ''
                 if food_variant.characteristics:
-                    measure_value = food_variant.characteristics[0].measure_value
-                    if not measure_value:
-                        measure_value = ''
+                    measure_value = food_variant.characteristics[0].measure_value or ''
 
                 item_name = ' '.join(
                     [
@@ -58,41 +80,20 @@ class GetUserOrdersInteractor:
                     ]
                 )
 
-                for add_ingredient in item.added_ingredients:
-                    if add_ingredient.id in add_ingredients_dict:
-                        add_ingredients_dict[add_ingredient.id]['quantity'] += 1
-                    else:
-                        add_ingredients_dict[add_ingredient.id] = {
-                            'name': add_ingredient.name,
-                            'price': add_ingredient.price,
-                            'ingredient_obj' : add_ingredient,
-                            'quantity': 1
-                        }
-
-                for _, add_ingredient in add_ingredients_dict.items():
-                    price = add_ingredient['price']
-                    add_list.append(
-                        IngredientModel(
-                            name=add_ingredient['name'],
-                            price=ceil(price * price_modifier),
-                            quantity=add_ingredient['quantity'],
-                        )
-                    )
-
-                for remove in item.removed_ingredients:
-                    remove_list.append(
-                        IngredientModel(
-                            name=remove.name
-                        )
-                    )
-
                 order_items.append(
                     OrderItemModel(
                         name=item_name,
                         quantity=item.quantity,
                         price=food_variant.price,
-                        add=add_list,
-                        remove=remove_list
+                        add=[
+                            IngredientModel(
+                                name=added.name,
+                                price=ceil(added.price * price_modifier),
+                                quantity=added.quantity,
+                            )
+                            for added in added_by_item[item.id]
+                        ],
+                        remove=removed_by_item[item.id]
                     )
                 )
 
@@ -100,40 +101,43 @@ class GetUserOrdersInteractor:
                 OrderModel(
                     id=order.id,
                     order_items=order_items,
-                    status=status,
-                    delivery_address=delivery_address,
+                    status=order.status,
+                    delivery_address=order.address.get_full_address() if order.address else None,
                     positions_quantity=len(order_items),
-                    order_date=order_date,
-                    total_price=total_price,
-                    restaurant_phone=restaurant_phone,
+                    order_date=order.created_at.strftime("%d.%m.%Y"),
+                    total_price=order.total_price,
+                    restaurant_phone=order.restaurant.phone.e164,
                 )
             )
 
-        return GetOrderResponse(orders=orders_list)
+        return GetOrderResponse(
+            orders=orders_list,
+            next_cursor=_encode_cursor(orders[-1]) if has_next else None
+        )
 
 
 class AddOrderInteractor:
     def __init__(
         self,
         order_repository: order_repository.IOrderRepository,
-        user_repository: users_repository.IUsersRepository,
         user_address_repository: user_address_repository.IUserAddressRepository,
         transaction_manager: ITransactionManager,
-        notifier: IHTTPOrderNotifier
+        order_outbox_repository: order_outbox_repository.IOrderOutboxRepository,
+        price_table: IPriceTable,
+        schedules: IRestaurantSchedules,
+        config: Config,
     ):
         self._order_repository = order_repository
-        self._user_repository = user_repository
         self._user_address_repository = user_address_repository
         self._transaction_manager = transaction_manager
-        self._notifier = notifier
+        self._order_outbox_repository = order_outbox_repository
+        self._price_table = price_table
+        self._schedules = schedules
+        self._config = config
 
     async def __call__(self, order_request: OrderRequest, user_dto: CurrentUserDTO) -> CreateOrderResponse:
-        user = await self._user_repository.get_user_by_phone(user_dto.phone)
-        
-        if not user:
-            raise UserNotFoundError
-
-        if user.is_banned:
+        # Флаг бана приходит из кэша авторизации, отдельный запрос пользователя не нужен
+        if user_dto.is_banned:
             raise ValueError('Неизвестная ошибка при создании заказа. Попробуйте позже.')
 
         action = order_request.selected_restaurant.action
@@ -141,20 +145,37 @@ class AddOrderInteractor:
             if not order_request.user_info:
                 raise ValueError('Для доставки необходимо указать адрес пользователя.')
 
-        order_data = await self._order_repository.create_order(order_request, user_dto.id)
-        await self._transaction_manager.commit()
+        # 1. Проверка по таблице цен в памяти: неверный заказ не берет соединение из пула
+        snapshot = await self._price_table.get_snapshot()
+        restaurant = _validate_restaurant(snapshot, order_request)
+        total_price = _validate_positions(snapshot, order_request)
+        if self._config.app.reject_orders_outside_hours:
+            _validate_working_hours(
+                await self._schedules.get_snapshot(),
+                order_request,
+                self._schedules.minute_of_week(),
+            )
+
+        # 2. Запись: адрес пользователя и INSERT заказа, позиций и уведомления
+        delivery_address = None
+        if order_request.user_info:
+            address = await self._user_address_repository.get_user_address_by_id(
+                user_dto.id,
+                order_request.user_info.address_id,
+            )
+            delivery_address = address.get_full_address()
+
+        order = await self._order_repository.create_order(order_request, user_dto.id)
 
-        order: Order = order_data['order_obj']
-        delivery_price: int = order_data['delivery_price']
         unique_code = order.unique_code
         cook_start = order_request.cook_start
         comment = order_request.comment
-        count = 1
+        delivery_price = restaurant.delivery_price
         msg = ''
 
         if action == OrderAction.DELIVERY:
             order_type = f'Тип заказа: Доставка\n'
-            order_type += f'{order_data['delivery_address']}\n'
+            order_type += f'{delivery_address}\n'
         elif action == OrderAction.TAKEAWAY:
             order_type = f'Тип заказа: Самовывоз\n'
         elif action == OrderAction.INSIDE:
@@ -173,44 +194,48 @@ class AddOrderInteractor:
         msg += f'\nКомментарий к заказу: {comment}' if comment else ''
         msg += '\n\n'
 
-        for name, items_variations in order_data['order'].items():
-            for item in items_variations:
-                position_name = ' '.join(
-                    [
-                        x for x in
-                        [name, item['measure_value'], item['measure_name']]
-                        if x
-                    ]
+        for count, position in enumerate(order_request.order_list, start=1):
+            variant = snapshot.variants[position.size]
+            position_name = ' '.join(
+                [
+                    x for x in
+                    [variant.food_name, variant.measure_value, variant.measure_name]
+                    if x
+                ]
+            )
+            msg += f'{count}. {position_name} - {variant.price} р. - {position.quantity} шт\n'
+            if position.addings:
+                msg += 'Добавить:\n'
+                msg += '\n'.join(
+                    f'\t- {snapshot.ingredient_names[adding_id]} - {variant.adding_prices[adding_id]} р. - {addings_amount} шт'
+                    for adding_id, addings_amount in position.addings.items()
                 )
-                msg += f'{count}. {position_name} - {item['price']} р. - {item['quantity']} шт\n'
-                ingredients = item['ingredients']
-                if ingredients['add']:
-                    msg += 'Добавить:\n'
-                    msg += '\n'.join(
-                        f'\t- {add_ingredient} - {ingredients['add'][add_ingredient]['price']} р. - {ingredients['add'][add_ingredient]['quantity']} шт'
-                        for add_ingredient in ingredients['add']
-                    )
-                if ingredients['remove']:
-                    msg += '\nУбрать:\n'
-                    msg += '\n'.join(
-                        f'\t- {remove_ingredient}'
-                        for remove_ingredient in ingredients['remove']
-                    )
-                msg += '\n\n' if (item['ingredients'] or ingredients['remove']) else ''
-                count += 1
-        
+            if position.removed_ingredients:
+                msg += '\nУбрать:\n'
+                msg += '\n'.join(
+                    f'\t- {snapshot.ingredient_names[removed_id]}'
+                    for removed_id in position.removed_ingredients
+                )
+            msg += '\n\n'
+
         if delivery_price > 0 and action == OrderAction.DELIVERY:
             msg += f'Цена доставки: {delivery_price} р.\n\n'
 
-        msg += 'Общая сумма: ' + str(order_data['total_price'] + delivery_price) + ' р.'
+        msg += 'Общая сумма: ' + str(total_price + delivery_price) + ' р.'
 
-        await self._notifier.send_order_info_to_bot(
-            order.restaurant_id,
+        # Уведомление пишется в той же транзакции, что и заказ, и отправляется
+        # в бота фоновым диспетчером: клиент не ждет бота, а сбой бота не теряет заказ
+        await self._order_outbox_repository.add_order_notification(
             order.id,
-            msg,
-            order.status.value,
-            order.order_action
+            {
+                "restaurant_id": order.restaurant_id,
+                "order_id": order.id,
+                "message_text": msg,
+                "current_status": order.status.value,
+                "action": order.order_action.value,
+            },
         )
+        await self._transaction_manager.commit()
 
         return CreateOrderResponse(
             id=order.id,
@@ -222,3 +247,164 @@ class AddOrderInteractor:
             status=order.status,
             unique_code=unique_code
         )
+
+
+class QuoteOrderInteractor:
+    def __init__(
+        self,
+        price_table: IPriceTable,
+    ):
+        self._price_table = price_table
+
+    async def __call__(self, quote_request: OrderQuoteRequest) -> OrderQuoteResponse:
+        # Цены берутся из таблицы в памяти: запрос в БД только при ее перестройке
+        snapshot = await self._price_table.get_snapshot()
+
+        positions = []
+        total_price = 0
+        total_quantity = 0
+        is_valid = True
+
+        for position in quote_request.order_list:
+            price, errors = _quote_position(snapshot, position)
+            quoted = QuotedPosition(
+                size=position.size,
+                quantity=position.quantity,
+                requested_price=position.price,
+                price=price,
+                total_price=price * position.quantity if price is not None else 0,
+                errors=errors,
+            )
+            positions.append(quoted)
+
+            total_price += quoted.total_price
+            total_quantity += position.quantity
+            if errors or price != position.price:
+                is_valid = False
+
+        return OrderQuoteResponse(
+            positions=positions,
+            order_quantity=total_quantity,
+            total_price=total_price,
+            is_valid=is_valid,
+        )
+
+
+def _quote_position(snapshot: PriceSnapshot, position: OrderedPosition) -> Tuple[Optional[int], List[str]]:
+    """Цена за 1 штуку по таблице цен и причины, по которым позицию нельзя заказать"""
+    variant = snapshot.variants.get(position.size)
+    if variant is None:
+        return None, [f"Вариант блюда с id {position.size} не найден"]
+
+    errors = []
+    if variant.food_name != position.name:
+        errors.append(
+            f"Вариант блюда с id {position.size} имеет разные названия: "
+            f"{variant.food_name} != {position.name}"
+        )
+
+    price = variant.price
+    if position.addings:
+        for adding_id, addings_amount in position.addings.items():
+            adding_price = variant.adding_prices.get(adding_id)
+            if adding_price is None:
+                errors.append(f"Ингредиент {adding_id} не доступен для варианта {position.size}")
+                continue
+            price += adding_price * addings_amount
+
+    for removed_id in position.removed_ingredients or []:
+        if removed_id not in variant.adding_prices:
+            errors.append(f"Ингредиент {removed_id} не доступен для варианта {position.size}")
+        elif removed_id not in variant.removable_ids:
+            errors.append(f"Ингредиент {removed_id} нельзя убрать для варианта {position.size}")
+
+    if errors:
+        return None, errors
+
+    return price, errors
+
+
+def _validate_working_hours(snapshot: ScheduleSnapshot, order_request: OrderRequest, now: int) -> None:
+    cook_start = order_request.cook_start
+    if cook_start == 'asap':
+        minute = now
+    else:
+        # Время начала готовки - ближайшее такое время по времени ресторанов:
+        # сегодня, а если оно уже прошло - завтра
+        hours, minutes = cook_start.split(':')
+        minute = now - now % DAY_MINUTES + int(hours) * 60 + int(minutes)
+        if minute < now:
+            minute = (minute + DAY_MINUTES) % WEEK_MINUTES
+
+    # Часы работы ресторана не заполнены - проверять не по чему
+    schedule = snapshot.schedules.get(order_request.selected_restaurant.id)
+    if schedule is None or schedule.is_open(minute):
+        return
+
+    msg = 'Ресторан не принимает заказы в это время'
+    next_opening = schedule.next_opening(minute)
+    if next_opening is not None:
+        opening = OpeningTime.from_minute_of_week(next_opening)
+        msg += f'. Ближайшее открытие: {opening.day.value} {opening.time}'
+    raise ValueError(msg)
+
+
+def _validate_restaurant(snapshot: PriceSnapshot, order_request: OrderRequest) -> RestaurantOrderInfo:
+    selected_restaurant = order_request.selected_restaurant
+    restaurant = snapshot.restaurants.get(selected_restaurant.id)
+
+    if not restaurant:
+        raise RestaurantNotFoundError(selected_restaurant.id)
+
+    if selected_restaurant.action not in restaurant.actions:
+        raise ValueError(f"Действие {selected_restaurant.action.value} не доступно для этого ресторана")
+
+    if restaurant.address != selected_restaurant.address:
+        raise ValueError(f"Адрес {selected_restaurant.address} не совпадает с адресом ресторана")
+
+    if restaurant.phone != selected_restaurant.phone:
+        raise ValueError(f"Телефон {selected_restaurant.phone} не совпадает с телефоном ресторана")
+
+    return restaurant
+
+
+def _validate_positions(snapshot: PriceSnapshot, order_request: OrderRequest) -> int:
+    """Проверяет позиции и цены по таблице цен, возвращает сумму заказа без доставки"""
+    if not order_request.order_list:
+        raise ValueError("В заказе нет вариантов блюд")
+
+    total_price = 0
+    total_quantity = 0
+
+    for position in order_request.order_list:
+        price, errors = _quote_position(snapshot, position)
+        if errors:
+            raise ValueError(', '.join(errors))
+
+        if position.price != price:
+            raise ValueError(f"Цена в запросе {position.price} не совпадает с ценой блюда и ингредиентов из меню: {price}")
+
+        total_price += price * position.quantity
+        total_quantity += position.quantity
+
+    if order_request.order_quantity != total_quantity:
+        raise ValueError(f'Общее количество позиций в заказе не совпадает с количеством в заказе. Общее количество: {total_quantity}')
+
+    return total_price
+
+
+def _encode_cursor(order: Order) -> str:
+    """Курсор страницы заказов: (created_at, id) последнего заказа"""
+    raw = f"{order.created_at.isoformat()}|{order.id}"
+    return urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(cursor: Optional[str]) -> Optional[Tuple[datetime, int]]:
+    if not cursor:
+        return None
+
+    try:
+        created_at, order_id = urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), int(order_id)
+    except ValueError:
+        raise CursorNotValidError
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from sqlalchemy.exc import SQLAlchemyError
 
 from src.application.exceptions import DatabaseException, IdNotValidError
@@ -5,13 +7,20 @@ from src.domain.dto.restaurant_dto import (
     AddRestaurantRequest,
     DeleteRestaurantResponse,
     GetCityRestaurantsResponse,
+    GetNearestRestaurantsResponse,
     GetRestaurantResponse,
+    NearestRestaurantItem,
+    OpeningTime,
+    RestaurantActionEnum,
     UpdateRestaurantRequest,
     WorkingHoursModel,
 )
+from src.application.interfaces.cache.restaurant_locations import IRestaurantLocations
+from src.application.interfaces.cache.restaurant_schedules import IRestaurantSchedules
 from src.application.interfaces.transaction_manager import ITransactionManager
 from src.application.interfaces.repositories import restaurant_repository
 from src.application.interfaces.repositories import city_repository
+from src.domain.enums.enums import OrderAction
 from src.logger import logger
 
 
@@ -43,20 +52,86 @@ class GetCityRestaurantsInteractor:
     def __init__(
         self,
         city_repository: city_repository.ICityRepository,
-        restaurant_repository: restaurant_repository.IRestaurantRepository
+        restaurant_repository: restaurant_repository.IRestaurantRepository,
+        schedules: IRestaurantSchedules,
     ):
         self._city_repository = city_repository
         self._restaurant_repository = restaurant_repository
+        self._schedules = schedules
 
-    async def __call__(self, city_id: int) -> GetCityRestaurantsResponse:
+    async def __call__(self, city_id: int, minute: Optional[int] = None) -> GetCityRestaurantsResponse:
         if city_id < 1:
             raise IdNotValidError
 
         city = await self._city_repository.get_city_by_id(city_id)
         restaurants_response: GetCityRestaurantsResponse = await self._restaurant_repository.get_city_restaurants(city)
+
+        # Открыт ли ресторан - по скомпилированной неделе, без разбора WorkingHours
+        snapshot = await self._schedules.get_snapshot()
+        if minute is None:
+            minute = self._schedules.minute_of_week()
+
+        for restaurant in restaurants_response.data.restaurants:
+            schedule = snapshot.schedules.get(restaurant.id)
+            if schedule is None:
+                continue
+
+            restaurant.is_open = schedule.is_open(minute)
+            if not restaurant.is_open:
+                next_opening = schedule.next_opening(minute)
+                if next_opening is not None:
+                    restaurant.next_opening = OpeningTime.from_minute_of_week(next_opening)
+
         return restaurants_response
 
 
+class GetNearestRestaurantsInteractor:
+    def __init__(
+        self,
+        locations: IRestaurantLocations,
+    ):
+        self._locations = locations
+
+    async def __call__(
+        self,
+        latitude: float,
+        longitude: float,
+        action: Optional[RestaurantActionEnum],
+        limit: int,
+        radius_km: float,
+    ) -> GetNearestRestaurantsResponse:
+        # Поиск по сетке координат в памяти, без запросов в БД
+        index = await self._locations.get_index()
+        nearest = index.nearest(
+            latitude,
+            longitude,
+            limit,
+            radius_km,
+            OrderAction(action.value) if action else None,
+        )
+
+        return GetNearestRestaurantsResponse(
+            restaurants=[
+                NearestRestaurantItem(
+                    id=location.id,
+                    city_id=location.city_id,
+                    name=location.name,
+                    address=location.address,
+                    phone=location.phone,
+                    coords=[location.latitude, location.longitude],
+                    actions=[
+                        RestaurantActionEnum(item.value)
+                        for item in (OrderAction.DELIVERY, OrderAction.TAKEAWAY, OrderAction.INSIDE)
+                        if item in location.actions
+                    ],
+                    delivery_price=location.delivery_price,
+                    distance_km=round(distance, 2),
+                )
+                for distance, location in nearest
+            ]
+        )
+
+
 class UpdateRestaurantInteractor:
     def __init__(
         self,
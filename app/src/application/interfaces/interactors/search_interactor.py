@@ -0,0 +1,47 @@
+from typing import Optional
+
+from src.infrastructure.exceptions import RestaurantNotFoundError
+from src.application.exceptions import IdNotValidError
+from src.application.interfaces.cache.menu_search import IMenuSearch
+from src.domain.dto.search_dto import SearchItem, SearchResponse
+from src.config import Config
+
+
+class SearchMenuInteractor:
+    def __init__(
+        self,
+        menu_search: IMenuSearch,
+        config: Config,
+    ):
+        self._menu_search = menu_search
+        self._config = config
+
+    async def __call__(self, query: str, restaurant_id: Optional[int], limit: int) -> SearchResponse:
+        if restaurant_id is not None and restaurant_id < 1:
+            raise IdNotValidError
+
+        # Поиск по индексу в памяти, без запросов в БД
+        index = await self._menu_search.get_index()
+        if restaurant_id is not None and restaurant_id not in index.restaurant_foods:
+            raise RestaurantNotFoundError(id=restaurant_id)
+
+        return SearchResponse(
+            positions=[
+                SearchItem(
+                    id=document.food_id,
+                    category_id=document.category_id,
+                    name=document.name,
+                    image_url=self._build_image_url(document.image_url),
+                    description=document.description,
+                    price_from=document.price_from,
+                )
+                for _, document in index.search(query, limit, restaurant_id)
+            ]
+        )
+
+    def _build_image_url(self, image_filename: Optional[str]) -> str:
+        if not image_filename:
+            return ""
+
+        base_url = self._config.app.resolved_static_files_base_url.rstrip('/')
+        return f"{base_url}/images/food/{image_filename}"
@@ -0,0 +1,27 @@
+from abc import abstractmethod
+from typing import Protocol
+
+
+class IPasswordHasher(Protocol):
+    @property
+    @abstractmethod
+    def queue_depth(self) -> int:
+        """Количество операций, ожидающих свободного потока"""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def hash(self, password: str) -> str:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def verify(self, hashed_password: str, password: str) -> bool:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def verify_dummy(self, password: str) -> None:
+        """Проверка, которая всегда неуспешна, но занимает столько же, сколько verify"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def needs_rehash(self, hashed_password: str) -> bool:
+        raise NotImplementedError
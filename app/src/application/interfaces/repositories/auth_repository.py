@@ -11,6 +11,10 @@ class IAuthRepository(Protocol):
     async def get_user_by_phone(self, phone: str) -> Optional[User]:
         raise NotImplementedError
 
+    @abstractmethod
+    async def get_user_by_id(self, user_id: int) -> Optional[User]:
+        raise NotImplementedError
+
     @abstractmethod
     async def register_user(self, created_user: CreateUser, config: Config, removed_user: Optional[User] = None) -> User:
         raise NotImplementedError
@@ -1,5 +1,5 @@
 from abc import abstractmethod
-from typing import List, Optional, Protocol
+from typing import Dict, List, Optional, Protocol
 
 from src.infrastructure.drivers.db.tables import TelegramChat
 
@@ -8,3 +8,7 @@ class IChatRepository(Protocol):
     @abstractmethod
     async def get_chat(self, chat_id: int) -> Optional[TelegramChat]:
         raise NotImplementedError
+
+    @abstractmethod
+    async def get_restaurant_chat_ids(self) -> Dict[int, List[str]]:
+        raise NotImplementedError
@@ -0,0 +1,22 @@
+from abc import abstractmethod
+from typing import List, Protocol
+
+from src.infrastructure.drivers.db.tables import OrderOutbox
+
+
+class IOrderOutboxRepository(Protocol):
+    @abstractmethod
+    async def add_order_notification(self, order_id: int, payload: dict) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def claim_due(self, limit: int, lease_seconds: float) -> List[OrderOutbox]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def delete(self, entry_ids: List[int]) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def reschedule(self, entry_id: int, error: str, delay_seconds: float) -> None:
+        raise NotImplementedError
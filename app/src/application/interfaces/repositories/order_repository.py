@@ -1,5 +1,8 @@
 from abc import abstractmethod
-from typing import List, Protocol
+from datetime import datetime
+from typing import List, Optional, Protocol, Tuple
+
+from sqlalchemy import Row
 
 from src.domain.enums.enums import OrderStatus
 from src.domain.dto.order_dto import OrderRequest, CreateOrderResponse
@@ -8,7 +11,20 @@ from src.infrastructure.drivers.db.tables import Order
 
 class IOrderRepository(Protocol):
     @abstractmethod
-    async def get_user_orders(self, user_id: int) -> List[Order]:
+    async def get_user_orders(
+        self,
+        user_id: int,
+        limit: int,
+        after: Optional[Tuple[datetime, int]] = None
+    ) -> List[Order]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_added_ingredients(self, order_item_ids: List[int]) -> List[Row]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_removed_ingredients(self, order_item_ids: List[int]) -> List[Row]:
         raise NotImplementedError
 
     @abstractmethod
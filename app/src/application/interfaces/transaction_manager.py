@@ -1,10 +1,19 @@
 from abc import abstractmethod
 from contextlib import asynccontextmanager
+from enum import Enum
 from typing import Protocol
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
 
+class TransactionPolicy(str, Enum):
+    NONE = "none" # без сессии и транзакции (статика, служебные роуты)
+    LAZY = "lazy" # соединение берется из пула только при первом запросе к БД
+    READ_ONLY = "read_only" # READ ONLY транзакция
+    REPEATABLE_READ = "repeatable_read"
+    SERIALIZABLE = "serializable"
+
+
 class ITransactionManager(Protocol):
     @abstractmethod
     def __init__(self, session: AsyncSession) -> None:
@@ -12,7 +21,7 @@ class ITransactionManager(Protocol):
 
     @asynccontextmanager
     @abstractmethod
-    async def transaction(self, isolation_level: str = None):
+    async def transaction(self, policy: TransactionPolicy = TransactionPolicy.LAZY):
         raise NotImplementedError
 
     @abstractmethod
@@ -2,7 +2,7 @@ import logging
 import os
 from typing import Any, List, Optional, Union
 
-from pydantic import AnyHttpUrl, BaseModel, Field, field_validator, SecretStr
+from pydantic import AnyHttpUrl, BaseModel, Field, field_validator, model_validator, SecretStr
 from pydantic_settings import BaseSettings as _BaseSettings
 from pydantic_settings import SettingsConfigDict
 from sqlalchemy import URL
@@ -24,6 +24,11 @@ class AppConfig(BaseSettings):
     log_level: str = Field(default=os.environ["LOG_LEVEL"])
     domain: Optional[str] = Field(os.environ.get("DOMAIN"))
     static_files_base_url: str = Field(default="")
+    log_format: str = "json" # json | text
+    # Доля запросов, для которых пишутся INFO/DEBUG логи сессий и транзакций
+    log_request_sample_rate: float = 0.1
+    timezone: str = "Europe/Moscow" # часы работы ресторанов и cook_start заказа
+    reject_orders_outside_hours: bool = False # включать, когда часы работы в БД заполнены
 
     @field_validator("log_level")
     @classmethod
@@ -56,6 +61,37 @@ class BotConfig(BaseSettings):
     environment: str = Field(default=os.environ["ENVIRONMENT"])
     bot_host: str = Field(default=os.environ["BOT_HOST"])
     bot_port: int = Field(default=int(os.environ["BOT_PORT"]))
+    # HTTP-клиент бэкенда к сервису бота
+    bot_http_connection_limit: int = 20
+    bot_http_keepalive_seconds: float = 60
+    bot_http_connect_timeout_seconds: float = 2
+    bot_http_timeout_seconds: float = 5
+    # Рассылка в чаты ресторанов (лимиты Telegram: ~30 сообщений/с на бота, 20/мин на группу)
+    telegram_send_concurrency: int = 8
+    telegram_global_rate_per_second: float = 30
+    telegram_chat_rate_per_minute: float = 20
+    telegram_chat_burst: int = 3
+    telegram_max_retries: int = 3
+    # Прием обновлений через webhook вместо long polling
+    bot_webhook_enabled: bool = False
+    bot_webhook_url: Optional[str] = None
+    bot_webhook_secret: Optional[SecretStr] = None
+    bot_update_queue_size: int = 256
+    bot_update_concurrency: int = 8
+    # Для локального фейкового сервера Telegram
+    bot_api_base_url: str = "https://api.telegram.org/bot"
+
+    @model_validator(mode="after")
+    def validate_webhook(self) -> "BotConfig":
+        if not self.bot_webhook_enabled:
+            return self
+
+        if not self.bot_webhook_secret:
+            raise ValueError("BOT_WEBHOOK_SECRET is required when webhook is enabled")
+        # Telegram принимает только публичные HTTPS адреса, внутренний адрес бота не подходит
+        if not self.bot_webhook_url or not self.bot_webhook_url.startswith("https://"):
+            raise ValueError("BOT_WEBHOOK_URL must be a public https:// URL when webhook is enabled")
+        return self
 
     @property
     def get_bot_app_url(self) -> str:
@@ -105,6 +141,10 @@ class PostgresConfig(BaseSettings, env_prefix="POSTGRES_"):
     password: SecretStr
     db: str
     debug: bool
+    # Размер пула на один воркер: всего соединений до (pool_size + max_overflow) * workers
+    pool_size: int = 10
+    max_overflow: int = 10
+    pool_timeout: float = 30
 
     def build_dsn(self) -> str:
         return URL.create(
@@ -116,6 +156,17 @@ class PostgresConfig(BaseSettings, env_prefix="POSTGRES_"):
             database=self.db,
         ).render_as_string(hide_password=False)
 
+    def build_conninfo(self) -> str:
+        """Строка подключения для psycopg напрямую, без SQLAlchemy"""
+        return URL.create(
+            drivername="postgresql",
+            username=self.user,
+            password=self.password.get_secret_value(),
+            host=self.host,
+            port=self.port,
+            database=self.db,
+        ).render_as_string(hide_password=False)
+
 
 class TokenConfig(BaseSettings):
     access_token_cookie_key: str
@@ -130,6 +181,31 @@ class ArgonConfig(BaseSettings):
     argon2_time_cost: int
     argon2_memory_cost: int
     argon2_parallelism: int
+    argon2_max_workers: int = 2 # одновременных хэширований, каждое занимает argon2_memory_cost
+    argon2_max_queue: int = 32 # ожидающих операций, сверх - 503
+
+
+class CacheConfig(BaseSettings):
+    menu_cache_ttl_seconds: int = 300
+    menu_cache_max_entries: int = 256
+    catalog_cache_ttl_seconds: int = 300
+    catalog_cache_max_entries: int = 512
+    catalog_cache_max_age_seconds: int = 60 # Cache-Control для клиентов и nginx
+    user_cache_ttl_seconds: int = 60
+    user_cache_max_entries: int = 10000
+    telegram_routing_ttl_seconds: int = 300 # если NOTIFY об изменении чатов потерялся
+    price_table_ttl_seconds: int = 300 # если NOTIFY об изменении цен потерялся
+    restaurant_schedule_ttl_seconds: int = 300 # если NOTIFY об изменении часов работы потерялся
+    restaurant_locations_ttl_seconds: int = 300 # если NOTIFY об изменении ресторанов потерялся
+    menu_search_ttl_seconds: int = 300 # если NOTIFY об изменении меню потерялся
+
+
+class OutboxConfig(BaseSettings):
+    outbox_batch_size: int = 20 # уведомлений за одну выборку FOR UPDATE SKIP LOCKED
+    outbox_lease_seconds: float = 60 # дольше отправки пачки (BOT_HTTP_TIMEOUT_SECONDS)
+    outbox_poll_interval_seconds: float = 5 # если NOTIFY о новом заказе потерялся
+    outbox_retry_base_seconds: float = 2
+    outbox_retry_max_seconds: float = 300
 
 
 class Config(BaseModel):
@@ -139,6 +215,8 @@ class Config(BaseModel):
     token: TokenConfig
     argon2: ArgonConfig
     postgres: PostgresConfig
+    cache: CacheConfig
+    outbox: OutboxConfig
 
 
 def create_config() -> Config:
@@ -149,4 +227,32 @@ def create_config() -> Config:
         token=TokenConfig(),
         argon2=ArgonConfig(),
         postgres=PostgresConfig(),
+        cache=CacheConfig(),
+        outbox=OutboxConfig(),
     )
+
+
+_config: Optional[Config] = None
+
+
+def get_config() -> Config:
+    """Конфигурация процесса: окружение и .env читаются один раз"""
+    global _config
+    if _config is None:
+        _config = create_config()
+    return _config
+
+
+def reload_config() -> Config:
+    """Перечитывает .env и окружение, обновляя общий объект на месте.
+
+    Новые значения видят те, кто читает конфиг при каждом обращении.
+    Параметры, использованные при создании компонентов (пулы, кэши,
+    лимиты), меняются только после перезапуска процесса.
+    """
+    load_dotenv(override=True)
+    config = get_config()
+    fresh = create_config()
+    for name in Config.model_fields:
+        setattr(config, name, getattr(fresh, name))
+    return config
@@ -116,3 +116,4 @@ class LogOutResponse(BaseModel):
 class CurrentUserDTO(BaseModel):
     id: int
     phone: str
+    is_banned: bool = False
@@ -55,7 +55,7 @@ class BaseFoodResponse(BaseModel):
     category_id: int
     name: str
     image_url: str
-    description: str
+    description: Optional[str]
     measure_name: str
 
 
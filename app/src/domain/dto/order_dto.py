@@ -36,6 +36,7 @@ class OrderModel(BaseModel):
 
 class GetOrderResponse(BaseModel):
     orders: List[OrderModel]
+    next_cursor: Optional[str] = None # передается в after для следующей страницы
 
 
 class OrderedPosition(BaseModel):
@@ -154,6 +155,26 @@ class OrderRequest(BaseModel):
         return v
 
 
+class OrderQuoteRequest(BaseModel):
+    order_list: List[OrderedPosition] = Field(..., max_length=99)
+
+
+class QuotedPosition(BaseModel):
+    size: int # FoodVariant id
+    quantity: int
+    requested_price: int # цена за 1 штуку из запроса
+    price: Optional[int] = None # актуальная цена за 1 штуку, None - позицию нельзя заказать
+    total_price: int = 0 # price * quantity
+    errors: List[str] = []
+
+
+class OrderQuoteResponse(BaseModel):
+    positions: List[QuotedPosition]
+    order_quantity: int
+    total_price: int # сумма позиций без доставки
+    is_valid: bool # заказ с такими ценами будет принят
+
+
 class AddIngredient(TypedDict):
     quantity: int
     price: float
@@ -117,6 +117,17 @@ class BaseRestaurantResponse(BaseModel):
         validate_by_name = True
 
 
+class OpeningTime(BaseModel):
+    day: DayShortName
+    time: str # "HH:MM"
+
+    @classmethod
+    def from_minute_of_week(cls, minute: int) -> "OpeningTime":
+        day, minute_of_day = divmod(minute, 24 * 60)
+        hours, minutes = divmod(minute_of_day, 60)
+        return cls(day=list(DayShortName)[day], time=f"{hours:02d}:{minutes:02d}")
+
+
 class RestaurantItem(BaseModel):
     id: int
     name: str
@@ -126,6 +137,8 @@ class RestaurantItem(BaseModel):
     working_hours: WorkingHoursModel
     features: List[str]
     actions: List[RestaurantActionEnum]
+    is_open: bool = False
+    next_opening: Optional[OpeningTime] = None # ближайшее открытие, если сейчас закрыт
 
 
 class RestaurantData(BaseModel):
@@ -144,6 +157,24 @@ class GetRestaurantResponse(RestaurantItem):
     pass
 
 
+### NEAREST RESTAURANTS
+
+class NearestRestaurantItem(BaseModel):
+    id: int
+    city_id: int
+    name: str
+    address: str
+    phone: str
+    coords: List[float]
+    actions: List[RestaurantActionEnum]
+    delivery_price: int
+    distance_km: float
+
+
+class GetNearestRestaurantsResponse(BaseModel):
+    restaurants: List[NearestRestaurantItem] # от ближнего к дальнему
+
+
 ### ADD RESTAURANT
 
 class AddRestaurantRequest(BaseRestaurantRequest):
@@ -0,0 +1,16 @@
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class SearchItem(BaseModel):
+    id: int # Food.id
+    category_id: Optional[int]
+    name: str
+    image_url: str
+    description: str
+    price_from: int # цена самого дешевого активного варианта
+
+
+class SearchResponse(BaseModel):
+    positions: List[SearchItem] # от самых релевантных
@@ -111,6 +111,37 @@ def register_exception_handlers(app: FastAPI) -> None:
             content={"detail": str(exc)},
         )
 
+    @app.exception_handler(infra_exc.PasswordHasherBusyError)
+    async def password_hasher_busy_handler(_: Request, exc: Exception) -> JSONResponse:
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"detail": str(exc)},
+            headers={"Retry-After": "1"},
+        )
+
+    @app.exception_handler(infra_exc.WebhookSecretError)
+    async def webhook_secret_handler(_: Request, exc: Exception) -> JSONResponse:
+        return JSONResponse(
+            status_code=status.HTTP_403_FORBIDDEN,
+            content={"detail": str(exc)},
+        )
+
+    @app.exception_handler(infra_exc.InvalidUpdateError)
+    async def invalid_update_handler(_: Request, exc: Exception) -> JSONResponse:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"detail": str(exc)},
+        )
+
+    @app.exception_handler(infra_exc.UpdateQueueFullError)
+    async def update_queue_full_handler(_: Request, exc: Exception) -> JSONResponse:
+        # Telegram повторит доставку обновления позже
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"detail": str(exc)},
+            headers={"Retry-After": "1"},
+        )
+
     # APPLICATION EXCEPTION HANDLERS
 
     @app.exception_handler(app_exc.DatabaseException)
@@ -127,6 +158,13 @@ def register_exception_handlers(app: FastAPI) -> None:
             content={"detail": "Id is not valid."},
         )
 
+    @app.exception_handler(app_exc.CursorNotValidError)
+    async def cursor_not_valid_handler(_: Request, __: Exception) -> JSONResponse:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"detail": "Cursor is not valid."},
+        )
+
     @app.exception_handler(app_exc.TokenError)
     async def token_error_handler(_: Request, exc: Exception) -> JSONResponse:
         return JSONResponse(
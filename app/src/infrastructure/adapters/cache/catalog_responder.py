@@ -0,0 +1,62 @@
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Hashable, Optional
+
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+from starlette import status
+
+from src.application.interfaces.cache.response_cache import IResponseCache
+
+
+@lru_cache
+def _get_type_adapter(response_model: Any) -> TypeAdapter:
+    return TypeAdapter(response_model)
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        # Слабое сравнение: nginx может пометить ETag как W/ при сжатии
+        if candidate.removeprefix("W/") == etag:
+            return True
+
+    return False
+
+
+class CatalogResponder:
+    """Отдает справочные данные готовым JSON с ETag и отвечает 304 на If-None-Match"""
+
+    def __init__(self, response_cache: IResponseCache, max_age_seconds: int) -> None:
+        self._response_cache = response_cache
+        self._max_age_seconds = max_age_seconds
+
+    async def __call__(
+        self,
+        request: Request,
+        key: Hashable,
+        response_model: Any,
+        build: Callable[[], Awaitable[Any]],
+        max_age_seconds: Optional[int] = None,
+    ) -> Response:
+        """max_age_seconds - сколько ответ еще верен, если меньше общего max-age"""
+        rendered = self._response_cache.get(key)
+        if rendered is None:
+            version = self._response_cache.version
+            adapter = _get_type_adapter(response_model)
+            # Та же валидация и сериализация, что делает FastAPI по response_model
+            content = adapter.validate_python(await build(), from_attributes=True)
+            rendered = self._response_cache.put(key, adapter.dump_json(content, by_alias=True), version)
+
+        max_age = self._max_age_seconds
+        if max_age_seconds is not None:
+            max_age = max(0, min(max_age, max_age_seconds))
+        headers = {"ETag": rendered.etag, "Cache-Control": f"public, max-age={max_age}"}
+
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and _etag_matches(if_none_match, rendered.etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        return Response(content=rendered.body, media_type="application/json", headers=headers)
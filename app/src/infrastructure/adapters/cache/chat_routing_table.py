@@ -0,0 +1,55 @@
+import asyncio
+import time
+from typing import Dict, List
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.application.interfaces.cache.chat_routing_table import IChatRoutingTable
+from src.infrastructure.adapters.telegram.chat_repository import ChatRepository
+from src.logger import logger
+
+
+class ChatRoutingTable(IChatRoutingTable):
+    """Таблица ресторан -> chat_id в памяти процесса бота.
+
+    Загружается целиком при старте и перечитывается после NOTIFY
+    об изменении чатов или по TTL, если уведомление потерялось.
+    Отправка заказа в чаты не обращается к БД.
+    """
+
+    def __init__(
+        self,
+        session_maker: async_sessionmaker[AsyncSession],
+        ttl_seconds: float,
+    ) -> None:
+        self._session_maker = session_maker
+        self._ttl_seconds = ttl_seconds
+        self._routes: Dict[int, List[str]] = {}
+        self._expires_at = 0.0
+        self._version = 0
+        self._lock = asyncio.Lock()
+
+    async def get_chat_ids(self, restaurant_id: int) -> List[str]:
+        if self._expires_at < time.monotonic():
+            async with self._lock:
+                # Пока ждали блокировку, таблицу мог перечитать другой запрос
+                if self._expires_at < time.monotonic():
+                    await self.refresh()
+
+        return self._routes.get(restaurant_id, [])
+
+    async def refresh(self) -> None:
+        version = self._version
+        expires_at = time.monotonic() + self._ttl_seconds
+        async with self._session_maker() as session:
+            routes = await ChatRepository(session).get_restaurant_chat_ids()
+
+        self._routes = routes
+        # NOTIFY пришел во время чтения - данные могли устареть, следующий запрос перечитает
+        if version == self._version:
+            self._expires_at = expires_at
+        logger.info(f"Telegram chat routing loaded: {len(routes)} restaurants")
+
+    def invalidate(self) -> None:
+        self._version += 1
+        self._expires_at = 0.0
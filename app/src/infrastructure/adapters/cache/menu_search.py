@@ -0,0 +1,191 @@
+import asyncio
+import time
+from collections import defaultdict
+from typing import Dict, FrozenSet, Iterable, List, Set, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.application.interfaces.cache.menu_search import (
+    DESCRIPTION_WEIGHT,
+    FUZZY_MIN_LENGTH,
+    INGREDIENT_WEIGHT,
+    NAME_WEIGHT,
+    IMenuSearch,
+    MenuSearchIndex,
+    SearchDocument,
+    deletes,
+    tokenize,
+)
+from src.infrastructure.drivers.db.tables import (
+    Food,
+    FoodIngredientAssociation,
+    FoodVariant,
+    Ingredient,
+    Restaurant,
+    restaurant_category_association,
+    restaurant_food_disabled,
+)
+from src.logger import logger
+
+
+def build_search_index(
+    version: int,
+    documents: Iterable[SearchDocument],
+    ingredients: Iterable[Tuple[int, str]],
+    restaurant_categories: Dict[int, Set[int]],
+    disabled: Iterable[Tuple[int, int]],
+) -> MenuSearchIndex:
+    """Индекс блюд: ingredients - (Food.id, название ингредиента в составе),
+    restaurant_categories - категории каждого активного ресторана,
+    disabled - пары (Restaurant.id, Food.id) отключенных блюд"""
+    documents_by_id = {document.food_id: document for document in documents}
+
+    postings: Dict[str, Dict[int, float]] = defaultdict(dict)
+
+    def add(food_id: int, text: str, weight: float) -> None:
+        for word in tokenize(text):
+            if postings[word].get(food_id, 0.0) < weight:
+                postings[word][food_id] = weight
+
+    for document in documents_by_id.values():
+        add(document.food_id, document.name, NAME_WEIGHT)
+        add(document.food_id, document.description, DESCRIPTION_WEIGHT)
+    for food_id, name in ingredients:
+        # Состав блюд без активных вариантов не нужен
+        if food_id in documents_by_id:
+            add(food_id, name, INGREDIENT_WEIGHT)
+
+    typos: Dict[str, Set[str]] = defaultdict(set)
+    for word in postings:
+        if len(word) >= FUZZY_MIN_LENGTH:
+            for key in deletes(word):
+                typos[key].add(word)
+
+    foods_by_category: Dict[int, Set[int]] = defaultdict(set)
+    for document in documents_by_id.values():
+        if document.category_id is not None:
+            foods_by_category[document.category_id].add(document.food_id)
+
+    disabled_by_restaurant: Dict[int, Set[int]] = defaultdict(set)
+    for restaurant_id, food_id in disabled:
+        disabled_by_restaurant[restaurant_id].add(food_id)
+
+    restaurant_foods: Dict[int, FrozenSet[int]] = {}
+    for restaurant_id, category_ids in restaurant_categories.items():
+        food_ids: Set[int] = set()
+        for category_id in category_ids:
+            food_ids.update(foods_by_category.get(category_id, ()))
+        restaurant_foods[restaurant_id] = frozenset(food_ids - disabled_by_restaurant[restaurant_id])
+
+    return MenuSearchIndex(
+        version=version,
+        documents=documents_by_id,
+        words=tuple(sorted(postings)),
+        postings=dict(postings),
+        typos={key: tuple(words) for key, words in typos.items()},
+        restaurant_foods=restaurant_foods,
+    )
+
+
+class MenuSearch(IMenuSearch):
+    """Поисковый индекс меню в памяти процесса.
+
+    Поиск - бинарный поиск по словам и пересечение словарей, без запросов
+    в БД. Перестраивается после изменения меню (коммит в этом процессе
+    или NOTIFY из триггера) и по TTL.
+    """
+
+    def __init__(
+        self,
+        session_maker: async_sessionmaker[AsyncSession],
+        ttl_seconds: float,
+    ) -> None:
+        self._session_maker = session_maker
+        self._ttl_seconds = ttl_seconds
+        self._index = build_search_index(0, (), (), {}, ())
+        self._expires_at = 0.0
+        self._version = 0
+        self._lock = asyncio.Lock()
+
+    async def get_index(self) -> MenuSearchIndex:
+        if self._expires_at < time.monotonic():
+            async with self._lock:
+                # Пока ждали блокировку, индекс мог перестроить другой запрос
+                if self._expires_at < time.monotonic():
+                    await self.refresh()
+
+        return self._index
+
+    async def refresh(self) -> None:
+        version = self._version
+        expires_at = time.monotonic() + self._ttl_seconds
+        async with self._session_maker() as session:
+            # Только блюда с активными вариантами - как в позициях категории
+            food_rows = (await session.execute(
+                select(
+                    Food.id,
+                    Food.category_id,
+                    Food.name,
+                    Food.description,
+                    Food.image_url,
+                    func.min(FoodVariant.price).label("price_from"),
+                )
+                .join(FoodVariant, FoodVariant.food_id == Food.id)
+                .where(FoodVariant.is_active == True)
+                .group_by(Food.id)
+            )).all()
+            ingredient_rows = (await session.execute(
+                select(FoodIngredientAssociation.food_id, Ingredient.name)
+                .join(Ingredient, Ingredient.id == FoodIngredientAssociation.ingredient_id)
+                .where(FoodIngredientAssociation.is_default == True)
+            )).all()
+            restaurant_ids = (await session.scalars(
+                select(Restaurant.id).where(Restaurant.is_active == True)
+            )).all()
+            category_rows = (await session.execute(
+                select(
+                    restaurant_category_association.c.restaurant_id,
+                    restaurant_category_association.c.category_id,
+                )
+            )).all()
+            disabled_rows = (await session.execute(
+                select(restaurant_food_disabled.c.restaurant_id, restaurant_food_disabled.c.food_id)
+            )).all()
+
+        documents: List[SearchDocument] = [
+            SearchDocument(
+                food_id=row.id,
+                category_id=row.category_id,
+                name=row.name,
+                description=row.description or "",
+                image_url=row.image_url,
+                price_from=row.price_from,
+            )
+            for row in food_rows
+        ]
+
+        restaurant_categories: Dict[int, Set[int]] = {restaurant_id: set() for restaurant_id in restaurant_ids}
+        for restaurant_id, category_id in category_rows:
+            if restaurant_id in restaurant_categories:
+                restaurant_categories[restaurant_id].add(category_id)
+
+        index = build_search_index(
+            version,
+            documents,
+            ingredient_rows,
+            restaurant_categories,
+            disabled_rows,
+        )
+
+        # Меню изменили во время чтения - индекс мог устареть, следующий запрос перестроит
+        if version == self._version:
+            self._expires_at = expires_at
+        self._index = index
+        logger.info(
+            f"Menu search index loaded: {len(index.documents)} foods, {len(index.words)} words, version: {version}"
+        )
+
+    def invalidate(self) -> None:
+        self._version += 1
+        self._expires_at = 0.0
@@ -0,0 +1,42 @@
+from typing import Optional, Tuple
+
+from src.application.interfaces.cache.menu_snapshot_cache import IMenuSnapshotCache, MenuSnapshot
+from src.infrastructure.adapters.cache.ttl_cache import TTLCache
+from src.logger import logger
+
+
+class MenuSnapshotCache(IMenuSnapshotCache):
+    def __init__(self, max_entries: int, ttl_seconds: float) -> None:
+        self._snapshots: TTLCache[Tuple[Optional[int], int], MenuSnapshot] = TTLCache(max_entries, ttl_seconds)
+        self._version = 0
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def get(self, restaurant_id: Optional[int], category_id: int) -> Optional[MenuSnapshot]:
+        snapshot = self._snapshots.get((restaurant_id, category_id))
+        if snapshot is None or snapshot.version != self._version:
+            return None
+
+        return snapshot
+
+    def put(
+        self,
+        restaurant_id: Optional[int],
+        category_id: int,
+        body: bytes,
+        version: int
+    ) -> MenuSnapshot:
+        snapshot = MenuSnapshot(version=version, body=body)
+
+        # Снимок, собранный до инвалидации, не кэшируем
+        if version == self._version:
+            self._snapshots.set((restaurant_id, category_id), snapshot)
+
+        return snapshot
+
+    def invalidate(self) -> None:
+        self._version += 1
+        self._snapshots.clear()
+        logger.info(f"Menu snapshot cache invalidated, version: {self._version}")
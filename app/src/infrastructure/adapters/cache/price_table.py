@@ -0,0 +1,177 @@
+import asyncio
+import time
+from collections import defaultdict
+from math import ceil
+from typing import Dict, FrozenSet, List, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.application.interfaces.cache.price_table import (
+    IPriceTable,
+    PriceSnapshot,
+    RestaurantOrderInfo,
+    VariantPrices,
+)
+from src.domain.enums.enums import OrderAction
+from src.infrastructure.drivers.db.tables import (
+    Food,
+    FoodCharacteristic,
+    FoodIngredientAssociation,
+    FoodVariant,
+    Ingredient,
+    Restaurant,
+    food_characteristic_variant_association,
+)
+from src.logger import logger
+
+
+class PriceTable(IPriceTable):
+    """Цены вариантов блюд и добавок и данные ресторанов для заказа в памяти процесса.
+
+    Цена добавки для каждого варианта посчитана заранее, проверка
+    заказа - несколько обращений к словарям без запросов в БД.
+    Перечитывается после изменения меню (коммит в этом процессе или
+    NOTIFY из триггера) и по TTL, если уведомление потерялось.
+    """
+
+    def __init__(
+        self,
+        session_maker: async_sessionmaker[AsyncSession],
+        ttl_seconds: float,
+    ) -> None:
+        self._session_maker = session_maker
+        self._ttl_seconds = ttl_seconds
+        self._snapshot = PriceSnapshot(version=0, variants={}, ingredient_names={}, restaurants={})
+        self._expires_at = 0.0
+        self._version = 0
+        self._lock = asyncio.Lock()
+
+    async def get_snapshot(self) -> PriceSnapshot:
+        if self._expires_at < time.monotonic():
+            async with self._lock:
+                # Пока ждали блокировку, таблицу мог перечитать другой запрос
+                if self._expires_at < time.monotonic():
+                    await self.refresh()
+
+        return self._snapshot
+
+    async def refresh(self) -> None:
+        version = self._version
+        expires_at = time.monotonic() + self._ttl_seconds
+        async with self._session_maker() as session:
+            variant_rows = (await session.execute(
+                select(
+                    FoodVariant.id,
+                    FoodVariant.food_id,
+                    FoodVariant.price,
+                    FoodVariant.ingredient_price_modifier,
+                    Food.name,
+                    Food.measure_name,
+                )
+                .join(Food, Food.id == FoodVariant.food_id)
+            )).all()
+            measure_rows = (await session.execute(
+                select(
+                    food_characteristic_variant_association.c.variant_id,
+                    FoodCharacteristic.measure_value,
+                )
+                .join(
+                    FoodCharacteristic,
+                    FoodCharacteristic.id == food_characteristic_variant_association.c.characteristic_id,
+                )
+                .order_by(
+                    food_characteristic_variant_association.c.variant_id,
+                    food_characteristic_variant_association.c.characteristic_id,
+                )
+            )).all()
+            ingredient_rows = (await session.execute(
+                select(
+                    FoodIngredientAssociation.food_id,
+                    FoodIngredientAssociation.is_default,
+                    Ingredient.id,
+                    Ingredient.name,
+                    Ingredient.price,
+                )
+                .join(Ingredient, Ingredient.id == FoodIngredientAssociation.ingredient_id)
+            )).all()
+            restaurant_rows = (await session.execute(
+                select(
+                    Restaurant.id,
+                    Restaurant.address,
+                    Restaurant.phone,
+                    Restaurant.delivery_price,
+                    Restaurant.has_delivery,
+                    Restaurant.has_takeaway,
+                    Restaurant.has_dine_in,
+                )
+            )).all()
+
+        ingredient_names: Dict[int, str] = {}
+        food_ingredients: Dict[int, List[Tuple[int, int]]] = defaultdict(list)
+        food_removable: Dict[int, set] = defaultdict(set)
+        for food_id, is_default, ingredient_id, name, price in ingredient_rows:
+            ingredient_names[ingredient_id] = name
+            food_ingredients[food_id].append((ingredient_id, price))
+            if is_default:
+                food_removable[food_id].add(ingredient_id)
+
+        # Один frozenset на блюдо, варианты ссылаются на него
+        removable: Dict[int, FrozenSet[int]] = {
+            food_id: frozenset(ids) for food_id, ids in food_removable.items()
+        }
+        empty: FrozenSet[int] = frozenset()
+
+        # В названии позиции - первая характеристика варианта
+        measure_values: Dict[int, str] = {}
+        for variant_id, measure_value in measure_rows:
+            measure_values.setdefault(variant_id, measure_value or '')
+
+        variants: Dict[int, VariantPrices] = {}
+        for variant_id, food_id, price, modifier, food_name, measure_name in variant_rows:
+            variants[variant_id] = VariantPrices(
+                food_name=food_name,
+                measure_name=measure_name,
+                measure_value=measure_values.get(variant_id, ''),
+                price=price,
+                adding_prices={
+                    ingredient_id: ceil(ingredient_price * modifier)
+                    for ingredient_id, ingredient_price in food_ingredients.get(food_id, ())
+                },
+                removable_ids=removable.get(food_id, empty),
+            )
+
+        restaurants: Dict[int, RestaurantOrderInfo] = {}
+        for restaurant_id, address, phone, delivery_price, has_delivery, has_takeaway, has_dine_in in restaurant_rows:
+            actions = {
+                action
+                for action, available in (
+                    (OrderAction.DELIVERY, has_delivery),
+                    (OrderAction.TAKEAWAY, has_takeaway),
+                    (OrderAction.INSIDE, has_dine_in),
+                )
+                if available
+            }
+            restaurants[restaurant_id] = RestaurantOrderInfo(
+                address=address,
+                phone=phone.e164,
+                delivery_price=delivery_price,
+                actions=frozenset(actions),
+            )
+
+        # Изменение меню во время чтения - снимок мог устареть, следующий запрос перечитает
+        if version == self._version:
+            self._expires_at = expires_at
+        self._snapshot = PriceSnapshot(
+            version=version,
+            variants=variants,
+            ingredient_names=ingredient_names,
+            restaurants=restaurants,
+        )
+        logger.info(
+            f"Price table loaded: {len(variants)} variants, {len(restaurants)} restaurants, version: {version}"
+        )
+
+    def invalidate(self) -> None:
+        self._version += 1
+        self._expires_at = 0.0
@@ -0,0 +1,41 @@
+import hashlib
+from typing import Hashable, Optional
+
+from src.application.interfaces.cache.response_cache import IResponseCache, RenderedResponse
+from src.infrastructure.adapters.cache.ttl_cache import TTLCache
+from src.logger import logger
+
+
+def make_etag(body: bytes) -> str:
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+class ResponseCache(IResponseCache):
+    def __init__(self, max_entries: int, ttl_seconds: float) -> None:
+        self._responses: TTLCache[Hashable, RenderedResponse] = TTLCache(max_entries, ttl_seconds)
+        self._version = 0
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def get(self, key: Hashable) -> Optional[RenderedResponse]:
+        rendered = self._responses.get(key)
+        if rendered is None or rendered.version != self._version:
+            return None
+
+        return rendered
+
+    def put(self, key: Hashable, body: bytes, version: int) -> RenderedResponse:
+        rendered = RenderedResponse(version=version, body=body, etag=make_etag(body))
+
+        # Ответ, собранный до инвалидации, не кэшируем
+        if version == self._version:
+            self._responses.set(key, rendered)
+
+        return rendered
+
+    def invalidate(self) -> None:
+        self._version += 1
+        self._responses.clear()
+        logger.info(f"Catalog response cache invalidated, version: {self._version}")
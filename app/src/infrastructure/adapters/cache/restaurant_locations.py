@@ -0,0 +1,129 @@
+import asyncio
+import time
+from collections import defaultdict
+from typing import Dict, Iterable, List, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.application.interfaces.cache.restaurant_locations import (
+    IRestaurantLocations,
+    LocationIndex,
+    RestaurantLocation,
+    grid_cell,
+)
+from src.domain.enums.enums import OrderAction
+from src.infrastructure.drivers.db.tables import Restaurant
+from src.logger import logger
+
+
+def build_index(version: int, locations: Iterable[RestaurantLocation]) -> LocationIndex:
+    cells: Dict[Tuple[int, int], List[RestaurantLocation]] = defaultdict(list)
+    for location in locations:
+        cells[grid_cell(location.latitude, location.longitude)].append(location)
+
+    if not cells:
+        return LocationIndex(version=version, cells={})
+
+    rows = [row for row, _ in cells]
+    cols = [col for _, col in cells]
+    return LocationIndex(
+        version=version,
+        cells={cell: tuple(items) for cell, items in cells.items()},
+        min_row=min(rows),
+        max_row=max(rows),
+        min_col=min(cols),
+        max_col=max(cols),
+    )
+
+
+class RestaurantLocations(IRestaurantLocations):
+    """Сетка координат активных ресторанов в памяти процесса.
+
+    Ближайшие рестораны ищутся обходом соседних ячеек без запросов в БД.
+    Перестраивается после изменения ресторанов (коммит в этом процессе
+    или NOTIFY из триггера) и по TTL.
+    """
+
+    def __init__(
+        self,
+        session_maker: async_sessionmaker[AsyncSession],
+        ttl_seconds: float,
+    ) -> None:
+        self._session_maker = session_maker
+        self._ttl_seconds = ttl_seconds
+        self._index = LocationIndex(version=0, cells={})
+        self._expires_at = 0.0
+        self._version = 0
+        self._lock = asyncio.Lock()
+
+    async def get_index(self) -> LocationIndex:
+        if self._expires_at < time.monotonic():
+            async with self._lock:
+                # Пока ждали блокировку, сетку мог перестроить другой запрос
+                if self._expires_at < time.monotonic():
+                    await self.refresh()
+
+        return self._index
+
+    async def refresh(self) -> None:
+        version = self._version
+        expires_at = time.monotonic() + self._ttl_seconds
+        async with self._session_maker() as session:
+            rows = (await session.execute(
+                select(
+                    Restaurant.id,
+                    Restaurant.city_id,
+                    Restaurant.name,
+                    Restaurant.address,
+                    Restaurant.phone,
+                    Restaurant.latitude,
+                    Restaurant.longitude,
+                    Restaurant.delivery_price,
+                    Restaurant.has_delivery,
+                    Restaurant.has_takeaway,
+                    Restaurant.has_dine_in,
+                )
+                .where(
+                    Restaurant.is_active,
+                    Restaurant.latitude.is_not(None),
+                    Restaurant.longitude.is_not(None),
+                )
+            )).all()
+
+        locations: List[RestaurantLocation] = []
+        for row in rows:
+            actions = {
+                action
+                for action, available in (
+                    (OrderAction.DELIVERY, row.has_delivery),
+                    (OrderAction.TAKEAWAY, row.has_takeaway),
+                    (OrderAction.INSIDE, row.has_dine_in),
+                )
+                if available
+            }
+            # Numeric приходит как Decimal - считаем расстояния во float
+            locations.append(RestaurantLocation(
+                id=row.id,
+                city_id=row.city_id,
+                name=row.name,
+                address=row.address,
+                phone=row.phone.e164,
+                latitude=float(row.latitude),
+                longitude=float(row.longitude),
+                delivery_price=row.delivery_price,
+                actions=frozenset(actions),
+            ))
+
+        # Рестораны изменили во время чтения - сетка могла устареть, следующий запрос перестроит
+        if version == self._version:
+            self._expires_at = expires_at
+        self._index = build_index(version, locations)
+        logger.info(
+            f"Restaurant locations loaded: {len(locations)} restaurants, "
+            f"{len(self._index.cells)} cells, version: {version}"
+        )
+
+    def invalidate(self) -> None:
+        self._version += 1
+        self._expires_at = 0.0
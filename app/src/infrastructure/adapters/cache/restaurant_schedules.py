@@ -0,0 +1,148 @@
+import asyncio
+import time
+from collections import defaultdict
+from datetime import datetime, time as dt_time
+from typing import Dict, Iterable, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.application.interfaces.cache.restaurant_schedules import (
+    DAY_MINUTES,
+    WEEK_MINUTES,
+    IRestaurantSchedules,
+    ScheduleSnapshot,
+    WeeklySchedule,
+)
+from src.infrastructure.drivers.db.tables import WorkingHours
+from src.logger import logger
+
+
+def _minutes(value: dt_time) -> int:
+    return value.hour * 60 + value.minute
+
+
+def _day_intervals(wh: WorkingHours) -> List[Tuple[int, int]]:
+    """Интервалы работы дня в минутах от начала этого дня"""
+    opens = _minutes(wh.opens_at)
+    closes = _minutes(wh.closes_at)
+    # Закрытие раньше открытия - работа после полуночи
+    if closes <= opens:
+        closes += DAY_MINUTES
+
+    if wh.break_start is None or wh.break_end is None:
+        return [(opens, closes)]
+
+    break_start = _minutes(wh.break_start)
+    break_end = _minutes(wh.break_end)
+    if break_start < opens:
+        break_start += DAY_MINUTES
+    if break_end < opens:
+        break_end += DAY_MINUTES
+
+    # Перерыв вне часов работы игнорируется
+    if not opens <= break_start < break_end <= closes:
+        return [(opens, closes)]
+
+    return [(opens, break_start), (break_end, closes)]
+
+
+def compile_week(working_hours: Iterable[WorkingHours]) -> WeeklySchedule:
+    # is_holiday не означает выходной: миграция 7ee8c475498f, server_default и
+    # add_restaurant ставят true всем дням. Выходной - день без строки WorkingHours
+    intervals: List[Tuple[int, int]] = []
+    for wh in working_hours:
+        day_start = wh.day_of_week * DAY_MINUTES
+        for start, end in _day_intervals(wh):
+            start += day_start
+            end += day_start
+            # Ночь с воскресенья на понедельник переносится в начало недели
+            if end > WEEK_MINUTES:
+                intervals.append((start, WEEK_MINUTES))
+                intervals.append((0, end - WEEK_MINUTES))
+            else:
+                intervals.append((start, end))
+
+    # Пересекающиеся и смежные интервалы склеиваются
+    merged: List[List[int]] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+
+    return WeeklySchedule(
+        starts=tuple(start for start, _ in merged),
+        ends=tuple(end for _, end in merged),
+    )
+
+
+class RestaurantSchedules(IRestaurantSchedules):
+    """Скомпилированные недели работы всех ресторанов в памяти процесса.
+
+    Открыт ли ресторан сейчас или к cook_start - бинарный поиск по
+    отсортированным минутам недели без запросов в БД и без разбора
+    WorkingHours на каждый запрос. Перечитывается после изменения часов
+    работы (коммит в этом процессе или NOTIFY из триггера) и по TTL.
+    """
+
+    def __init__(
+        self,
+        session_maker: async_sessionmaker[AsyncSession],
+        ttl_seconds: float,
+        timezone: str,
+    ) -> None:
+        self._session_maker = session_maker
+        self._ttl_seconds = ttl_seconds
+        self._timezone = ZoneInfo(timezone)
+        self._snapshot = ScheduleSnapshot(version=0, schedules={}, transitions=())
+        self._expires_at = 0.0
+        self._version = 0
+        self._lock = asyncio.Lock()
+
+    async def get_snapshot(self) -> ScheduleSnapshot:
+        if self._expires_at < time.monotonic():
+            async with self._lock:
+                # Пока ждали блокировку, расписания мог перечитать другой запрос
+                if self._expires_at < time.monotonic():
+                    await self.refresh()
+
+        return self._snapshot
+
+    def minute_of_week(self, moment: Optional[datetime] = None) -> int:
+        local = (moment or datetime.now(self._timezone)).astimezone(self._timezone)
+        return local.weekday() * DAY_MINUTES + local.hour * 60 + local.minute
+
+    async def refresh(self) -> None:
+        version = self._version
+        expires_at = time.monotonic() + self._ttl_seconds
+        async with self._session_maker() as session:
+            working_hours = (await session.scalars(select(WorkingHours))).all()
+
+        by_restaurant: Dict[int, List[WorkingHours]] = defaultdict(list)
+        for wh in working_hours:
+            by_restaurant[wh.restaurant_id].append(wh)
+
+        schedules = {
+            restaurant_id: compile_week(rows)
+            for restaurant_id, rows in by_restaurant.items()
+        }
+        transitions = set()
+        for schedule in schedules.values():
+            transitions.update(schedule.starts)
+            transitions.update(schedule.ends)
+
+        # Часы изменили во время чтения - снимок мог устареть, следующий запрос перечитает
+        if version == self._version:
+            self._expires_at = expires_at
+        self._snapshot = ScheduleSnapshot(
+            version=version,
+            schedules=schedules,
+            transitions=tuple(sorted(transitions)),
+        )
+        logger.info(f"Restaurant schedules loaded: {len(schedules)} restaurants, version: {version}")
+
+    def invalidate(self) -> None:
+        self._version += 1
+        self._expires_at = 0.0
@@ -0,0 +1,32 @@
+from typing import Optional
+
+from src.application.interfaces.cache.user_auth_cache import AuthUser, IUserAuthCache
+from src.infrastructure.adapters.cache.ttl_cache import TTLCache
+from src.logger import logger
+
+
+class UserAuthCache(IUserAuthCache):
+    def __init__(self, max_entries: int, ttl_seconds: float) -> None:
+        self._users: TTLCache[int, AuthUser] = TTLCache(max_entries, ttl_seconds)
+        self._version = 0
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def get(self, user_id: int) -> Optional[AuthUser]:
+        return self._users.get(user_id)
+
+    def put(self, user: AuthUser, version: int) -> None:
+        # Пока пользователь читался из БД, пришла инвалидация - данные могли устареть
+        if version == self._version:
+            self._users.set(user.id, user)
+
+    def invalidate(self, user_id: int) -> None:
+        self._version += 1
+        self._users.pop(user_id)
+        logger.info(f"User auth cache invalidated, user_id: {user_id}")
+
+    def clear(self) -> None:
+        self._version += 1
+        self._users.clear()
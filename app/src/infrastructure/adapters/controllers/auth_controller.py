@@ -3,6 +3,8 @@ from dishka import FromDishka
 from dishka.integrations.fastapi import inject
 from starlette import status
 
+from src.application.interfaces.transaction_manager import TransactionPolicy
+from src.middlewares.transaction_middleware import transaction_policy
 from src.application.interfaces.interactors.auth_interactor import GetCurrentUserInteractor, LoginUserInteractor, LogoutInteractor, RegisterUserInteractor, UpdateAccessTokenInteractor
 from src.domain.dto.auth_dto import CreateUser, CreateUserResponse, CurrentUserDTO, LogOutResponse, LoginUserRequest, LogInDTO, LoginUserResponse, TokenResponse, UpdateUserResponse
 
@@ -61,6 +63,7 @@ async def login_for_access_token(
         status.HTTP_400_BAD_REQUEST: {"error": "Can't update access token."},
     },
 )
+@transaction_policy(TransactionPolicy.LAZY) # только чтение refresh токена
 @inject
 async def update_access_token(
     update_token: FromDishka[UpdateAccessTokenInteractor],
@@ -1,10 +1,11 @@
 from dishka import FromDishka
 from dishka.integrations.fastapi import inject
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
 from starlette import status
 
 from src.application.interfaces.interactors.city_interactor import AddCityInteractor, DeleteCityInteractor, GetAllCitiesInteractor, GetCityInteractor, UpdateCityInteractor
 from src.domain.dto.city_dto import AddCityRequest, AddCityResponse, DeleteCityResponse, GetAllCitiesResponse, GetCityResponse, UpdateCityRequest
+from src.infrastructure.adapters.cache.catalog_responder import CatalogResponder
 
 
 
@@ -21,9 +22,11 @@ router = APIRouter(prefix="/city", tags=["City"])
 )
 @inject
 async def get_cities(
-    get_cities: FromDishka[GetAllCitiesInteractor]
+    request: Request,
+    get_cities: FromDishka[GetAllCitiesInteractor],
+    catalog_response: FromDishka[CatalogResponder]
 ):
-    return await get_cities()
+    return await catalog_response(request, "cities", GetAllCitiesResponse, get_cities)
 
 
 @router.get(
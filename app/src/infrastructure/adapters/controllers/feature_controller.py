@@ -1,10 +1,11 @@
 from dishka import FromDishka
 from dishka.integrations.fastapi import inject
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
 from starlette import status
 
 from src.domain.dto.feature_dto import CreateFeatureRequest, CreateFeatureResponse, DeleteFeatureResponse, GetFeatureResponse, GetAllFeaturesResponse
 from src.application.interfaces.interactors.feature_interactor import AddFeatureInteractor, DeleteFeatureInteractor, GetAllFeaturesInteractor, GetFeatureInteractor
+from src.infrastructure.adapters.cache.catalog_responder import CatalogResponder
 
 
 router = APIRouter(prefix="/feature", tags=["Feature"])
@@ -35,9 +36,11 @@ async def get_feature(
 )
 @inject
 async def get_all_features(
-    get_features: FromDishka[GetAllFeaturesInteractor]
+    request: Request,
+    get_features: FromDishka[GetAllFeaturesInteractor],
+    catalog_response: FromDishka[CatalogResponder]
 ):
-    return await get_features()
+    return await catalog_response(request, "features", GetAllFeaturesResponse, get_features)
 
 # TODO: нужна проверка на роль админа
 # @router.post(
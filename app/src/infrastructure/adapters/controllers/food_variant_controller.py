@@ -2,7 +2,7 @@ from typing import Annotated, List
 
 from dishka import FromDishka
 from dishka.integrations.fastapi import inject
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Query, Response
 from starlette import status
 
 from src.domain.dto.food_variant_dto import FoodVariantResponse, PositionsResponse
@@ -40,4 +40,6 @@ async def get_menu_category_food_variants_ingredients(
     get_foods_ingredients: FromDishka[GetMenuCategoryPositionsIngredientsInteractor],
     restaurant_id: Annotated[int | None, Query(alias="restaurant_id", gt=0)] = None
 ):
-    return await get_foods_ingredients(category_id, restaurant_id)
+    # Тело уже сериализовано в снимке меню, повторная валидация через response_model не нужна
+    body = await get_foods_ingredients(category_id, restaurant_id)
+    return Response(content=body, media_type="application/json")
@@ -1,11 +1,12 @@
 from typing import List
 from dishka import FromDishka
 from dishka.integrations.fastapi import inject
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
 from starlette import status
 
 from src.application.interfaces.interactors.ingredient_interactor import GetAllIngredientsInteractor, GetMenuCategoryIngredientsInteractor
 from src.domain.dto.ingredient_dto import IngredientResponse
+from src.infrastructure.adapters.cache.catalog_responder import CatalogResponder
 
 
 router = APIRouter(prefix="/ingredient", tags=["Ingredient"])
@@ -36,7 +37,14 @@ router = APIRouter(prefix="/ingredient", tags=["Ingredient"])
 )
 @inject
 async def get_all_addings_category_ingredients(
+    request: Request,
     category_id: int,
-    get_category_ingredients: FromDishka[GetMenuCategoryIngredientsInteractor]
+    get_category_ingredients: FromDishka[GetMenuCategoryIngredientsInteractor],
+    catalog_response: FromDishka[CatalogResponder]
 ):
-    return await get_category_ingredients(category_id)
+    return await catalog_response(
+        request,
+        ("category_addings", category_id),
+        List[IngredientResponse],
+        lambda: get_category_ingredients(category_id)
+    )
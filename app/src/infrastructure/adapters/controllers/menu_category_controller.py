@@ -1,7 +1,7 @@
 from typing import Annotated, Optional
 from dishka import FromDishka
 from dishka.integrations.fastapi import inject
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Query, Request
 from starlette import status
 
 from src.domain.dto.menu_category_dto import AddMenuCategoryRequest, AddMenuCategoryResponse, GetMenuCategoriesResponse
@@ -10,6 +10,7 @@ from src.application.interfaces.interactors.menu_category_interactor import (
     GetMenuCategoryInteractor,
     GetRestaurantMenuCategoryInteractor
 )
+from src.infrastructure.adapters.cache.catalog_responder import CatalogResponder
 
 
 router = APIRouter(prefix="/category", tags=["Menu Category"])
@@ -25,10 +26,12 @@ router = APIRouter(prefix="/category", tags=["Menu Category"])
 )
 @inject
 async def get_menu_category(
+    request: Request,
     get_menu_category_: FromDishka[GetMenuCategoryInteractor],
+    catalog_response: FromDishka[CatalogResponder],
     # category_id: Annotated[int | None, Query(alias="category_id", gt=0)] = None
 ):
-    return await get_menu_category_()
+    return await catalog_response(request, "categories", GetMenuCategoriesResponse, get_menu_category_)
 
 
 @router.get(
@@ -41,11 +44,18 @@ async def get_menu_category(
 )
 @inject
 async def get_restaurant_menu_category(
+    request: Request,
     get_restaurant_category: FromDishka[GetRestaurantMenuCategoryInteractor],
+    catalog_response: FromDishka[CatalogResponder],
     restaurant_id: int,
     # category_id: Annotated[int | None, Query(alias="category_id", gt=0)] = None
 ):
-    return await get_restaurant_category(restaurant_id)
+    return await catalog_response(
+        request,
+        ("restaurant_categories", restaurant_id),
+        GetMenuCategoriesResponse,
+        lambda: get_restaurant_category(restaurant_id)
+    )
 
 
 # TODO: добавить проверку на роль админа
@@ -0,0 +1,20 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from starlette import status
+
+from src.application.interfaces.transaction_manager import TransactionPolicy
+from src.infrastructure.metrics import REGISTRY
+from src.middlewares.transaction_middleware import transaction_policy
+
+
+router = APIRouter(tags=["Metrics"])
+
+@router.get(
+    "/metrics",
+    status_code=status.HTTP_200_OK,
+    response_class=PlainTextResponse,
+    include_in_schema=False,
+)
+@transaction_policy(TransactionPolicy.NONE) # метрики процесса, БД не нужна
+async def get_metrics():
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
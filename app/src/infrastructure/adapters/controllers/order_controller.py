@@ -1,12 +1,16 @@
+from typing import Annotated
+
 from dishka import FromDishka
 from dishka.integrations.fastapi import inject
-from fastapi import APIRouter, Request
+from fastapi import APIRouter, Query, Request
 from starlette import status
 
 from src.domain.enums.enums import OrderStatus
+from src.application.interfaces.transaction_manager import TransactionPolicy
+from src.middlewares.transaction_middleware import transaction_policy
 from src.application.interfaces.interactors.auth_interactor import GetCurrentUserInteractor
-from src.application.interfaces.interactors.order_interactor import AddOrderInteractor, GetUserOrdersInteractor#, UpdateOrderStatusInteractor
-from src.domain.dto.order_dto import GetOrderResponse, OrderRequest, CreateOrderResponse
+from src.application.interfaces.interactors.order_interactor import AddOrderInteractor, GetUserOrdersInteractor, QuoteOrderInteractor#, UpdateOrderStatusInteractor
+from src.domain.dto.order_dto import GetOrderResponse, OrderQuoteRequest, OrderQuoteResponse, OrderRequest, CreateOrderResponse
 
 
 router = APIRouter(prefix="/order", tags=["Order"])
@@ -19,14 +23,17 @@ router = APIRouter(prefix="/order", tags=["Order"])
         status.HTTP_404_NOT_FOUND: {"error": "Can't get user orders."},
     },
 )
+@transaction_policy(TransactionPolicy.READ_ONLY)
 @inject
 async def get_user_orders(
     user: FromDishka[GetCurrentUserInteractor],
     get_orders: FromDishka[GetUserOrdersInteractor],
-    request: Request
+    request: Request,
+    after: Annotated[str | None, Query(alias="after")] = None,
+    limit: Annotated[int, Query(alias="limit", ge=1, le=100)] = 20,
 ):
     user_dto = await user(request)
-    return await get_orders(user_dto.id)
+    return await get_orders(user_dto.id, limit, after)
 
 
 @router.post(
@@ -37,6 +44,9 @@ async def get_user_orders(
         status.HTTP_400_BAD_REQUEST: {"error": "Order haven't been created."},
     },
 )
+# Заказ проверяется по таблице цен в памяти, а дальше только INSERT:
+# снимок REPEATABLE READ не нужен, соединение берется уже после проверки
+@transaction_policy(TransactionPolicy.LAZY)
 @inject
 async def add_order(
     order_request: OrderRequest,
@@ -48,6 +58,20 @@ async def add_order(
     return await add_order(order_request, user_dto)
 
 
+@router.post(
+    "/quote",
+    status_code=status.HTTP_200_OK,
+    response_model=OrderQuoteResponse,
+)
+@transaction_policy(TransactionPolicy.NONE) # цены из таблицы в памяти, сессия запроса не нужна
+@inject
+async def quote_order(
+    quote_request: OrderQuoteRequest,
+    quote_order: FromDishka[QuoteOrderInteractor],
+):
+    return await quote_order(quote_request)
+
+
 # @router.post(
 #     "/{order_id}/status",
 #     status_code=status.HTTP_200_OK,
@@ -1,21 +1,32 @@
+from datetime import datetime, timezone
+from typing import Annotated
+
 from dishka import FromDishka
 from dishka.integrations.fastapi import inject
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Request
 from starlette import status
 
 from src.logger import logger
+from src.application.interfaces.transaction_manager import TransactionPolicy
+from src.middlewares.transaction_middleware import transaction_policy
+from src.infrastructure.adapters.cache.catalog_responder import CatalogResponder
+from src.application.interfaces.cache.restaurant_schedules import IRestaurantSchedules
+from src.application.interfaces.cache.restaurant_locations import MAX_LATITUDE
 from src.domain.dto.restaurant_dto import (
     AddRestaurantRequest,
     AddRestaurantResponse,
     DeleteRestaurantResponse,
     GetCityRestaurantsResponse,
+    GetNearestRestaurantsResponse,
     GetRestaurantResponse,
+    RestaurantActionEnum,
     UpdateRestaurantRequest,
 )
 from src.application.interfaces.interactors.restaurant_interactor import (
     UpdateRestaurantInteractor,
     DeleteRestaurantInteractor,
     GetCityRestaurantsInteractor,
+    GetNearestRestaurantsInteractor,
     CreateRestaurantInteractor,
     GetRestaurantInteractor,
 )
@@ -24,6 +35,25 @@ from src.application.interfaces.interactors.restaurant_interactor import (
 router = APIRouter(prefix="/restaurant", tags=["Restaurant"])
 
 
+# Объявлен раньше /{restaurant_id}, иначе "nearest" разбирается как id
+@router.get(
+    "/nearest",
+    status_code=status.HTTP_200_OK,
+    response_model=GetNearestRestaurantsResponse,
+)
+@transaction_policy(TransactionPolicy.NONE) # сетка координат в памяти, сессия запроса не нужна
+@inject
+async def get_nearest_restaurants(
+    get_nearest_restaurants: FromDishka[GetNearestRestaurantsInteractor],
+    lat: Annotated[float, Query(alias="lat", ge=-MAX_LATITUDE, le=MAX_LATITUDE)],
+    lon: Annotated[float, Query(alias="lon", ge=-180, le=180)],
+    action: Annotated[RestaurantActionEnum | None, Query(alias="action")] = None,
+    limit: Annotated[int, Query(alias="limit", ge=1, le=20)] = 5,
+    radius_km: Annotated[float, Query(alias="radius_km", gt=0, le=100)] = 30,
+):
+    return await get_nearest_restaurants(lat, lon, action, limit, radius_km)
+
+
 @router.get(
     "/{restaurant_id}",
     status_code=status.HTTP_200_OK,
@@ -50,10 +80,26 @@ async def get_restaurant_by_id(
 )
 @inject
 async def get_restaurant_by_city_id(
+    request: Request,
     city_id: int,
-    get_city_restaurants: FromDishka[GetCityRestaurantsInteractor]
+    get_city_restaurants: FromDishka[GetCityRestaurantsInteractor],
+    catalog_response: FromDishka[CatalogResponder],
+    schedules: FromDishka[IRestaurantSchedules],
 ):
-    return await get_city_restaurants(city_id)
+    # is_open в ответе зависит от времени: ключ кэша меняется, когда
+    # открывается или закрывается любой ресторан, либо меняются часы работы
+    snapshot = await schedules.get_snapshot()
+    moment = datetime.now(timezone.utc)
+    minute = schedules.minute_of_week(moment)
+    # Клиенты и nginx не должны хранить ответ дольше, чем до следующего открытия или закрытия
+    minutes_left = snapshot.minutes_until_change(minute)
+    return await catalog_response(
+        request,
+        ("city_restaurants", city_id, snapshot.version, snapshot.period(minute)),
+        GetCityRestaurantsResponse,
+        lambda: get_city_restaurants(city_id, minute),
+        max_age_seconds=None if minutes_left is None else minutes_left * 60 - moment.second,
+    )
 
 
 # TODO: нужна проверка на роль админа
@@ -0,0 +1,33 @@
+from typing import Annotated
+
+from dishka import FromDishka
+from dishka.integrations.fastapi import inject
+from fastapi import APIRouter, Query
+from starlette import status
+
+from src.application.interfaces.transaction_manager import TransactionPolicy
+from src.middlewares.transaction_middleware import transaction_policy
+from src.domain.dto.search_dto import SearchResponse
+from src.application.interfaces.interactors.search_interactor import SearchMenuInteractor
+
+
+router = APIRouter(prefix="/search", tags=["Search"])
+
+
+@router.get(
+    "",
+    status_code=status.HTTP_200_OK,
+    response_model=SearchResponse,
+    responses={
+        status.HTTP_404_NOT_FOUND: {"error": "Restaurant not found."},
+    },
+)
+@transaction_policy(TransactionPolicy.NONE) # индекс меню в памяти, сессия запроса не нужна
+@inject
+async def search_menu(
+    search: FromDishka[SearchMenuInteractor],
+    q: Annotated[str, Query(alias="q", min_length=1, max_length=100)],
+    restaurant_id: Annotated[int | None, Query(alias="restaurant_id", gt=0)] = None,
+    limit: Annotated[int, Query(alias="limit", ge=1, le=50)] = 20,
+):
+    return await search(q, restaurant_id, limit)
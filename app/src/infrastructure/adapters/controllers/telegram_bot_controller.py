@@ -3,6 +3,8 @@ from dishka.integrations.fastapi import inject
 from fastapi import APIRouter, Request
 from starlette import status
 
+from src.application.interfaces.transaction_manager import TransactionPolicy
+from src.middlewares.transaction_middleware import transaction_policy
 from src.application.interfaces.interactors.telegram_bot_interactor import SendOrderToTelegramInteractor, UpdateOrderInTelegramInteractor
 from src.domain.dto.telegram_dto import SendOrderInfo, TelegramResponse, UpdateOrderInfo
 
@@ -17,6 +19,7 @@ router = APIRouter(prefix="/notifications", tags=["TelegramBot"])
         status.HTTP_400_BAD_REQUEST: {"error": "Can't create order message."},
     },
 )
+@transaction_policy(TransactionPolicy.LAZY) # бот только читает данные ресторана
 @inject
 async def send_order_to_telegram(
     order_info: SendOrderInfo,
@@ -32,6 +35,7 @@ async def send_order_to_telegram(
         status.HTTP_400_BAD_REQUEST: {"error": "Can't update order message."},
     },
 )
+@transaction_policy(TransactionPolicy.LAZY) # бот только читает данные ресторана
 @inject
 async def send_order_to_telegram(
     order_info: UpdateOrderInfo,
@@ -0,0 +1,63 @@
+import asyncio
+from hmac import compare_digest
+
+from dishka import FromDishka
+from dishka.integrations.fastapi import inject
+from fastapi import APIRouter, Request, Response
+from starlette import status
+from telegram import Update
+from telegram.ext import Application
+
+from src.application.interfaces.transaction_manager import TransactionPolicy
+from src.config import Config
+from src.infrastructure.exceptions import InvalidUpdateError, UpdateQueueFullError, WebhookSecretError
+from src.middlewares.transaction_middleware import transaction_policy
+
+
+SECRET_TOKEN_HEADER = "X-Telegram-Bot-Api-Secret-Token"
+
+router = APIRouter(prefix="/telegram", tags=["TelegramBot"])
+
+@router.post(
+    "/webhook",
+    status_code=status.HTTP_200_OK,
+    include_in_schema=False,
+    responses={
+        status.HTTP_400_BAD_REQUEST: {"error": "Malformed update."},
+        status.HTTP_403_FORBIDDEN: {"error": "Invalid webhook secret."},
+        status.HTTP_503_SERVICE_UNAVAILABLE: {"error": "Update queue is full."},
+    },
+)
+@transaction_policy(TransactionPolicy.NONE) # обработчики бота открывают свои сессии
+@inject
+async def telegram_webhook(
+    request: Request,
+    telegram_app: FromDishka[Application],
+    config: FromDishka[Config],
+):
+    secret = config.bot.bot_webhook_secret
+    token = request.headers.get(SECRET_TOKEN_HEADER, "")
+    if secret is None or not compare_digest(token, secret.get_secret_value()):
+        raise WebhookSecretError()
+
+    # Битый JSON или не объект - ошибка клиента, а не 500
+    try:
+        data = await request.json()
+    except ValueError:
+        raise InvalidUpdateError()
+    if not isinstance(data, dict):
+        raise InvalidUpdateError()
+
+    try:
+        update = Update.de_json(data, telegram_app.bot)
+    except (AttributeError, KeyError, TypeError, ValueError):
+        raise InvalidUpdateError()
+
+    # Обработка идет в фоне (Application.start разбирает update_queue),
+    # Telegram получает ответ сразу
+    try:
+        telegram_app.update_queue.put_nowait(update)
+    except asyncio.QueueFull:
+        raise UpdateQueueFullError()
+
+    return Response(status_code=status.HTTP_200_OK)
@@ -1,19 +1,35 @@
+from time import perf_counter
 from typing import List
+import asyncio
 import json
 
 import aiohttp
-from aiohttp import ClientError, ClientSession, ServerConnectionError
+from aiohttp import ClientError, ClientSession, ClientTimeout, ServerConnectionError
 
 from src.application.interfaces.notification.http_notifier import IHTTPOrderNotifier
 from src.domain.enums.enums import OrderAction
 from src.config import Config
+from src.infrastructure.exceptions import BotNotificationError
+from src.infrastructure.metrics import REGISTRY
 from src.logger import logger
 
 
+BOT_REQUEST_SECONDS = REGISTRY.histogram(
+    "bot_notifier_request_seconds",
+    "Latency of HTTP calls from the backend to the bot service",
+    ("method", "result"),
+)
+
+
 class HttpOrderNotifier(IHTTPOrderNotifier):
     def __init__(self, session: ClientSession, config: Config):
         self._session = session
         self._config = config
+        # Бот недоступен - заказ все равно создан, ждать дольше нет смысла
+        self._timeout = ClientTimeout(
+            total=config.bot.bot_http_timeout_seconds,
+            connect=config.bot.bot_http_connect_timeout_seconds,
+        )
 
     async def send_order_info_to_bot(
         self,
@@ -23,7 +39,10 @@ class HttpOrderNotifier(IHTTPOrderNotifier):
         current_status: str,
         action: OrderAction
     ) -> None:
-        """Отправляет уведомление о новом заказе в сервис бота через HTTP"""
+        """Отправляет уведомление о новом заказе в сервис бота через HTTP.
+
+        Ошибки не глотаются: уведомление остается в order_outbox и будет отправлено повторно.
+        """
         payload = {
             "restaurant_id": restaurant_id,
             "order_id": order_id,
@@ -32,18 +51,22 @@ class HttpOrderNotifier(IHTTPOrderNotifier):
             "action": action.value
         }
 
+        started = perf_counter()
+        result = "error"
         try:
             async with self._session.post(
                 f"{self._config.bot.get_bot_app_url}/bot/notifications/order",
                 json=payload,
-                headers={"Content-Type": "application/json"}
+                headers={"Content-Type": "application/json"},
+                timeout=self._timeout,
             ) as response:
                 if response.status != 201:
-                    logger.warning(f"Failed to send notification: {response.status}")
-        except Exception as e:
-            logger.error(f"Error sending HTTP notification: {e}")
-
-        return {'success': True}
+                    raise BotNotificationError(f"status {response.status}")
+                result = "ok"
+        except (ClientError, asyncio.TimeoutError) as e:
+            raise BotNotificationError(repr(e)) from e
+        finally:
+            BOT_REQUEST_SECONDS.observe(perf_counter() - started, method="send_order", result=result)
 
 
     async def update_order_message(
@@ -65,15 +88,22 @@ class HttpOrderNotifier(IHTTPOrderNotifier):
             "action": action.value
         }
 
+        started = perf_counter()
+        result = "error"
         try:
             async with self._session.post(
                 f"{self._config.bot.get_bot_app_url}/bot/notifications/order/update",
                 json=payload,
-                headers={"Content-Type": "application/json"}
+                headers={"Content-Type": "application/json"},
+                timeout=self._timeout,
             ) as response:
                 if response.status != 200:
                     logger.warning(f"Failed to update notification: {response.status}")
+                else:
+                    result = "ok"
         except Exception as e:
             logger.error(f"Error updating HTTP notification: {e}")
+        finally:
+            BOT_REQUEST_SECONDS.observe(perf_counter() - started, method="update_order", result=result)
         
         return {'success': True}
@@ -0,0 +1,124 @@
+import asyncio
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.application.interfaces.notification.http_notifier import IHTTPOrderNotifier
+from src.config import OutboxConfig
+from src.domain.enums.enums import OrderAction
+from src.infrastructure.adapters.repositories.order_outbox_repository import OrderOutboxRepository
+from src.infrastructure.drivers.db.tables import OrderOutbox
+from src.logger import logger
+
+
+class OrderOutboxDispatcher:
+    """Фоновая отправка уведомлений из order_outbox в сервис бота.
+
+    Работает в каждом воркере API: строки забираются в аренду через
+    FOR UPDATE SKIP LOCKED в короткой транзакции, поэтому воркеры не
+    отправляют одно уведомление дважды, а соединение с БД не занято на
+    время отправки. Неудачные попытки откладываются с экспоненциальной
+    задержкой и не удаляются, пока бот не примет заказ.
+    """
+
+    def __init__(
+        self,
+        session_maker: async_sessionmaker[AsyncSession],
+        notifier: IHTTPOrderNotifier,
+        config: OutboxConfig,
+    ) -> None:
+        self._session_maker = session_maker
+        self._notifier = notifier
+        self._config = config
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def wake(self) -> None:
+        """Новый заказ закоммичен - не ждем следующего опроса"""
+        self._wakeup.set()
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            self._wakeup.clear()
+            try:
+                processed = await self.dispatch_batch()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Order outbox dispatch failed: {e}")
+                processed = 0
+
+            # Полная пачка - вероятно, есть еще, берем сразу
+            if processed >= self._config.outbox_batch_size:
+                continue
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self._config.outbox_poll_interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+
+    async def dispatch_batch(self) -> int:
+        """Отправляет одну пачку готовых к отправке уведомлений, возвращает их число"""
+        # Короткая транзакция: забрали строки в аренду и сразу вернули соединение в пул
+        async with self._session_maker() as session:
+            async with session.begin():
+                entries = await OrderOutboxRepository(session).claim_due(
+                    self._config.outbox_batch_size,
+                    self._config.outbox_lease_seconds,
+                )
+        if not entries:
+            return 0
+
+        # Отправка в бота идет без транзакции и без соединения с БД
+        results = await asyncio.gather(
+            *(self._send(entry) for entry in entries),
+            return_exceptions=True,
+        )
+
+        async with self._session_maker() as session:
+            async with session.begin():
+                repository = OrderOutboxRepository(session)
+                sent_ids = []
+                for entry, result in zip(entries, results):
+                    if isinstance(result, Exception):
+                        delay = self._retry_delay(entry.attempts)
+                        logger.warning(
+                            f"Order {entry.order_id} notification failed "
+                            f"(attempt {entry.attempts + 1}), retry in {delay:.0f}s: {result}"
+                        )
+                        await repository.reschedule(entry.id, str(result), delay)
+                    else:
+                        sent_ids.append(entry.id)
+
+                await repository.delete(sent_ids)
+
+        return len(entries)
+
+    async def _send(self, entry: OrderOutbox) -> None:
+        payload = entry.payload
+        await self._notifier.send_order_info_to_bot(
+            payload["restaurant_id"],
+            payload["order_id"],
+            payload["message_text"],
+            payload["current_status"],
+            OrderAction(payload["action"]),
+        )
+
+    def _retry_delay(self, attempts: int) -> float:
+        delay = self._config.outbox_retry_base_seconds * 2 ** min(attempts, 16)
+        return min(delay, self._config.outbox_retry_max_seconds)
@@ -1,4 +1,5 @@
 from datetime import datetime, timedelta, timezone
+from uuid import uuid4
 from typing import List, Optional
 
 from sqlalchemy import select, or_, update
@@ -11,13 +12,16 @@ from src.infrastructure.exceptions import InvalidCredentialsError, UserExistsErr
 from src.domain.dto.auth_dto import CreateUser, LoginUserRequest, LogInDTO, UserLogInDTO
 from src.logger import logger
 from src.application.interfaces.repositories.auth_repository import IAuthRepository
+from src.application.interfaces.password_hasher import IPasswordHasher
 from src.infrastructure.drivers.db.tables import RefreshToken, User
+from src.infrastructure.drivers.db.notifications import USER_CHANGED_CHANNEL, notify
 from src.config import Config, TokenConfig
 
 
 class AuthRepository(IAuthRepository):
-    def __init__(self, session: AsyncSession) -> None:
+    def __init__(self, session: AsyncSession, password_hasher: IPasswordHasher) -> None:
         self._session = session
+        self._password_hasher = password_hasher
 
 
     async def get_user_by_phone(self, phone: str) -> Optional[User]:
@@ -28,25 +32,35 @@ class AuthRepository(IAuthRepository):
         return user
 
 
+    async def get_user_by_id(self, user_id: int) -> Optional[User]:
+        return await self._session.get(User, user_id)
+
+
     async def register_user(
         self,
         created_user: CreateUser,
         config: Config,
         removed_user: Optional[User] = None
     ) -> User:
+        hashed_password = await self._password_hasher.hash(created_user.password)
+
         if removed_user:
-            removed_user.set_password(created_user.password, config.argon2)
+            removed_user.hashed_password = hashed_password
             removed_user.is_removed = False
             user = removed_user
         else:
             register_user = User(
-                phone=created_user.phone
+                phone=created_user.phone,
+                hashed_password=hashed_password
             )
-            register_user.set_password(created_user.password, config.argon2)
             self._session.add(register_user)
             user = register_user
 
         await self._session.flush()
+
+        if removed_user:
+            await notify(self._session, USER_CHANGED_CHANNEL, str(user.id))
+
         return user
 
 
@@ -59,20 +73,23 @@ class AuthRepository(IAuthRepository):
         user_result = await self._session.execute(user_query)
         user = user_result.scalars().first()
 
-        if user.is_removed:
+        if not user or user.is_removed:
+            # Argon2 все равно выполняется: по времени ответа не видно, есть ли такой телефон
+            await self._password_hasher.verify_dummy(login_user_request.password)
             raise InvalidCredentialsError # TODO: Правильно ли что будет сообщение "Неверные имя пользователя или пароль"
 
-        if not user or not user.check_password(login_user_request.password):
+        if not await self._password_hasher.verify(user.hashed_password, login_user_request.password):
             raise InvalidCredentialsError
 
-        if user.needs_rehash():
-            user.set_password(login_user_request.password, config.argon2)
+        # Хэш с устаревшими параметрами Argon2 пересчитывается при входе
+        if self._password_hasher.needs_rehash(user.hashed_password):
+            user.hashed_password = await self._password_hasher.hash(login_user_request.password)
 
         # Создание токенов
         access_token_expires = timedelta(minutes=config.token.access_token_expire_minutes)
         access_token = self._create_token(
             config.token,
-            data={"sub": user.phone.e164},
+            data={"sub": user.phone.e164, "uid": user.id},
             expires_delta=access_token_expires
         )
 
@@ -131,7 +148,7 @@ class AuthRepository(IAuthRepository):
         access_token_expires = timedelta(minutes=config.token.access_token_expire_minutes)
         access_token = self._create_token(
             config.token,
-            data={"sub": user.phone.e164},
+            data={"sub": user.phone.e164, "uid": user.id},
             expires_delta=access_token_expires
         )
         login_dto = UserLogInDTO(
@@ -184,7 +201,8 @@ class AuthRepository(IAuthRepository):
         to_encode = data.copy()
         expire = datetime.now(timezone.utc) + expires_delta
 
-        to_encode.update({"exp": expire})
+        # jti делает токены уникальными при нескольких входах в одну секунду
+        to_encode.update({"exp": expire, "jti": uuid4().hex})
         encoded_jwt = jwt.encode(to_encode, config.secret_key, algorithm=config.algorithm)
 
         return encoded_jwt
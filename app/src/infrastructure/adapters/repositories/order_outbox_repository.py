@@ -0,0 +1,63 @@
+from datetime import timedelta
+from typing import List
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.application.interfaces.repositories.order_outbox_repository import IOrderOutboxRepository
+from src.infrastructure.drivers.db.notifications import ORDER_OUTBOX_CHANNEL, notify
+from src.infrastructure.drivers.db.tables import OrderOutbox
+
+
+class OrderOutboxRepository(IOrderOutboxRepository):
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def add_order_notification(self, order_id: int, payload: dict) -> None:
+        """Пишет уведомление в транзакции заказа, диспетчер будится NOTIFY после коммита"""
+        self._session.add(OrderOutbox(order_id=order_id, payload=payload))
+        await self._session.flush()
+        await notify(self._session, ORDER_OUTBOX_CHANNEL, str(order_id))
+
+
+    async def claim_due(self, limit: int, lease_seconds: float) -> List[OrderOutbox]:
+        # SKIP LOCKED: воркеры разбирают разные строки и не ждут друг друга.
+        # Сдвинутый next_attempt_at - аренда: после коммита строку не возьмет
+        # другой воркер, пока идет отправка, а если воркер упал - возьмет после аренды
+        due = (
+            select(OrderOutbox.id)
+            .where(OrderOutbox.next_attempt_at <= func.now())
+            .order_by(OrderOutbox.next_attempt_at, OrderOutbox.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        stmt = (
+            update(OrderOutbox)
+            .where(OrderOutbox.id.in_(due))
+            .values(next_attempt_at=func.now() + timedelta(seconds=lease_seconds))
+            .returning(OrderOutbox)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self._session.scalars(stmt)
+        return result.all()
+
+
+    async def delete(self, entry_ids: List[int]) -> None:
+        if not entry_ids:
+            return
+
+        await self._session.execute(
+            delete(OrderOutbox).where(OrderOutbox.id.in_(entry_ids))
+        )
+
+
+    async def reschedule(self, entry_id: int, error: str, delay_seconds: float) -> None:
+        await self._session.execute(
+            update(OrderOutbox)
+            .where(OrderOutbox.id == entry_id)
+            .values(
+                attempts=OrderOutbox.attempts + 1,
+                last_error=error[:1000],
+                next_attempt_at=func.now() + timedelta(seconds=delay_seconds),
+            )
+        )
@@ -1,29 +1,24 @@
 from decimal import Decimal
-from math import ceil
-import random
 import string
-from typing import Dict, List, Optional, Set
+from datetime import datetime
+from typing import List, Optional, Tuple
 
-from sqlalchemy import Tuple, and_, exists, select, or_
-from sqlalchemy.orm import selectinload, contains_eager, aliased
+from sqlalchemy import Row, and_, exists, func, insert, select, or_, tuple_
+from sqlalchemy.orm import joinedload, selectinload, contains_eager, aliased
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.domain.enums.enums import OrderAction, OrderStatus
-from src.infrastructure.exceptions import OrderNotFoundError, RestaurantNotFoundError
+from src.domain.enums.enums import OrderStatus
+from src.infrastructure.exceptions import OrderNotFoundError
 from src.domain.dto.order_dto import OrderRequest
 from src.application.interfaces.repositories.order_repository import IOrderRepository
 from src.infrastructure.drivers.db.tables import (
-    Food,
-    FoodIngredientAssociation,
     FoodVariant,
     Ingredient,
     Order,
     OrderItem,
-    User,
-    Restaurant,
-    UserAddress,
     order_item_added_ingredient,
-    order_item_removed_ingredient
+    order_item_removed_ingredient,
+    order_pickup_code_seq,
 )
 
 
@@ -31,346 +26,151 @@ class OrderRepository(IOrderRepository):
     def __init__(self, session: AsyncSession) -> None:
         self._session = session
 
-    async def get_user_orders(self, user_id: int) -> List[Order]:
-        # Создаем алиасы для ингредиентов, чтобы избежать конфликта имен
-        AddedIngredient = aliased(Ingredient)
-        RemovedIngredient = aliased(Ingredient)
-
+    async def get_user_orders(
+        self,
+        user_id: int,
+        limit: int,
+        after: Optional[Tuple[datetime, int]] = None
+    ) -> List[Order]:
+        # Страница заказов по ключу (created_at, id) без OFFSET,
+        # дочерние объекты - отдельными запросами с IN по id страницы
         stmt = (
             select(Order)
-            .join(Order.restaurant)
-            .outerjoin(Order.address)
-            .join(Order.items)
-            .join(OrderItem.food_variant)
-            .join(FoodVariant.food)
-            .outerjoin(FoodVariant.characteristics)
-            # Явно указываем алиасы для JOIN с ингредиентами
-            .outerjoin(
-                OrderItem.added_ingredients.of_type(AddedIngredient)
-            )
-            .outerjoin(
-                OrderItem.removed_ingredients.of_type(RemovedIngredient)
-            )
             .options(
-                contains_eager(Order.restaurant),
-                contains_eager(Order.address),
-                contains_eager(Order.items).options(
-                    contains_eager(OrderItem.food_variant).options(
-                        contains_eager(FoodVariant.food),
-                        contains_eager(FoodVariant.characteristics),
-                    ),
-                    contains_eager(OrderItem.added_ingredients.of_type(AddedIngredient)),
-                    contains_eager(OrderItem.removed_ingredients.of_type(RemovedIngredient)),
+                joinedload(Order.restaurant),
+                joinedload(Order.address),
+                selectinload(Order.items)
+                .selectinload(OrderItem.food_variant)
+                .options(
+                    selectinload(FoodVariant.food),
+                    selectinload(FoodVariant.characteristics),
                 ),
             )
             .filter(Order.user_id == user_id)
-            .order_by(Order.created_at.desc())
+            .order_by(Order.created_at.desc(), Order.id.desc())
+            .limit(limit)
         )
 
+        if after:
+            stmt = stmt.filter(tuple_(Order.created_at, Order.id) < tuple_(*after))
+
         result = await self._session.execute(stmt)
-        orders = result.unique().scalars().all()
+        orders = result.scalars().all()
 
         return orders
 
 
-    async def create_order(
-        self,
-        order_request: OrderRequest,
-        user_id: int
-    ) -> Order:
-        address_id = order_request.user_info.address_id if order_request.user_info else None
-        restaurant_id = order_request.selected_restaurant.id
-        action = order_request.selected_restaurant.action
+    async def get_added_ingredients(self, order_item_ids: List[int]) -> List[Row]:
+        """Добавленные ингредиенты позиций с количеством, посчитанным в БД"""
+        if not order_item_ids:
+            return []
 
-        # 1. Проерка данных о ресторане
-        restaurant_stmt = (
-            select(Restaurant)
-            .filter(
-                Restaurant.id == restaurant_id
+        stmt = (
+            select(
+                order_item_added_ingredient.c.order_item_id,
+                Ingredient.name,
+                Ingredient.price,
+                func.sum(order_item_added_ingredient.c.quantity).label("quantity"),
             )
-        )
-        restaurant_result = await self._session.execute(restaurant_stmt)
-        restaurant = restaurant_result.scalars().first()
-
-        if not restaurant:
-            raise RestaurantNotFoundError(restaurant_id)
-        
-        if not self._has_action(restaurant, action):
-            raise ValueError(f"Действие {action.value} не доступно для этого ресторана")
-
-        if restaurant.address != order_request.selected_restaurant.address:
-            raise ValueError(f"Адрес {order_request.selected_restaurant.address} не совпадает с адресом ресторана")
-
-        if restaurant.phone.e164 != order_request.selected_restaurant.phone:
-            raise ValueError(f"Телефон {order_request.selected_restaurant.address} не совпадает с телефоном ресторана")
-
-        # 2. Проверяем адрес
-        if address_id:
-            address_stmt = (
-                select(UserAddress)
-                .where(
-                    UserAddress.id == address_id,
-                    UserAddress.user_id == user_id
-                )
+            .join(Ingredient, Ingredient.id == order_item_added_ingredient.c.added_id)
+            .filter(order_item_added_ingredient.c.order_item_id.in_(order_item_ids))
+            .group_by(
+                order_item_added_ingredient.c.order_item_id,
+                Ingredient.id,
+                Ingredient.name,
+                Ingredient.price,
             )
-            address_result = await self._session.execute(address_stmt)
-            delivery_address: UserAddress = address_result.scalars().first()
-
-            if not delivery_address:
-                raise ValueError(f"Адрес пользователя с id {address_id} не найден")
-
-        # 3. Собираем ID для batch-запросов
-        food_variant_ids = {position.size for position in order_request.order_list}
-        all_adding_ids = set()
-        all_remove_ids = set()
-
-        # Сопоставляем варианты еды с их ингредиентами
-        position_ingredients: Dict[int, Tuple[Set[int], Set[int]]] = {}
-
-        for position in order_request.order_list:
-            adding_ids = set(position.addings.keys() if position.addings else []) # TODO: проверить
-            remove_ids = set(position.removed_ingredients or [])
-
-            # ids_intersections = adding_ids.intersection(remove_ids)
-            # if ids_intersections:
-            #     raise ValueError(
-            #         f"Ингредиент с id {', '.join(ids_intersections)} добавлены и удалены одновременно"
-            #     )
+            .order_by(order_item_added_ingredient.c.order_item_id, Ingredient.id)
+        )
+        result = await self._session.execute(stmt)
 
-            all_adding_ids.update(adding_ids)
-            all_remove_ids.update(remove_ids)
-            position_ingredients[position.size] = (adding_ids, remove_ids)
+        return result.all()
 
 
-        # 4. Проверяем существование всех FoodVariant и загружаем их с ингредиентами
-        if not food_variant_ids:
-            raise ValueError("В заказе нет вариантов блюд")
+    async def get_removed_ingredients(self, order_item_ids: List[int]) -> List[Row]:
+        if not order_item_ids:
+            return []
 
-        food_variant_stmt = (
-            select(FoodVariant)
-            .options(
-                selectinload(FoodVariant.food)
-                .selectinload(Food.ingredient_associations),
-                selectinload(FoodVariant.characteristics)
+        stmt = (
+            select(
+                order_item_removed_ingredient.c.order_item_id,
+                Ingredient.name,
             )
-            .filter(FoodVariant.id.in_(food_variant_ids))
+            .join(Ingredient, Ingredient.id == order_item_removed_ingredient.c.removed_id)
+            .filter(order_item_removed_ingredient.c.order_item_id.in_(order_item_ids))
+            .order_by(order_item_removed_ingredient.c.order_item_id, Ingredient.id)
         )
-        food_variant_result = await self._session.execute(food_variant_stmt)
-        # Dict[FoodVariant.id, FoodVariant]
-        food_variants = {fv.id: fv for fv in food_variant_result.scalars()}
-
-        missing_food_variants = food_variant_ids - set(food_variants.keys())
-        if missing_food_variants: 
-            raise ValueError(f"Вариант блюда не найден: {missing_food_variants}")
-
-        # Проверка совпадения имен вариантов из запроса и из БД
-        for position in order_request.order_list:
-            if position.size not in food_variants:
-                raise ValueError(f"Вариант блюда с id {position.size} не найден")
-
-            if not food_variants[position.size].food.name == position.name:
-                raise ValueError(
-                    f"Вариант блюда с id {position.size} имеет разные названия: "
-                    f"{food_variants[position.size].food.name} != {position.name}"
-                )
-
-        # 5. Проверяем валидность ингредиентов для каждого варианта еды
-        invalid_ingredients = []
-
-        for position in order_request.order_list:
-            adding_ids = set(position.addings.keys() if position.addings else []) # TODO: проверить
-            remove_ids = set(position.removed_ingredients or [])
-            fv_id = position.size
-            food_variant = food_variants[position.size]
-
-            if not food_variant.food:
-                raise ValueError(f"Блюдо не найдено для варианта {fv_id}")
-
-            # Создаем маппинг ингредиентов блюда
-            food_ingredients_map = {}
-            for assoc in food_variant.food.ingredient_associations:
-                food_ingredients_map[assoc.ingredient_id] = assoc
-
-            # Проверяем добавляемые ингредиенты
-            for adding_id in adding_ids:
-                if adding_id not in food_ingredients_map:
-                    invalid_ingredients.append(f"Ингредиент {adding_id} не доступен для варианта {fv_id}")
-
-            # Проверяем удаляемые ингредиенты
-            for remove_id in remove_ids:
-                if remove_id not in food_ingredients_map:
-                    invalid_ingredients.append(f"Ингредиент {remove_id} не доступен для варианта {fv_id}")
-                else:
-                    assoc: FoodIngredientAssociation = food_ingredients_map[remove_id]
-                    if not assoc.is_default: # только дефолтные можно убрать
-                        invalid_ingredients.append(f"Ингредиент {remove_id} нельзя убрать для варианта {fv_id}")
-        
-        if invalid_ingredients:
-            raise ValueError(f"Недоступные ингредиенты: {', '.join(invalid_ingredients)}")
+        result = await self._session.execute(stmt)
 
-        # 6. Предзагружаем все нужные ингредиенты
-        ingredients_map = {}
-        all_added_removed_ingredient_ids = all_adding_ids | all_remove_ids
+        return result.all()
 
-        if all_added_removed_ingredient_ids:
-            ingredients_stmt = (
-                select(Ingredient)
-                .filter(Ingredient.id.in_(all_added_removed_ingredient_ids))
-            )
-            ingredients_result = await self._session.execute(ingredients_stmt)
-            for ingredient in ingredients_result.scalars():
-                ingredients_map[ingredient.id] = ingredient
 
-        # Проверяем, что все ингредиенты существуют
-        missing_ingredients = all_added_removed_ingredient_ids - set(ingredients_map.keys())
-        if missing_ingredients:
-            raise ValueError(f"Ингредиенты не найдены: {missing_ingredients}")
+    async def create_order(
+        self,
+        order_request: OrderRequest,
+        user_id: int
+    ) -> Order:
+        """Только запись: заказ уже проверен по таблице цен, цены позиций - актуальные"""
+        address_id = order_request.user_info.address_id if order_request.user_info else None
+        total_price = sum(position.price * position.quantity for position in order_request.order_list)
 
-        # 7. Создаем заказ
+        # 1. Создаем заказ сразу с итоговой ценой
         new_order = Order(
             user_id=user_id,
-            restaurant_id=restaurant_id,
-            address_id=address_id if address_id else None,
+            restaurant_id=order_request.selected_restaurant.id,
+            address_id=address_id,
             order_action=order_request.selected_restaurant.action,
             status=OrderStatus.CREATED,
-            total_price=0,
-            unique_code=self._generate_unique_code(),
+            total_price=total_price,
+            unique_code=await self._next_pickup_code(),
         )
         self._session.add(new_order)
         await self._session.flush()
 
-        total_price = 0
-        order_items: List[OrderItem] = []
-        total_quantity = 0
-
-        # Создаем все OrderItem
-        for position in order_request.order_list:
-            ingredients_price = 0
-
-            food_variant_obj = food_variants[position.size]
-            modifier = food_variant_obj.ingredient_price_modifier
-
-            if position.addings:
-                for adding_id, addings_amount in position.addings.items():
-                    ingredients_price += ceil(ingredients_map[adding_id].price * modifier) * addings_amount
-
-            position_clear_price = food_variant_obj.price + ingredients_price
-            if position.price != position_clear_price:
-                raise ValueError(f"Цена в запросе {position.price} не совпадает с ценой блюда и ингредиентов из БД: {position_clear_price}")
-
-            position_total_price = position_clear_price * position.quantity
-
-            total_price += position_total_price
-            total_quantity += position.quantity
-
-            new_order_item = OrderItem(
-                food_variant_id=position.size,
-                order_id=new_order.id,
-                quantity=position.quantity,
-                final_price=position_clear_price,
-            )
-            self._session.add(new_order_item)
-            order_items.append(new_order_item)
-
-        if order_request.order_quantity != total_quantity:
-            raise ValueError(f'Общее количество позиций в заказе не совпадает с количеством в заказе. Общее количество: {total_quantity}')
-
-        new_order.total_price = total_price
-        await self._session.flush()  # Ensure order items have IDs
-
-        # Add Many-to-Many relationships using async-safe approach
-        for i, position in enumerate(order_request.order_list):
-            order_item = order_items[i]
+        # 2. Все позиции одним INSERT ... RETURNING, id в порядке order_list
+        item_ids_result = await self._session.execute(
+            insert(OrderItem).returning(OrderItem.id, sort_by_parameter_order=True),
+            [
+                {
+                    "order_id": new_order.id,
+                    "food_variant_id": position.size,
+                    "quantity": position.quantity,
+                    "final_price": position.price,
+                }
+                for position in order_request.order_list
+            ],
+        )
+        order_item_ids = item_ids_result.scalars().all()
 
+        # 3. Связи с ингредиентами - по одному INSERT на таблицу
+        added_values = []
+        removed_values = []
+        for order_item_id, position in zip(order_item_ids, order_request.order_list):
             if position.addings:
-                for adding_id, addings_amount in position.addings.items():
-                    added_ingredient = ingredients_map.get(adding_id)
-                    if added_ingredient:
-                        values = [
-                            {
-                                "order_item_id": order_item.id,
-                                "added_id": added_ingredient.id
-                            }
-                            for _ in range(addings_amount)
-                        ]
-                        # Один INSERT для всех записей
-                        assoc = order_item_added_ingredient.insert().values(values)
-                        await self._session.execute(assoc)
+                added_values.extend(
+                    {
+                        "order_item_id": order_item_id,
+                        "added_id": adding_id,
+                        "quantity": addings_amount,
+                    }
+                    for adding_id, addings_amount in position.addings.items()
+                )
 
             if position.removed_ingredients:
-                for removed_id in position.removed_ingredients:
-                    removed_ingredient = ingredients_map.get(removed_id)
-                    if removed_ingredient:
-                        assoc = order_item_removed_ingredient.insert().values(
-                            order_item_id=order_item.id,
-                            removed_id=removed_ingredient.id
-                        )
-                        await self._session.execute(assoc)
-
-        data = {
-            'delivery_address': delivery_address.get_full_address() if address_id else None,
-            'delivery_price': restaurant.delivery_price,
-            'total_price': total_price,
-            'order': {},
-            'order_obj': new_order
-        }
-        order = data['order']
-
-        for item in order_request.order_list:
-            fv = food_variants[item.size]
-            food = fv.food
-
-            name = food.name
-            measure_name = food.measure_name
-
-            measure_value = ''
-            if fv.characteristics:
-                measure_value = fv.characteristics[0].measure_value
-                if not measure_value:
-                    measure_value = ''
-
-            order[name] = []
-            price = fv.price
-            modifier = fv.ingredient_price_modifier
-            quantity = item.quantity
-
-            current = {
-                'measure_name' : measure_name,
-                'measure_value' : measure_value,
-                'price' : price,
-                'modifier' : modifier,
-                'quantity' : quantity,
-                'ingredients': {
-                    'add': {},
-                    'remove': []
-                }
-            }
-            if item.addings:
-                for adding_id, addings_amount in item.addings.items():
-                    addings = current['ingredients']['add']
-                    addings[ingredients_map[adding_id].name] = {
-                        'quantity': addings_amount,
-                        'price': ceil(ingredients_map[adding_id].price * modifier)
+                removed_values.extend(
+                    {
+                        "order_item_id": order_item_id,
+                        "removed_id": removed_id,
                     }
-            if item.removed_ingredients:
-                for removed_id in item.removed_ingredients:
-                    removed = current['ingredients']['remove']
-                    removed.append(ingredients_map[removed_id].name)
-
-            order[name].append(current)
-
-        return data
-
+                    for removed_id in position.removed_ingredients
+                )
 
-    def _has_action(self, restaurant: Restaurant, restaurant_action: OrderAction) -> bool:
-        if OrderAction.DELIVERY == restaurant_action and restaurant.has_delivery:
-            return True
-        if OrderAction.INSIDE == restaurant_action and restaurant.has_dine_in:
-            return True
-        if OrderAction.TAKEAWAY == restaurant_action and restaurant.has_takeaway:
-            return True
+        if added_values:
+            await self._session.execute(order_item_added_ingredient.insert().values(added_values))
+        if removed_values:
+            await self._session.execute(order_item_removed_ingredient.insert().values(removed_values))
 
-        return False
+        return new_order
 
 
     async def update_order_status(self, order_id: int, new_status: OrderStatus) -> Order:
@@ -389,7 +189,8 @@ class OrderRepository(IOrderRepository):
         return order
 
 
-    def _generate_unique_code(self) -> str:
-        letter = random.choice(string.ascii_uppercase)
-        digits = random.randint(100, 999)
-        return f"{letter}{digits}"
+    async def _next_pickup_code(self) -> str:
+        """Код выдачи из последовательности: одна операция без блокировок и повторов"""
+        value = await self._session.scalar(select(order_pickup_code_seq.next_value()))
+        letter, digits = divmod(value, 1000)
+        return f"{string.ascii_uppercase[letter]}{digits:03d}"
@@ -6,6 +6,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from src.infrastructure.exceptions import UserNotFoundError
 from src.application.interfaces.repositories.users_repository import IUsersRepository
 from src.infrastructure.drivers.db.tables import User
+from src.infrastructure.drivers.db.notifications import USER_CHANGED_CHANNEL, notify
 from src.config import Config
 
 
@@ -40,6 +41,7 @@ class UsersRepository(IUsersRepository):
         user.is_removed = True
 
         await self._session.flush()
+        await notify(self._session, USER_CHANGED_CHANNEL, str(user.id))
         return user
 
 
@@ -47,4 +49,6 @@ class UsersRepository(IUsersRepository):
         user.is_banned = True
 
         await self._session.flush()
+        # Сбрасывает кэш авторизации в процессах API после коммита
+        await notify(self._session, USER_CHANGED_CHANNEL, str(user.id))
         return user
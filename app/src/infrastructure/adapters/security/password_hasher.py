@@ -0,0 +1,106 @@
+import asyncio
+import secrets
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+from typing import Callable, Optional, TypeVar
+
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerifyMismatchError
+
+from src.application.interfaces.password_hasher import IPasswordHasher
+from src.infrastructure.exceptions import PasswordHasherBusyError
+from src.config import ArgonConfig
+from src.infrastructure.metrics import REGISTRY
+from src.logger import logger
+
+
+T = TypeVar("T")
+
+ARGON2_SECONDS = REGISTRY.histogram(
+    "argon2_duration_seconds",
+    "Argon2 hash/verify time including wait for a pool thread",
+    ("operation",),
+)
+ARGON2_QUEUE_DEPTH = REGISTRY.gauge(
+    "argon2_queue_depth",
+    "Argon2 operations waiting for a free pool thread",
+)
+ARGON2_REJECTED_TOTAL = REGISTRY.counter(
+    "argon2_rejected_total",
+    "Argon2 operations rejected because the queue was full",
+)
+
+
+class Argon2PasswordHasher(IPasswordHasher):
+    """Argon2 в отдельном ограниченном пуле потоков.
+
+    argon2-cffi отпускает GIL на время хэширования, поэтому потоки не блокируют
+    event loop. Число одновременных операций ограничено max_workers (каждая
+    занимает argon2_memory_cost памяти), очередь ожидания - max_queue,
+    сверх нее запросы сразу отклоняются.
+    """
+
+    def __init__(self, config: ArgonConfig) -> None:
+        self._hasher = PasswordHasher(
+            time_cost=config.argon2_time_cost,
+            memory_cost=config.argon2_memory_cost,
+            parallelism=config.argon2_parallelism,
+        )
+        self._executor = ThreadPoolExecutor(
+            max_workers=config.argon2_max_workers,
+            thread_name_prefix="argon2",
+        )
+        self._max_workers = config.argon2_max_workers
+        self._max_pending = config.argon2_max_workers + config.argon2_max_queue
+        self._pending = 0
+        # Хэш случайного пароля с текущими параметрами, считается при первом входе
+        self._dummy_hash: Optional[str] = None
+        ARGON2_QUEUE_DEPTH.set_callback(lambda: self.queue_depth)
+
+    @property
+    def queue_depth(self) -> int:
+        return max(self._pending - self._max_workers, 0)
+
+    async def hash(self, password: str) -> str:
+        return await self._run("hash", self._hasher.hash, password)
+
+    async def verify(self, hashed_password: str, password: str) -> bool:
+        if not hashed_password:
+            return False
+
+        return await self._run("verify", self._verify, hashed_password, password)
+
+    async def verify_dummy(self, password: str) -> None:
+        # Вход с незарегистрированным телефоном не должен отвечать быстрее неверного пароля
+        if self._dummy_hash is None:
+            self._dummy_hash = await self.hash(secrets.token_urlsafe(16))
+        await self.verify(self._dummy_hash, password)
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        # Разбирает только параметры из строки хэша - выполняется без пула
+        return self._hasher.check_needs_rehash(hashed_password)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _verify(self, hashed_password: str, password: str) -> bool:
+        """Проверка пароля с защитой от атак по времени"""
+        try:
+            return self._hasher.verify(hashed_password, password)
+        except (VerifyMismatchError, InvalidHashError):
+            return False
+
+    async def _run(self, operation: str, func: Callable[..., T], *args) -> T:
+        if self._pending >= self._max_pending:
+            logger.warning(f"Argon2 queue is full, pending: {self._pending}")
+            ARGON2_REJECTED_TOTAL.inc()
+            raise PasswordHasherBusyError
+
+        self._pending += 1
+        started = perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, func, *args)
+        finally:
+            self._pending -= 1
+            ARGON2_SECONDS.observe(perf_counter() - started, operation=operation)
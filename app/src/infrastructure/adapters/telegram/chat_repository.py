@@ -1,10 +1,11 @@
-from typing import List, Optional
+from collections import defaultdict
+from typing import Dict, List, Optional
 from sqlalchemy import select, or_
 from sqlalchemy.orm import selectinload
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.application.interfaces.repositories.chat_repository import IChatRepository
-from src.infrastructure.drivers.db.tables import TelegramChat
+from src.infrastructure.drivers.db.tables import TelegramChat, restaurant_telegram_chat_association
 
 
 class ChatRepository(IChatRepository):
@@ -21,3 +22,18 @@ class ChatRepository(IChatRepository):
         chat_result = await self._session.execute(stmt)
         chat = chat_result.scalars().first()
         return chat
+
+
+    async def get_restaurant_chat_ids(self) -> Dict[int, List[str]]:
+        """Все привязки ресторан -> чаты одним запросом, без загрузки ресторанов"""
+        stmt = (
+            select(restaurant_telegram_chat_association.c.restaurant_id, TelegramChat.chat_id)
+            .join(TelegramChat, TelegramChat.id == restaurant_telegram_chat_association.c.chat_id)
+            .order_by(restaurant_telegram_chat_association.c.restaurant_id, TelegramChat.id)
+        )
+        result = await self._session.execute(stmt)
+
+        routes: Dict[int, List[str]] = defaultdict(list)
+        for restaurant_id, chat_id in result:
+            routes[restaurant_id].append(chat_id)
+        return dict(routes)
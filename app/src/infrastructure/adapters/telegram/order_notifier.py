@@ -1,20 +1,48 @@
-from typing import List
+import asyncio
+from datetime import timedelta
+from time import monotonic
+from typing import Awaitable, Callable, List, Union
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Bot
-from telegram.error import BadRequest
+from telegram.error import BadRequest, RetryAfter
 
 from src.domain.enums.enums import OrderAction
 from src.application.interfaces.notification.notifier import INotifier
-from src.application.interfaces.repositories.restaurant_repository import IRestaurantRepository
+from src.application.interfaces.cache.chat_routing_table import IChatRoutingTable
+from src.infrastructure.adapters.telegram.rate_limiter import TelegramRateLimiter
+from src.infrastructure.metrics import REGISTRY
+from src.logger import logger
+
+
+DELIVERY_SECONDS = REGISTRY.histogram(
+    "telegram_order_delivery_seconds",
+    "Time from fan-out start to message accepted by Telegram, per chat",
+    ("chat_id",),
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0),
+)
+MESSAGES_TOTAL = REGISTRY.counter(
+    "telegram_messages_total",
+    "Telegram send/edit attempts by result",
+    ("method", "result"),
+)
+RETRY_AFTER_TOTAL = REGISTRY.counter(
+    "telegram_retry_after_total",
+    "429 responses from Telegram",
+    ("chat_id",),
+)
 
 
 class TelegramOrderNotifier(INotifier):
     def __init__(
         self,
         bot: Bot,
-        restaurant_repository: IRestaurantRepository
+        chat_routing: IChatRoutingTable,
+        rate_limiter: TelegramRateLimiter,
+        max_retries: int,
     ) -> None:
         self._bot = bot
-        self._restaurants = restaurant_repository
+        self._chat_routing = chat_routing
+        self._limiter = rate_limiter
+        self._max_retries = max_retries
 
 
     async def send_new_order(
@@ -25,24 +53,53 @@ class TelegramOrderNotifier(INotifier):
         current_status: str,
         action: OrderAction
     ) -> None:
-        restaurant = await self._restaurants.get_restaurant_by_id(restaurant_id)
-        chats = restaurant.telegram_chats
-        if not chats:
+        chat_ids = await self._chat_routing.get_chat_ids(restaurant_id)
+        if not chat_ids:
             return
 
         keyboard = self._build_keyboard(current_status, order_id, action)
         full_text = f"{message_text}\n\nСтатус: {self._get_status_display(current_status)}"
+        started = monotonic()
 
-        for chat in chats:
+        async def deliver(chat_id: str) -> bool:
             try:
-                await self._bot.send_message(
-                    chat_id=chat.chat_id,
-                    text=full_text,
-                    reply_markup=InlineKeyboardMarkup(keyboard),
-                    parse_mode='HTML'
+                await self._deliver(
+                    chat_id,
+                    "send_message",
+                    lambda: self._bot.send_message(
+                        chat_id=chat_id,
+                        text=full_text,
+                        reply_markup=InlineKeyboardMarkup(keyboard),
+                        parse_mode='HTML'
+                    ),
                 )
             except BadRequest:
-                continue
+                return False
+            DELIVERY_SECONDS.observe(monotonic() - started, chat_id=chat_id)
+            return True
+
+        # Все чаты получают заказ параллельно, темп задает rate limiter
+        results = await asyncio.gather(
+            *(deliver(chat_id) for chat_id in chat_ids),
+            return_exceptions=True,
+        )
+
+        failures = [
+            (chat_id, result)
+            for chat_id, result in zip(chat_ids, results)
+            if isinstance(result, BaseException)
+        ]
+        if not failures:
+            return
+
+        # Повтор из outbox отправит заказ во все чаты заново: если хоть один чат
+        # его получил, повтор дал бы кухням дубли - только логируем
+        if any(result is True for result in results):
+            for chat_id, error in failures:
+                logger.error(f"Order {order_id} was not delivered to chat {chat_id}: {error}")
+            return
+
+        raise failures[0][1]
 
 
     async def update_order_message(
@@ -59,18 +116,56 @@ class TelegramOrderNotifier(INotifier):
             keyboard = self._build_keyboard(current_status, order_id, action)
             full_text = f"{message_text}\n\nСтатус: {self._get_status_display(current_status)}"
 
-            await self._bot.edit_message_text(
-                chat_id=chat_id,
-                message_id=message_id,
-                text=full_text,
-                reply_markup=InlineKeyboardMarkup(keyboard),
-                parse_mode='HTML'
+            await self._deliver(
+                chat_id,
+                "edit_message_text",
+                lambda: self._bot.edit_message_text(
+                    chat_id=chat_id,
+                    message_id=message_id,
+                    text=full_text,
+                    reply_markup=InlineKeyboardMarkup(keyboard),
+                    parse_mode='HTML'
+                ),
             )
         except BadRequest as e:
             # Если сообщение не найдено или другие ошибки
             print(f"Error updating message: {e}")
 
 
+    async def _deliver(
+        self,
+        chat_id: Union[int, str],
+        method: str,
+        call: Callable[[], Awaitable],
+    ) -> None:
+        """Вызов Bot API с учетом лимитов и повтором после 429"""
+        for attempt in range(self._max_retries + 1):
+            await self._limiter.acquire(chat_id)
+            try:
+                async with self._limiter.in_flight():
+                    await call()
+            except RetryAfter as e:
+                retry_after = e.retry_after
+                if isinstance(retry_after, timedelta):
+                    retry_after = retry_after.total_seconds()
+
+                RETRY_AFTER_TOTAL.inc(chat_id=chat_id)
+                self._limiter.pause(chat_id, retry_after)
+                if attempt == self._max_retries:
+                    MESSAGES_TOTAL.inc(method=method, result="rate_limited")
+                    raise
+                logger.warning(f"Telegram {method} to chat {chat_id} rate limited, retry in {retry_after}s")
+            except BadRequest:
+                MESSAGES_TOTAL.inc(method=method, result="rejected")
+                raise
+            except Exception:
+                MESSAGES_TOTAL.inc(method=method, result="failed")
+                raise
+            else:
+                MESSAGES_TOTAL.inc(method=method, result="sent")
+                return
+
+
     def _build_keyboard(
         self,
         status: str,
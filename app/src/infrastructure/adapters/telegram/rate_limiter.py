@@ -0,0 +1,83 @@
+import asyncio
+from contextlib import asynccontextmanager
+from time import monotonic
+from typing import AsyncIterator, Dict, Union
+
+
+class TokenBucket:
+    """Ведро токенов с резервированием.
+
+    Токены могут уходить в минус: каждый вызов reserve занимает свое место
+    в очереди и получает задержку, после которой можно отправлять.
+    """
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        self._rate = rate
+        self._capacity = capacity
+        self._tokens = capacity
+        self._updated = monotonic()
+
+    def reserve(self, now: float) -> float:
+        if now > self._updated:
+            self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+            self._updated = now
+
+        self._tokens -= 1
+        delay = self._updated - now
+        if self._tokens < 0:
+            delay += -self._tokens / self._rate
+        return delay
+
+    def pause(self, until: float) -> None:
+        """Ответ 429: до until отправок нет, после - одна, дальше по обычному темпу"""
+        if until > self._updated:
+            self._tokens = min(self._tokens, 1)
+            self._updated = until
+
+
+class TelegramRateLimiter:
+    """Общий на процесс планировщик отправки в Telegram.
+
+    Глобальное ведро ограничивает скорость бота целиком, ведро чата - скорость
+    в отдельный чат. Семафор ограничивает число одновременных запросов к API.
+    """
+
+    def __init__(
+        self,
+        global_rate_per_second: float,
+        chat_rate_per_minute: float,
+        chat_burst: int,
+        concurrency: int,
+    ) -> None:
+        self._global = TokenBucket(global_rate_per_second, global_rate_per_second)
+        self._chat_rate = chat_rate_per_minute / 60
+        self._chat_burst = chat_burst
+        # Чатов у ресторанов немного, ведра не вычищаются.
+        # Ключ - строка: в БД chat_id хранится строкой, из callback приходит числом
+        self._chats: Dict[str, TokenBucket] = {}
+        self._in_flight = asyncio.Semaphore(concurrency)
+
+    def _chat_bucket(self, chat_id: Union[int, str]) -> TokenBucket:
+        key = str(chat_id)
+        bucket = self._chats.get(key)
+        if bucket is None:
+            bucket = self._chats[key] = TokenBucket(self._chat_rate, self._chat_burst)
+        return bucket
+
+    async def acquire(self, chat_id: Union[int, str]) -> None:
+        """Ждет своей очереди сначала в чате, затем в глобальном лимите"""
+        delay = self._chat_bucket(chat_id).reserve(monotonic())
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        delay = self._global.reserve(monotonic())
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    @asynccontextmanager
+    async def in_flight(self) -> AsyncIterator[None]:
+        async with self._in_flight:
+            yield
+
+    def pause(self, chat_id: Union[int, str], seconds: float) -> None:
+        self._chat_bucket(chat_id).pause(monotonic() + seconds)
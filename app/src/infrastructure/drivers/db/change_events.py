@@ -0,0 +1,68 @@
+from itertools import chain
+from typing import Callable, Iterable, List, Set, Tuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import ORMExecuteState, Session
+
+from src.logger import logger
+
+
+_CHANGED_TABLES_KEY = "changed_tables"
+
+# (таблицы, колбэк) - колбэк вызывается после коммита, затронувшего любую из таблиц
+_subscribers: List[Tuple[Set[str], Callable[[], None]]] = []
+
+
+def subscribe_table_changes(tables: Iterable[str], callback: Callable[[], None]) -> None:
+    """Подписывает колбэк на закоммиченные изменения в указанных таблицах"""
+    _subscribers.append((set(tables), callback))
+
+
+def _pending_tables(session: Session) -> Set[str]:
+    return session.info.setdefault(_CHANGED_TABLES_KEY, set())
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_flushed_tables(session: Session, _flush_context) -> None:
+    tables = _pending_tables(session)
+
+    for obj in chain(session.new, session.dirty, session.deleted):
+        state = inspect(obj)
+        tables.add(state.mapper.local_table.name)
+
+        # M2M изменения пишутся в secondary таблицы
+        for relationship in state.mapper.relationships:
+            if relationship.secondary is None:
+                continue
+            if state.attrs[relationship.key].history.has_changes():
+                tables.add(relationship.secondary.name)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_executed_tables(orm_execute_state: ORMExecuteState) -> None:
+    # insert/update/delete по таблицам, выполненные через session.execute
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+
+    table = getattr(orm_execute_state.statement, "table", None)
+    if table is not None and hasattr(table, "name"):
+        _pending_tables(orm_execute_state.session).add(table.name)
+
+
+@event.listens_for(Session, "after_commit")
+def _notify_subscribers(session: Session) -> None:
+    tables = session.info.pop(_CHANGED_TABLES_KEY, None)
+    if not tables:
+        return
+
+    for subscribed_tables, callback in _subscribers:
+        if subscribed_tables & tables:
+            try:
+                callback()
+            except Exception as e:
+                logger.error(f"Table change callback failed: {e}")
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changes(session: Session) -> None:
+    session.info.pop(_CHANGED_TABLES_KEY, None)
@@ -2,16 +2,19 @@ from sqlalchemy.ext.asyncio import AsyncEngine
 from sqlalchemy.ext.asyncio import create_async_engine
 
 from src.config import PostgresConfig
+from src.infrastructure.drivers.db.instrumentation import InstrumentedAsyncQueuePool, instrument_engine
 
 
 def create_engine(postgres_config: PostgresConfig) -> AsyncEngine:
-    return create_async_engine(
+    engine = create_async_engine(
         url=postgres_config.build_dsn(),
         echo=postgres_config.debug,
-        pool_size=10,
-        max_overflow=10,
-        pool_timeout=30,
+        pool_size=postgres_config.pool_size,
+        max_overflow=postgres_config.max_overflow,
+        pool_timeout=postgres_config.pool_timeout,
         pool_recycle=1800,
         pool_pre_ping=True,
         pool_use_lifo=True,
+        poolclass=InstrumentedAsyncQueuePool,
     )
+    return instrument_engine(engine)
@@ -0,0 +1,116 @@
+from contextvars import ContextVar
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from src.infrastructure.metrics import REGISTRY
+
+
+QUERY_COUNT_BUCKETS = (1, 2, 3, 5, 8, 13, 21, 34, 55, 100, 200)
+
+DB_QUERIES_TOTAL = REGISTRY.counter(
+    "db_queries_total",
+    "SQL statements executed by the process",
+)
+DB_POOL_WAIT_SECONDS = REGISTRY.histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a connection from the pool",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+)
+DB_CONNECTION_HOLD_SECONDS = REGISTRY.histogram(
+    "db_connection_hold_seconds",
+    "Time a connection stays checked out of the pool",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0),
+)
+# Снимаются с пула последнего подключенного engine - в приложении он один
+DB_POOL_CHECKED_OUT = REGISTRY.gauge(
+    "db_pool_checked_out",
+    "Connections currently checked out of the pool",
+)
+DB_POOL_CAPACITY = REGISTRY.gauge(
+    "db_pool_capacity",
+    "Maximum connections of the pool (pool_size + max_overflow)",
+)
+
+
+@dataclass
+class RequestStats:
+    """Счетчики БД текущего HTTP-запроса, заполняются событиями engine"""
+    queries: int = 0
+    db_seconds: float = 0.0
+    pool_wait_seconds: float = 0.0
+
+
+request_stats_var: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+_QUERY_STARTED_KEY = "query_started"
+_CHECKED_OUT_AT_KEY = "checked_out_at"
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """Пул, измеряющий ожидание соединения (у событий пула нет начала checkout)"""
+
+    def capacity(self) -> int:
+        return self.size() + self._max_overflow
+
+    def _do_get(self):
+        started = perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            elapsed = perf_counter() - started
+            DB_POOL_WAIT_SECONDS.observe(elapsed)
+            stats = request_stats_var.get()
+            if stats is not None:
+                stats.pool_wait_seconds += elapsed
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault(_QUERY_STARTED_KEY, []).append(perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    started = conn.info[_QUERY_STARTED_KEY].pop()
+    DB_QUERIES_TOTAL.inc()
+
+    stats = request_stats_var.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_seconds += perf_counter() - started
+
+
+def _handle_error(exception_context) -> None:
+    # after_cursor_execute для упавшего запроса не вызывается
+    connection = exception_context.connection
+    if connection is not None and connection.info.get(_QUERY_STARTED_KEY):
+        connection.info[_QUERY_STARTED_KEY].pop()
+
+
+def _checkout(dbapi_connection, connection_record, connection_proxy) -> None:
+    connection_record.info[_CHECKED_OUT_AT_KEY] = perf_counter()
+
+
+def _checkin(dbapi_connection, connection_record) -> None:
+    checked_out_at = connection_record.info.pop(_CHECKED_OUT_AT_KEY, None)
+    if checked_out_at is not None:
+        DB_CONNECTION_HOLD_SECONDS.observe(perf_counter() - checked_out_at)
+
+
+def instrument_engine(engine: AsyncEngine) -> AsyncEngine:
+    """Подключает подсчет запросов и времени БД к engine"""
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine.sync_engine, "handle_error", _handle_error)
+
+    pool = engine.sync_engine.pool
+    # Сколько соединение занято запросом: от выдачи из пула до возврата
+    event.listen(pool, "checkout", _checkout)
+    event.listen(pool, "checkin", _checkin)
+    if isinstance(pool, InstrumentedAsyncQueuePool):
+        DB_POOL_CHECKED_OUT.set_callback(pool.checkedout)
+        DB_POOL_CAPACITY.set_callback(pool.capacity)
+    return engine
@@ -0,0 +1,94 @@
+import asyncio
+from typing import Callable, Dict, Optional, Tuple
+
+import psycopg
+from psycopg import sql
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.logger import logger
+
+
+# Пользователь забанен, удален или восстановлен; payload - id пользователя
+USER_CHANGED_CHANNEL = "user_changed"
+# В order_outbox появилось уведомление; payload - id заказа
+ORDER_OUTBOX_CHANNEL = "order_outbox"
+# Изменились чаты Telegram или их привязка к ресторанам (триггер в БД)
+TELEGRAM_ROUTING_CHANNEL = "telegram_routing_changed"
+# Изменились блюда, варианты или ингредиенты (триггер в БД); payload - имя таблицы
+PRICE_TABLE_CHANNEL = "price_table_changed"
+# Изменились часы работы ресторанов (триггер в БД); payload - имя таблицы
+RESTAURANT_SCHEDULE_CHANNEL = "restaurant_schedule_changed"
+# Изменились рестораны: координаты, типы заказа, активность (триггер в БД); payload - имя таблицы
+RESTAURANT_LOCATIONS_CHANNEL = "restaurant_locations_changed"
+# Изменились блюда, их состав или доступность в ресторанах (триггер в БД); payload - имя таблицы
+MENU_SEARCH_CHANNEL = "menu_search_changed"
+
+
+async def notify(session: AsyncSession, channel: str, payload: str) -> None:
+    """NOTIFY в текущей транзакции: слушатели получат его только после коммита"""
+    await session.execute(select(func.pg_notify(channel, payload)))
+
+
+class PgListener:
+    """Слушает NOTIFY Postgres на отдельном соединении вне пула SQLAlchemy.
+
+    Нужен для сброса кэшей между процессами: API и бот работают
+    с одной БД, но не делят память.
+    """
+
+    def __init__(self, conninfo: str, reconnect_delay_seconds: float = 5.0) -> None:
+        self._conninfo = conninfo
+        self._reconnect_delay_seconds = reconnect_delay_seconds
+        # channel -> (обработчик payload, обработчик переподключения)
+        self._subscriptions: Dict[str, Tuple[Callable[[str], None], Optional[Callable[[], None]]]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def subscribe(
+        self,
+        channel: str,
+        callback: Callable[[str], None],
+        on_reconnect: Optional[Callable[[], None]] = None
+    ) -> None:
+        """Регистрирует обработчик канала, вызывается до start()"""
+        self._subscriptions[channel] = (callback, on_reconnect)
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                async with await psycopg.AsyncConnection.connect(self._conninfo, autocommit=True) as connection:
+                    for channel, (_, on_reconnect) in self._subscriptions.items():
+                        await connection.execute(sql.SQL("LISTEN {}").format(sql.Identifier(channel)))
+                        # Пока соединения не было, уведомления могли потеряться
+                        if on_reconnect:
+                            on_reconnect()
+
+                    logger.info(f"Listening Postgres channels: {', '.join(self._subscriptions)}")
+
+                    async for notification in connection.notifies():
+                        callback, _ = self._subscriptions[notification.channel]
+                        try:
+                            callback(notification.payload)
+                        except Exception as e:
+                            logger.error(f"Notification handler failed: {e}")
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Postgres listener disconnected: {e}")
+                await asyncio.sleep(self._reconnect_delay_seconds)
@@ -3,27 +3,28 @@ from typing import Optional
 
 from sqlalchemy import (
     Column,
+    Index,
     Integer,
+    JSON,
     String,
     ForeignKey,
     Table,
     Boolean,
     DateTime,
     Numeric,
+    Sequence,
     SmallInteger,
     Time,
+    text,
 )
 from sqlalchemy import Enum as SQLEnum
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 from sqlalchemy.sql import func
 from sqlalchemy_utils import PhoneNumberType, EmailType
-from argon2 import PasswordHasher
-from argon2.exceptions import VerifyMismatchError, InvalidHashError
 
 from src.domain.enums.enums import OrderAction
 from src.domain.enums.enums import OrderStatus
 from src.infrastructure.drivers.db.base import Base
-from src.config import ArgonConfig
 
 
 # Для добавленных ингредиентов
@@ -32,6 +33,10 @@ order_item_added_ingredient = Table(
     Base.metadata,
     Column("order_item_id", Integer, ForeignKey("order_item.id", ondelete="CASCADE")),
     Column("added_id", Integer, ForeignKey("ingredient.id", ondelete="CASCADE")),
+    # Одна строка на ингредиент позиции вместо повтора строки quantity раз
+    Column("quantity", Integer, nullable=False, default=1, server_default="1"),
+    Index("ix_order_item_added_ingredient_order_item_id", "order_item_id", "added_id"),
+    Index("ix_order_item_added_ingredient_added_id", "added_id"),
 )
 
 # Для удаленных ингредиентов
@@ -40,6 +45,8 @@ order_item_removed_ingredient = Table(
     Base.metadata,
     Column("order_item_id", Integer, ForeignKey("order_item.id", ondelete="CASCADE")),
     Column("removed_id", Integer, ForeignKey("ingredient.id", ondelete="CASCADE")),
+    Index("ix_order_item_removed_ingredient_order_item_id", "order_item_id", "removed_id"),
+    Index("ix_order_item_removed_ingredient_removed_id", "removed_id"),
 )
 
 # Связь многие-ко-многим для категорий ресторана
@@ -48,6 +55,8 @@ restaurant_category_association = Table(
     Base.metadata,
     Column("restaurant_id", Integer, ForeignKey("restaurant.id", ondelete="CASCADE")),
     Column("category_id", Integer, ForeignKey("menu_category.id", ondelete="CASCADE")),
+    Index("ix_restaurant_category_restaurant_id", "restaurant_id", "category_id"),
+    Index("ix_restaurant_category_category_id", "category_id", "restaurant_id"),
 )
 
 # Связь многие-ко-многим для любимых блюд
@@ -56,6 +65,8 @@ user_favorite_association = Table(
     Base.metadata,
     Column("user_id", Integer, ForeignKey("user.id", ondelete="CASCADE")),
     Column("food_id", Integer, ForeignKey("food.id", ondelete="CASCADE")),
+    Index("ix_user_favorite_user_id", "user_id", "food_id"),
+    Index("ix_user_favorite_food_id", "food_id"),
 )
 
 restaurant_feature_association = Table(
@@ -63,6 +74,8 @@ restaurant_feature_association = Table(
     Base.metadata,
     Column("restaurant_id", Integer, ForeignKey("restaurant.id", ondelete="CASCADE")),
     Column("feature_id", Integer, ForeignKey("feature.id", ondelete="CASCADE")),
+    Index("ix_restaurant_feature_restaurant_id", "restaurant_id", "feature_id"),
+    Index("ix_restaurant_feature_feature_id", "feature_id"),
 )
 
 # Связь многие-ко-многим для ресторанов и телеграм-чатов
@@ -71,6 +84,8 @@ restaurant_telegram_chat_association = Table(
     Base.metadata,
     Column("restaurant_id", Integer, ForeignKey("restaurant.id", ondelete="CASCADE")),
     Column("chat_id", Integer, ForeignKey("telegram_chat.id", ondelete="CASCADE")),
+    Index("ix_restaurant_telegram_chat_restaurant_id", "restaurant_id", "chat_id"),
+    Index("ix_restaurant_telegram_chat_chat_id", "chat_id", "restaurant_id"),
 )
 
 # Таблица для отключения блюд
@@ -79,6 +94,8 @@ restaurant_food_disabled = Table(
     Base.metadata,
     Column("restaurant_id", Integer, ForeignKey("restaurant.id", ondelete="CASCADE")),
     Column("food_id", Integer, ForeignKey("food.id", ondelete="CASCADE")),
+    Index("ix_restaurant_food_disabled_restaurant_id", "restaurant_id", "food_id"),
+    Index("ix_restaurant_food_disabled_food_id", "food_id"),
 )
 
 
@@ -91,6 +108,8 @@ food_characteristic_variant_association = Table(
         ForeignKey("food_characteristic.id", ondelete="CASCADE"),
     ),
     Column("variant_id", Integer, ForeignKey("food_variant.id", ondelete="CASCADE")),
+    Index("ix_food_characteristic_variant_variant_id", "variant_id", "characteristic_id"),
+    Index("ix_food_characteristic_variant_characteristic_id", "characteristic_id"),
 )
 
 
@@ -124,6 +143,9 @@ class Feature(Base):
 
 class WorkingHours(Base):
     __tablename__ = "working_hours"
+    __table_args__ = (
+        Index("ix_working_hours_restaurant_id_day_of_week", "restaurant_id", "day_of_week"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     restaurant_id: Mapped[int] = mapped_column(
@@ -145,6 +167,10 @@ class WorkingHours(Base):
 
 class Restaurant(Base):
     __tablename__ = "restaurant"
+    __table_args__ = (
+        # Рестораны города: выбираются только активные
+        Index("ix_restaurant_city_id_active", "city_id", postgresql_where=text("is_active")),
+    )
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     city_id: Mapped[int] = mapped_column(ForeignKey("city.id", ondelete="CASCADE"))
     name: Mapped[str] = mapped_column(String(500), nullable=False)
@@ -228,6 +254,9 @@ class MenuCategory(Base):
 
 class Food(Base):
     __tablename__ = "food"
+    __table_args__ = (
+        Index("ix_food_category_id", "category_id"),
+    )
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     category_id: Mapped[int] = mapped_column(
         ForeignKey("menu_category.id", ondelete="SET NULL"), nullable=True
@@ -263,6 +292,9 @@ class Food(Base):
 
 class FoodVariant(Base):
     __tablename__ = "food_variant"
+    __table_args__ = (
+        Index("ix_food_variant_food_id_is_active", "food_id", "is_active"),
+    )
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     food_id: Mapped[int] = mapped_column(ForeignKey("food.id", ondelete="CASCADE"))
     price: Mapped[int] = mapped_column(Integer, nullable=False)
@@ -296,6 +328,10 @@ class FoodCharacteristic(Base):
 
 class FoodIngredientAssociation(Base):
     __tablename__ = "food_ingredient"
+    __table_args__ = (
+        # food_id покрыт первичным ключом (food_id, ingredient_id)
+        Index("ix_food_ingredient_ingredient_id", "ingredient_id"),
+    )
 
     food_id: Mapped[int] = mapped_column(
         ForeignKey("food.id", ondelete="CASCADE"), primary_key=True
@@ -338,8 +374,26 @@ class Ingredient(Base):
     )
 
 
+# Коды выдачи заказа: A000..Z999 по кругу. nextval не блокируется и не
+# откатывается, поэтому код не повторится раньше, чем через 26 000 заказов
+order_pickup_code_seq = Sequence(
+    "order_pickup_code_seq",
+    start=0,
+    minvalue=0,
+    maxvalue=25999,
+    cycle=True,
+    metadata=Base.metadata,
+)
+
+
 class Order(Base):
     __tablename__ = "order"
+    __table_args__ = (
+        # История заказов: WHERE user_id = ? ORDER BY created_at DESC, id DESC
+        Index("ix_order_user_id_created_at_id", "user_id", "created_at", "id"),
+        Index("ix_order_restaurant_id_created_at", "restaurant_id", "created_at"),
+        Index("ix_order_address_id", "address_id"),
+    )
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     user_id: Mapped[int] = mapped_column(
         Integer, ForeignKey("user.id", ondelete="RESTRICT")
@@ -390,8 +444,29 @@ class Order(Base):
     )
 
 
+class OrderOutbox(Base):
+    """Уведомления о заказах, записанные в транзакции заказа и ожидающие отправки в бота"""
+    __tablename__ = "order_outbox"
+    __table_args__ = (
+        Index("ix_order_outbox_next_attempt_at", "next_attempt_at"),
+    )
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    order_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("order.id", ondelete="CASCADE")
+    )
+    payload: Mapped[dict] = mapped_column(JSON, nullable=False)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    last_error: Mapped[Optional[str]] = mapped_column(String(1000), nullable=True)
+    next_attempt_at: Mapped[datetime] = mapped_column(DateTime, default=func.now())
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now())
+
+
 class OrderItem(Base):
     __tablename__ = "order_item"
+    __table_args__ = (
+        Index("ix_order_item_order_id", "order_id"),
+        Index("ix_order_item_food_variant_id", "food_variant_id"),
+    )
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     food_variant_id: Mapped[int] = mapped_column(
         Integer, ForeignKey("food_variant.id", ondelete="RESTRICT")
@@ -441,34 +516,12 @@ class User(Base):
         "RefreshToken", back_populates="user", cascade="all, delete-orphan"
     )
 
-    def set_password(self, password: str, argon_config: ArgonConfig):
-        """Установка пароля с использованием Argon2"""
-
-        ph = PasswordHasher(
-            time_cost=argon_config.argon2_time_cost,
-            memory_cost=argon_config.argon2_memory_cost,
-            parallelism=argon_config.argon2_parallelism,
-        )
-        self.hashed_password = ph.hash(password)
-
-    def check_password(self, password: str) -> bool:
-        """Проверка пароля с защитой от атак по времени"""
-        if not self.hashed_password:
-            return False
-        try:
-            ph = PasswordHasher()
-            return ph.verify(self.hashed_password, password)
-        except (VerifyMismatchError, InvalidHashError):
-            return False
-    
-    def needs_rehash(self) -> bool:
-        """Проверка, нужно ли перехешировать пароль (при изменении параметров)"""
-        ph = PasswordHasher()
-        return ph.check_needs_rehash(self.hashed_password)
-
 
 class UserAddress(Base):
     __tablename__ = "user_address"
+    __table_args__ = (
+        Index("ix_user_address_user_id", "user_id", "is_primary"),
+    )
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     user_id: Mapped[int] = mapped_column(
         Integer, ForeignKey("user.id", ondelete="CASCADE")
@@ -496,6 +549,15 @@ class UserAddress(Base):
 
 class RefreshToken(Base):
     __tablename__ = "refresh_token"
+    __table_args__ = (
+        # Поиск и отзыв действующих токенов пользователя
+        Index(
+            "ix_refresh_token_user_id_token_active",
+            "user_id",
+            "token",
+            postgresql_where=text("NOT is_revoked"),
+        ),
+    )
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     user_id: Mapped[int] = mapped_column(Integer, ForeignKey("user.id", ondelete="CASCADE"))
     token: Mapped[str] = mapped_column(String(255), nullable=False, unique=True)
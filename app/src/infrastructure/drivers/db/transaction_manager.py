@@ -1,36 +1,50 @@
 from contextlib import asynccontextmanager
-from sqlalchemy import text
-from sqlalchemy.ext.asyncio import AsyncSession, AsyncEngine
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.application.interfaces.transaction_manager import ITransactionManager
-from src.logger import logger
+from src.application.interfaces.transaction_manager import ITransactionManager, TransactionPolicy
+from src.logger import request_logger
+
+
+# Опции соединения сессии для политик, которым нужен особый режим транзакции
+POLICY_EXECUTION_OPTIONS = {
+    TransactionPolicy.READ_ONLY: {"postgresql_readonly": True},
+    TransactionPolicy.REPEATABLE_READ: {"isolation_level": "REPEATABLE READ"},
+    TransactionPolicy.SERIALIZABLE: {"isolation_level": "SERIALIZABLE"},
+}
 
 
 class TransactionManager(ITransactionManager):
-    def __init__(self, session: AsyncSession, engine: AsyncEngine) -> None:
+    def __init__(self, session: AsyncSession) -> None:
         self._session = session
-        self._engine = engine
 
     @asynccontextmanager
-    async def transaction(self, isolation_level: str = None):
-        if isolation_level:
-            # Для специальных уровней изоляции используем connection из сессии
-            async with self._engine.connect() as connection:
-                connection = await connection.execution_options(isolation_level=isolation_level)
-                async with connection.begin() as transaction:
-                    yield connection
-                    logger.info("Transaction committed successfully")
-        else:
-            # Обычная транзакция через сессию
-            async with self._session.begin() as transaction:
-                yield self._session
-                logger.info("Default transaction committed successfully")
+    async def transaction(self, policy: TransactionPolicy = TransactionPolicy.LAZY):
+        if policy == TransactionPolicy.NONE:
+            yield self._session
+            return
+
+        execution_options = POLICY_EXECUTION_OPTIONS.get(policy)
+        if execution_options:
+            # Уровень изоляции выставляется на соединении той же сессии,
+            # которую используют репозитории, - второе соединение из пула не берется
+            await self._session.connection(execution_options=execution_options)
+
+        try:
+            yield self._session
+        except Exception:
+            await self._session.rollback()
+            raise
+
+        # LAZY без запросов к БД соединение так и не получил - коммитить нечего
+        if self._session.in_transaction():
+            await self._session.commit()
+            request_logger.info("Transaction committed successfully")
 
 
     async def commit(self) -> None:
         try:
             await self._session.commit()
-            logger.info('commit')
+            request_logger.info('commit')
         except Exception:
             await self._session.rollback()
             raise
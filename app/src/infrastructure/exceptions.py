@@ -100,3 +100,28 @@ class OrderNotFoundError(InfrastructureError):
         if id:
             msg += f" с id: {id}"
         super().__init__(msg)
+
+
+class PasswordHasherBusyError(InfrastructureError):
+    def __init__(self) -> None:
+        super().__init__("Сервис авторизации перегружен, повторите попытку позже")
+
+
+class BotNotificationError(InfrastructureError):
+    def __init__(self, msg: str) -> None:
+        super().__init__(f"Не удалось отправить уведомление в бота: {msg}")
+
+
+class WebhookSecretError(InfrastructureError):
+    def __init__(self) -> None:
+        super().__init__("Неверный секрет webhook")
+
+
+class InvalidUpdateError(InfrastructureError):
+    def __init__(self) -> None:
+        super().__init__("Тело запроса не является обновлением Telegram")
+
+
+class UpdateQueueFullError(InfrastructureError):
+    def __init__(self) -> None:
+        super().__init__("Очередь обновлений бота переполнена, повторите попытку позже")
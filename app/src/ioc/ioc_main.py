@@ -30,12 +30,16 @@ from src.ioc.providers.interactors import (
     ingredient_interactor,
     user_address_interactor,
     order_interactor,
-    order_item_interactor
+    order_item_interactor,
+    search_interactor
 )
 from src.ioc.providers.database import DatabaseProvider
 from src.ioc.providers.config import ConfigProvider
 from src.ioc.providers.telegram import TelegramProvider
 from src.ioc.providers.http_provider import HTTPProvider
+from src.ioc.providers.cache import CacheProvider
+from src.ioc.providers.security import SecurityProvider
+from src.ioc.providers.outbox import OutboxProvider
 
 
 def create_container() -> AsyncContainer:
@@ -56,6 +60,7 @@ def create_container() -> AsyncContainer:
         user_address_interactor.UserAddressInteractorProvider(),
         order_interactor.OrderInteractorProvider(),
         order_item_interactor.OrderItemInteractorProvider(),
+        search_interactor.SearchInteractorProvider(),
         # Repositories
         restaurant_repository.RestaurantRepositryProvider(),
         food_repository.FoodRepositryProvider(),
@@ -75,4 +80,7 @@ def create_container() -> AsyncContainer:
         ConfigProvider(),
         HTTPProvider(),
         TelegramProvider(),
+        CacheProvider(),
+        SecurityProvider(),
+        OutboxProvider(),
     )
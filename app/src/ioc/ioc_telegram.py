@@ -3,7 +3,7 @@ from dishka import AsyncContainer, make_async_container
 from src.ioc.providers.telegram_bot_order_provider import TelegramBotOrderProvider
 from src.ioc.providers.database import DatabaseProvider
 from src.ioc.providers.config import ConfigProvider
-from src.ioc.providers.telegram import TelegramProvider
+from src.ioc.providers.telegram import TelegramListenerProvider, TelegramProvider
 from src.ioc.providers.repositories import (
     restaurant_repository,
     chat_repository,
@@ -17,6 +17,7 @@ def create_telegram_container() -> AsyncContainer:
         DatabaseProvider(),
         ConfigProvider(),
         TelegramProvider(),
+        TelegramListenerProvider(),
         restaurant_repository.RestaurantRepositryProvider(),
         chat_repository.ChatRepositryProvider(),
         order_repository.OrderRepositryProvider(),
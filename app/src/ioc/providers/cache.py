@@ -0,0 +1,225 @@
+from typing import AsyncIterator
+
+from dishka import Provider, Scope, provide
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.application.interfaces.cache.menu_search import IMenuSearch
+from src.application.interfaces.cache.menu_snapshot_cache import IMenuSnapshotCache
+from src.application.interfaces.cache.price_table import IPriceTable
+from src.application.interfaces.cache.response_cache import IResponseCache
+from src.application.interfaces.cache.restaurant_locations import IRestaurantLocations
+from src.application.interfaces.cache.restaurant_schedules import IRestaurantSchedules
+from src.application.interfaces.cache.user_auth_cache import IUserAuthCache
+from src.infrastructure.adapters.cache.catalog_responder import CatalogResponder
+from src.infrastructure.adapters.cache.menu_search import MenuSearch
+from src.infrastructure.adapters.cache.menu_snapshot_cache import MenuSnapshotCache
+from src.infrastructure.adapters.cache.price_table import PriceTable
+from src.infrastructure.adapters.cache.response_cache import ResponseCache
+from src.infrastructure.adapters.cache.restaurant_locations import RestaurantLocations
+from src.infrastructure.adapters.cache.restaurant_schedules import RestaurantSchedules
+from src.infrastructure.adapters.cache.user_auth_cache import UserAuthCache
+from src.infrastructure.drivers.db.change_events import subscribe_table_changes
+from src.infrastructure.adapters.notification.outbox_dispatcher import OrderOutboxDispatcher
+from src.infrastructure.drivers.db.notifications import (
+    MENU_SEARCH_CHANNEL,
+    ORDER_OUTBOX_CHANNEL,
+    PRICE_TABLE_CHANNEL,
+    RESTAURANT_LOCATIONS_CHANNEL,
+    RESTAURANT_SCHEDULE_CHANNEL,
+    USER_CHANGED_CHANNEL,
+    PgListener,
+)
+from src.infrastructure.drivers.db.tables import (
+    City,
+    Feature,
+    Food,
+    FoodCharacteristic,
+    FoodIngredientAssociation,
+    FoodVariant,
+    Ingredient,
+    MenuCategory,
+    Restaurant,
+    WorkingHours,
+    food_characteristic_variant_association,
+    restaurant_category_association,
+    restaurant_feature_association,
+    restaurant_food_disabled,
+)
+from src.config import Config
+
+
+# Таблицы, из которых собирается снимок меню
+MENU_SNAPSHOT_TABLES = [
+    table.name
+    for table in (
+        Restaurant.__table__,
+        MenuCategory.__table__,
+        Food.__table__,
+        FoodVariant.__table__,
+        FoodCharacteristic.__table__,
+        FoodIngredientAssociation.__table__,
+        Ingredient.__table__,
+        restaurant_category_association,
+        restaurant_food_disabled,
+        food_characteristic_variant_association,
+    )
+]
+
+# Таблицы справочников: города, рестораны города, категории, фичи, добавки
+CATALOG_TABLES = [
+    table.name
+    for table in (
+        City.__table__,
+        Restaurant.__table__,
+        WorkingHours.__table__,
+        Feature.__table__,
+        MenuCategory.__table__,
+        Food.__table__,
+        FoodIngredientAssociation.__table__,
+        Ingredient.__table__,
+        restaurant_category_association,
+        restaurant_feature_association,
+    )
+]
+
+# Таблицы, из которых собирается таблица цен (на них же триггер price_table_changed)
+PRICE_TABLES = [
+    table.name
+    for table in (
+        Restaurant.__table__,
+        Food.__table__,
+        FoodVariant.__table__,
+        FoodCharacteristic.__table__,
+        FoodIngredientAssociation.__table__,
+        Ingredient.__table__,
+        food_characteristic_variant_association,
+    )
+]
+
+
+class CacheProvider(Provider):
+
+    @provide(scope=Scope.APP)
+    def get_menu_snapshot_cache(self, config: Config) -> IMenuSnapshotCache:
+        cache = MenuSnapshotCache(
+            max_entries=config.cache.menu_cache_max_entries,
+            ttl_seconds=config.cache.menu_cache_ttl_seconds,
+        )
+        # Изменения в других воркерах ограничены TTL, в этом процессе - сбрасываем сразу
+        subscribe_table_changes(MENU_SNAPSHOT_TABLES, cache.invalidate)
+        return cache
+
+    @provide(scope=Scope.APP)
+    def get_response_cache(self, config: Config) -> IResponseCache:
+        cache = ResponseCache(
+            max_entries=config.cache.catalog_cache_max_entries,
+            ttl_seconds=config.cache.catalog_cache_ttl_seconds,
+        )
+        subscribe_table_changes(CATALOG_TABLES, cache.invalidate)
+        return cache
+
+    @provide(scope=Scope.APP)
+    def get_catalog_responder(self, response_cache: IResponseCache, config: Config) -> CatalogResponder:
+        return CatalogResponder(response_cache, config.cache.catalog_cache_max_age_seconds)
+
+    @provide(scope=Scope.APP)
+    def get_user_auth_cache(self, config: Config) -> IUserAuthCache:
+        return UserAuthCache(
+            max_entries=config.cache.user_cache_max_entries,
+            ttl_seconds=config.cache.user_cache_ttl_seconds,
+        )
+
+    @provide(scope=Scope.APP)
+    def get_price_table(
+        self,
+        session_maker: async_sessionmaker[AsyncSession],
+        config: Config,
+    ) -> IPriceTable:
+        price_table = PriceTable(session_maker, config.cache.price_table_ttl_seconds)
+        # NOTIFY приходит с задержкой, коммит в этом процессе сбрасывает таблицу сразу
+        subscribe_table_changes(PRICE_TABLES, price_table.invalidate)
+        return price_table
+
+    @provide(scope=Scope.APP)
+    def get_restaurant_schedules(
+        self,
+        session_maker: async_sessionmaker[AsyncSession],
+        config: Config,
+    ) -> IRestaurantSchedules:
+        schedules = RestaurantSchedules(
+            session_maker,
+            config.cache.restaurant_schedule_ttl_seconds,
+            config.app.timezone,
+        )
+        subscribe_table_changes([WorkingHours.__table__.name], schedules.invalidate)
+        return schedules
+
+    @provide(scope=Scope.APP)
+    def get_restaurant_locations(
+        self,
+        session_maker: async_sessionmaker[AsyncSession],
+        config: Config,
+    ) -> IRestaurantLocations:
+        locations = RestaurantLocations(session_maker, config.cache.restaurant_locations_ttl_seconds)
+        subscribe_table_changes([Restaurant.__table__.name], locations.invalidate)
+        return locations
+
+    @provide(scope=Scope.APP)
+    def get_menu_search(
+        self,
+        session_maker: async_sessionmaker[AsyncSession],
+        config: Config,
+    ) -> IMenuSearch:
+        menu_search = MenuSearch(session_maker, config.cache.menu_search_ttl_seconds)
+        # Индекс собирается из тех же таблиц, что и снимок меню
+        subscribe_table_changes(MENU_SNAPSHOT_TABLES, menu_search.invalidate)
+        return menu_search
+
+    @provide(scope=Scope.APP)
+    async def get_pg_listener(
+        self,
+        config: Config,
+        user_auth_cache: IUserAuthCache,
+        outbox_dispatcher: OrderOutboxDispatcher,
+        price_table: IPriceTable,
+        schedules: IRestaurantSchedules,
+        locations: IRestaurantLocations,
+        menu_search: IMenuSearch,
+    ) -> AsyncIterator[PgListener]:
+        listener = PgListener(config.postgres.build_conninfo())
+        # Бан в боте и удаление пользователя приходят через NOTIFY после коммита
+        listener.subscribe(
+            USER_CHANGED_CHANNEL,
+            lambda payload: user_auth_cache.invalidate(int(payload)),
+            on_reconnect=user_auth_cache.clear,
+        )
+        # Новый заказ из любого воркера будит диспетчеров outbox
+        listener.subscribe(
+            ORDER_OUTBOX_CHANNEL,
+            lambda _: outbox_dispatcher.wake(),
+            on_reconnect=outbox_dispatcher.wake,
+        )
+        # Цены меняют из админки любого воркера и вручную в БД - триггер шлет NOTIFY
+        listener.subscribe(
+            PRICE_TABLE_CHANNEL,
+            lambda _: price_table.invalidate(),
+            on_reconnect=price_table.invalidate,
+        )
+        listener.subscribe(
+            RESTAURANT_SCHEDULE_CHANNEL,
+            lambda _: schedules.invalidate(),
+            on_reconnect=schedules.invalidate,
+        )
+        listener.subscribe(
+            RESTAURANT_LOCATIONS_CHANNEL,
+            lambda _: locations.invalidate(),
+            on_reconnect=locations.invalidate,
+        )
+        listener.subscribe(
+            MENU_SEARCH_CHANNEL,
+            lambda _: menu_search.invalidate(),
+            on_reconnect=menu_search.invalidate,
+        )
+        await listener.start()
+        yield listener
+        await listener.stop()
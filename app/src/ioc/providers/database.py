@@ -7,7 +7,7 @@ from src.application.interfaces.transaction_manager import ITransactionManager
 from src.infrastructure.drivers.db.database import create_engine
 from src.infrastructure.drivers.db.transaction_manager import TransactionManager
 from src.config import Config
-from src.logger import logger
+from src.logger import request_logger
 
 
 class DatabaseProvider(Provider):
@@ -29,10 +29,10 @@ class DatabaseProvider(Provider):
     ) -> AsyncIterable[AsyncSession]:
         async with sessionmaker() as session:
             try:
-                logger.info('start session')
+                request_logger.info('start session')
                 yield session
             finally:
-                logger.info('close session')
+                request_logger.info('close session')
                 await session.close()
 
 
@@ -1,6 +1,6 @@
 from typing import AsyncIterator
 
-from aiohttp import ClientSession
+from aiohttp import ClientSession, ClientTimeout, TCPConnector
 from dishka import Provider, Scope, provide
 
 from src.infrastructure.adapters.notification.http_notifier import HttpOrderNotifier
@@ -10,13 +10,26 @@ from src.config import Config
 
 class HTTPProvider(Provider):
 
-    @provide(scope=Scope.REQUEST)
-    async def get_session(self) -> AsyncIterator[ClientSession]:
-        async with ClientSession() as session:
+    @provide(scope=Scope.APP)
+    async def get_session(self, config: Config) -> AsyncIterator[ClientSession]:
+        # Один пул соединений на процесс: keep-alive до сервиса бота
+        # переживает запросы, TCP-рукопожатие не попадает в создание заказа
+        connector = TCPConnector(
+            limit=config.bot.bot_http_connection_limit,
+            keepalive_timeout=config.bot.bot_http_keepalive_seconds,
+            ttl_dns_cache=300,
+        )
+        async with ClientSession(
+            connector=connector,
+            timeout=ClientTimeout(
+                total=config.bot.bot_http_timeout_seconds,
+                connect=config.bot.bot_http_connect_timeout_seconds,
+            ),
+        ) as session:
             yield session
 
-    @provide(scope=Scope.REQUEST)
-    async def get_http_bot_notifier(
+    @provide(scope=Scope.APP)
+    def get_http_bot_notifier(
         self,
         session: ClientSession,
         config: Config
@@ -2,6 +2,7 @@ from dishka import provide, Provider, Scope
 
 from src.application.interfaces.interactors.auth_interactor import GetCurrentUserInteractor, LoginUserInteractor, LogoutInteractor, RegisterUserInteractor, UpdateAccessTokenInteractor
 from src.application.interfaces.transaction_manager import ITransactionManager
+from src.application.interfaces.cache.user_auth_cache import IUserAuthCache
 from src.application.interfaces.repositories.auth_repository import IAuthRepository
 from src.application.interfaces.repositories.user_address_repository import IUserAddressRepository
 from src.application.interfaces.repositories.restaurant_repository import IRestaurantRepository
@@ -68,6 +69,7 @@ class AuthInteractorProvider(Provider):
     def get_current_user_interactor(
         self,
         auth_repository: IAuthRepository,
+        user_auth_cache: IUserAuthCache,
         config: Config
     ) -> GetCurrentUserInteractor:
-        return GetCurrentUserInteractor(auth_repository, config)
+        return GetCurrentUserInteractor(auth_repository, user_auth_cache, config)
@@ -1,5 +1,6 @@
 from dishka import provide, Provider, Scope
 
+from src.application.interfaces.cache.menu_snapshot_cache import IMenuSnapshotCache
 from src.application.interfaces.transaction_manager import ITransactionManager
 from src.application.interfaces.interactors.food_variant_interactor import GetFoodVariantInteractor, GetMenuCategoryPositionsIngredientsInteractor
 from src.application.interfaces.repositories.food_variant_repository import IFoodVariantRepository
@@ -23,6 +24,13 @@ class FoodVariantInteractorProvider(Provider):
         food_variant_repository: IFoodVariantRepository,
         menu_category_repository: IMunuCategoryRepository,
         restaurant_repository: IRestaurantRepository,
+        menu_snapshot_cache: IMenuSnapshotCache,
         config: Config
     ) -> GetMenuCategoryPositionsIngredientsInteractor:
-        return GetMenuCategoryPositionsIngredientsInteractor(food_variant_repository, menu_category_repository, restaurant_repository, config)
+        return GetMenuCategoryPositionsIngredientsInteractor(
+            food_variant_repository,
+            menu_category_repository,
+            restaurant_repository,
+            menu_snapshot_cache,
+            config
+        )
@@ -1,11 +1,13 @@
 from dishka import provide, Provider, Scope
 
-from src.application.interfaces.notification.http_notifier import IHTTPOrderNotifier
-from src.application.interfaces.interactors.order_interactor import AddOrderInteractor, GetUserOrdersInteractor#, UpdateOrderStatusInteractor
+from src.application.interfaces.interactors.order_interactor import AddOrderInteractor, GetUserOrdersInteractor, QuoteOrderInteractor#, UpdateOrderStatusInteractor
+from src.application.interfaces.cache.price_table import IPriceTable
+from src.application.interfaces.cache.restaurant_schedules import IRestaurantSchedules
 from src.application.interfaces.transaction_manager import ITransactionManager
 from src.application.interfaces.repositories.order_repository import IOrderRepository
+from src.application.interfaces.repositories.order_outbox_repository import IOrderOutboxRepository
 from src.application.interfaces.repositories.user_address_repository import IUserAddressRepository
-from src.application.interfaces.repositories.users_repository import IUsersRepository
+from src.config import Config
 
 
 class OrderInteractorProvider(Provider):
@@ -21,15 +23,26 @@ class OrderInteractorProvider(Provider):
     async def add_order_interactor(
         self,
         order_repository: IOrderRepository,
-        user_repository: IUsersRepository,
         user_address_repository: IUserAddressRepository,
         transaction_manager: ITransactionManager,
-        notifier: IHTTPOrderNotifier,
+        order_outbox_repository: IOrderOutboxRepository,
+        price_table: IPriceTable,
+        schedules: IRestaurantSchedules,
+        config: Config,
     ) -> AddOrderInteractor:
         return AddOrderInteractor(
             order_repository,
-            user_repository,
             user_address_repository,
             transaction_manager,
-            notifier
+            order_outbox_repository,
+            price_table,
+            schedules,
+            config,
         )
+
+    @provide(scope=Scope.REQUEST)
+    async def quote_order_interactor(
+        self,
+        price_table: IPriceTable,
+    ) -> QuoteOrderInteractor:
+        return QuoteOrderInteractor(price_table)
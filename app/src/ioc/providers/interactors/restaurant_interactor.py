@@ -1,11 +1,14 @@
 from dishka import provide, Provider, Scope
 
+from src.application.interfaces.cache.restaurant_locations import IRestaurantLocations
+from src.application.interfaces.cache.restaurant_schedules import IRestaurantSchedules
 from src.application.interfaces.repositories.city_repository import ICityRepository
 from src.application.interfaces.transaction_manager import ITransactionManager
 from src.application.interfaces.interactors.restaurant_interactor import (
     UpdateRestaurantInteractor,
     DeleteRestaurantInteractor,
     GetCityRestaurantsInteractor,
+    GetNearestRestaurantsInteractor,
     CreateRestaurantInteractor,
     GetRestaurantInteractor,
 )
@@ -28,8 +31,16 @@ class RestaurantInteractorProvider(Provider):
         self,
         city_repository: ICityRepository,
         restaurant_repository: IRestaurantRepository,
+        schedules: IRestaurantSchedules,
     ) -> GetCityRestaurantsInteractor:
-        return GetCityRestaurantsInteractor(city_repository, restaurant_repository)
+        return GetCityRestaurantsInteractor(city_repository, restaurant_repository, schedules)
+
+    @provide(scope=Scope.REQUEST)
+    async def get_nearest_restaurants_interactor(
+        self,
+        locations: IRestaurantLocations,
+    ) -> GetNearestRestaurantsInteractor:
+        return GetNearestRestaurantsInteractor(locations)
 
     @provide(scope=Scope.REQUEST)
     async def update_restaurant_interactor(
@@ -0,0 +1,16 @@
+from dishka import provide, Provider, Scope
+
+from src.application.interfaces.cache.menu_search import IMenuSearch
+from src.application.interfaces.interactors.search_interactor import SearchMenuInteractor
+from src.config import Config
+
+
+class SearchInteractorProvider(Provider):
+
+    @provide(scope=Scope.REQUEST)
+    async def search_menu_interactor(
+        self,
+        menu_search: IMenuSearch,
+        config: Config,
+    ) -> SearchMenuInteractor:
+        return SearchMenuInteractor(menu_search, config)
@@ -0,0 +1,31 @@
+from typing import AsyncIterator
+
+from dishka import Provider, Scope, provide
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.application.interfaces.notification.http_notifier import IHTTPOrderNotifier
+from src.application.interfaces.repositories.order_outbox_repository import IOrderOutboxRepository
+from src.infrastructure.adapters.notification.outbox_dispatcher import OrderOutboxDispatcher
+from src.infrastructure.adapters.repositories.order_outbox_repository import OrderOutboxRepository
+from src.config import Config
+
+
+class OutboxProvider(Provider):
+
+    @provide(scope=Scope.REQUEST)
+    async def get_order_outbox_repository(
+        self, session: AsyncSession
+    ) -> IOrderOutboxRepository:
+        return OrderOutboxRepository(session)
+
+    @provide(scope=Scope.APP)
+    async def get_order_outbox_dispatcher(
+        self,
+        session_maker: async_sessionmaker[AsyncSession],
+        notifier: IHTTPOrderNotifier,
+        config: Config,
+    ) -> AsyncIterator[OrderOutboxDispatcher]:
+        dispatcher = OrderOutboxDispatcher(session_maker, notifier, config.outbox)
+        await dispatcher.start()
+        yield dispatcher
+        await dispatcher.stop()
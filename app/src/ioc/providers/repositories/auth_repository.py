@@ -2,6 +2,7 @@ from dishka import provide, Provider, Scope
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.application.interfaces.repositories.auth_repository import IAuthRepository
+from src.application.interfaces.password_hasher import IPasswordHasher
 from src.infrastructure.adapters.repositories.auth_repository import AuthRepository
 
 
@@ -9,6 +10,6 @@ class AuthRepositryProvider(Provider):
 
     @provide(scope=Scope.REQUEST)
     async def get_auth_repository(
-        self, session: AsyncSession
+        self, session: AsyncSession, password_hasher: IPasswordHasher
     ) -> IAuthRepository:
-        return AuthRepository(session)
+        return AuthRepository(session, password_hasher)
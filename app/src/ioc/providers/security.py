@@ -0,0 +1,16 @@
+from typing import AsyncIterator
+
+from dishka import Provider, Scope, provide
+
+from src.application.interfaces.password_hasher import IPasswordHasher
+from src.infrastructure.adapters.security.password_hasher import Argon2PasswordHasher
+from src.config import Config
+
+
+class SecurityProvider(Provider):
+
+    @provide(scope=Scope.APP)
+    async def get_password_hasher(self, config: Config) -> AsyncIterator[IPasswordHasher]:
+        password_hasher = Argon2PasswordHasher(config.argon2)
+        yield password_hasher
+        password_hasher.shutdown()
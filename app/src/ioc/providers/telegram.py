@@ -1,13 +1,20 @@
+import asyncio
+from typing import AsyncIterator
+
 from dishka import provide, Provider, Scope, AsyncContainer
 from telegram import Bot, Update
 from telegram.ext import Application, CallbackQueryHandler, CommandHandler, ContextTypes
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from src.application.interfaces.repositories.chat_repository import IChatRepository
 from src.application.interfaces.repositories.users_repository import IUsersRepository
 from src.application.interfaces.interactors.handlers_interactor import BotHandlerInteractor
-from src.application.interfaces.repositories.restaurant_repository import IRestaurantRepository
+from src.application.interfaces.cache.chat_routing_table import IChatRoutingTable
 from src.application.interfaces.repositories.order_repository import IOrderRepository
 from src.infrastructure.adapters.telegram.order_notifier import TelegramOrderNotifier
+from src.infrastructure.adapters.telegram.rate_limiter import TelegramRateLimiter
+from src.infrastructure.adapters.cache.chat_routing_table import ChatRoutingTable
+from src.infrastructure.drivers.db.notifications import TELEGRAM_ROUTING_CHANNEL, PgListener
 from src.application.interfaces.notification.notifier import INotifier
 from src.application.interfaces.transaction_manager import ITransactionManager
 from src.config import Config
@@ -16,16 +23,43 @@ from src.config import Config
 class TelegramProvider(Provider):
     @provide(scope=Scope.APP)
     async def telegram_bot(self, config: Config) -> Bot:
-        return Bot(config.bot.bot_api_key)
+        return Bot(config.bot.bot_api_key, base_url=config.bot.bot_api_base_url)
+
+
+    @provide(scope=Scope.APP)
+    def rate_limiter(self, config: Config) -> TelegramRateLimiter:
+        # Один планировщик на процесс: лимиты Telegram действуют на бота целиком
+        return TelegramRateLimiter(
+            global_rate_per_second=config.bot.telegram_global_rate_per_second,
+            chat_rate_per_minute=config.bot.telegram_chat_rate_per_minute,
+            chat_burst=config.bot.telegram_chat_burst,
+            concurrency=config.bot.telegram_send_concurrency,
+        )
+
+
+    @provide(scope=Scope.APP)
+    def chat_routing_table(
+        self,
+        session_maker: async_sessionmaker[AsyncSession],
+        config: Config,
+    ) -> IChatRoutingTable:
+        return ChatRoutingTable(session_maker, config.cache.telegram_routing_ttl_seconds)
 
 
     @provide(scope=Scope.REQUEST)
     async def order_notifier(
         self,
         bot: Bot,
-        restaurant_repository: IRestaurantRepository
+        chat_routing: IChatRoutingTable,
+        rate_limiter: TelegramRateLimiter,
+        config: Config,
     ) -> INotifier:
-        return TelegramOrderNotifier(bot, restaurant_repository)
+        return TelegramOrderNotifier(
+            bot,
+            chat_routing,
+            rate_limiter,
+            config.bot.telegram_max_retries,
+        )
 
 
     @provide(scope=Scope.REQUEST)
@@ -54,7 +88,17 @@ class TelegramProvider(Provider):
         container: 'AsyncContainer'  # Добавляем контейнер для создания зависимостей при запросах
     ) -> Application:
         """Создает и настраивает Telegram Application с хэндлерами"""
-        application = Application.builder().token(config.bot.bot_api_key).build()
+        builder = Application.builder().token(config.bot.bot_api_key).base_url(config.bot.bot_api_base_url)
+        if config.bot.bot_webhook_enabled:
+            # Обновления кладет webhook-эндпоинт; очередь ограничена, чтобы
+            # при всплеске отвечать Telegram 503, а не копить память
+            builder = (
+                builder
+                .updater(None)
+                .update_queue(asyncio.Queue(maxsize=config.bot.bot_update_queue_size))
+                .concurrent_updates(config.bot.bot_update_concurrency)
+            )
+        application = builder.build()
 
         # Сохраняем контейнер в данных бота для использования в обработчиках
         application.bot_data['container'] = container
@@ -129,3 +173,28 @@ class TelegramProvider(Provider):
                 await handler.handle_order_callback(update, context)
 
         return order_callback_handler
+
+
+class TelegramListenerProvider(Provider):
+    """Слушатель NOTIFY процесса бота.
+
+    Только в контейнере бота: у API свой слушатель в CacheProvider,
+    маршруты чатов ему не нужны.
+    """
+
+    @provide(scope=Scope.APP)
+    async def pg_listener(
+        self,
+        config: Config,
+        chat_routing: IChatRoutingTable,
+    ) -> AsyncIterator[PgListener]:
+        listener = PgListener(config.postgres.build_conninfo())
+        # Чаты и их привязку меняют вне бота, триггер в БД шлет NOTIFY
+        listener.subscribe(
+            TELEGRAM_ROUTING_CHANNEL,
+            lambda _: chat_routing.invalidate(),
+            on_reconnect=chat_routing.invalidate,
+        )
+        await listener.start()
+        yield listener
+        await listener.stop()
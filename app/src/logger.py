@@ -1,16 +1,90 @@
+import atexit
+import json
 import logging
+import queue
+import random
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
 
-from src.config import create_config
+from src.config import get_config
 
 
-config = create_config()
+config = get_config()
 
-logger = logging.getLogger("logger")
-logger.handlers = []
-logger.setLevel(config.app.log_level)
+# Id запроса для сквозной корреляции логов, выставляется request_id_middleware
+request_id_var: ContextVar[str] = ContextVar("request_id", default="-")
+# Попал ли запрос в выборку подробных логов
+request_sampled_var: ContextVar[bool] = ContextVar("request_sampled", default=True)
+
+
+def sample_request() -> bool:
+    """Решение о подробных логах принимается один раз на запрос, чтобы цепочка не рвалась"""
+    return random.random() < config.app.log_request_sample_rate
+
+
+class RequestContextFilter(logging.Filter):
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
+
+class RequestSamplingFilter(logging.Filter):
+    """Пропускает INFO/DEBUG только для запросов из выборки, предупреждения - всегда"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno >= logging.WARNING or request_sampled_var.get()
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "request_id": getattr(record, "request_id", "-"),
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            data["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(data, ensure_ascii=False)
 
-formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+
+class LazyQueueHandler(QueueHandler):
+    """Кладет запись в очередь без форматирования.
+
+    Стандартный QueueHandler форматирует запись в вызывающем потоке,
+    то есть в event loop. Здесь подставляются только аргументы сообщения,
+    а форматтер (JSON, traceback) работает в потоке QueueListener.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+if config.app.log_format == "json":
+    formatter = JsonFormatter()
+else:
+    formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(request_id)s - %(message)s")
 
 console_handler = logging.StreamHandler()
 console_handler.setFormatter(formatter)
-logger.addHandler(console_handler)
+
+log_queue: queue.SimpleQueue = queue.SimpleQueue()
+queue_handler = LazyQueueHandler(log_queue)
+queue_handler.addFilter(RequestContextFilter())
+
+listener = QueueListener(log_queue, console_handler)
+listener.start()
+atexit.register(listener.stop)
+
+logger = logging.getLogger("logger")
+logger.handlers = []
+logger.setLevel(config.app.log_level)
+logger.addHandler(queue_handler)
+
+# Служебные сообщения каждого запроса (сессии, коммиты) - пишутся с сэмплированием
+request_logger = logger.getChild("request")
+request_logger.addFilter(RequestSamplingFilter())
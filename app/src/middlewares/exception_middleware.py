@@ -1,35 +1,37 @@
+import logging
 import traceback
 
 from fastapi.responses import JSONResponse
 from sqlalchemy.exc import SQLAlchemyError
 from fastapi import Request, Response
 
-from src.config import Config, create_config
+from src.config import Config
 from src.logger import logger
 
 
 async def exception_middleware(request: Request, call_next) -> Response:
-    config: Config = create_config()
+    config: Config = request.app.state.config
     environment = config.app.environment
 
-    logger.debug(f"Incoming request: {request.method} {request.url}")
-    logger.debug(f"Headers: {dict(request.headers)}")
-    logger.debug(f"Client: {request.client}")
+    # Словари заголовков собираются только при включенном DEBUG
+    debug = logger.isEnabledFor(logging.DEBUG)
+    if debug:
+        logger.debug("Incoming request: %s %s", request.method, request.url)
+        logger.debug("Headers: %s", dict(request.headers))
+        logger.debug("Client: %s", request.client)
 
     try:
-        logger.debug(f"start request")
         response: Response = await call_next(request)
-        logger.debug(f"end request")
-        
-        logger.debug(f"Response: {response.status_code}")
-        logger.debug(f"Response headers: {dict(response.headers)}")
+
+        if debug:
+            logger.debug("Response: %s", response.status_code)
+            logger.debug("Response headers: %s", dict(response.headers))
 
         return response
 
     except SQLAlchemyError as exc:
         # Логируем ошибки БД, которые не были обработаны в интеракторах
-        logger.error(f"Log Database error: --> {str(exc)} <--")
-        logger.debug(f"Log Database error traceback: --> {traceback.format_exc()} <--")
+        logger.error("Log Database error: --> %s <--", exc, exc_info=debug)
 
         if environment == "development":
             return JSONResponse(
@@ -49,8 +51,7 @@ async def exception_middleware(request: Request, call_next) -> Response:
 
     except Exception as exc:
         # Логируем все остальные неперехваченные исключения
-        logger.error(f"Unhandled exception: {str(exc)}")
-        logger.debug(f"Exception traceback: {traceback.format_exc()}")
+        logger.error("Unhandled exception: %s", exc, exc_info=debug)
         
         if environment == "development":
             return JSONResponse(
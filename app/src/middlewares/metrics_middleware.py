@@ -0,0 +1,56 @@
+from time import perf_counter
+
+from fastapi import Request, Response
+
+from src.infrastructure.drivers.db.instrumentation import QUERY_COUNT_BUCKETS, RequestStats, request_stats_var
+from src.infrastructure.metrics import REGISTRY
+
+
+HTTP_REQUEST_SECONDS = REGISTRY.histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ("method", "route", "status"),
+)
+HTTP_REQUEST_DB_SECONDS = REGISTRY.histogram(
+    "http_request_db_seconds",
+    "Time spent in SQL statements per HTTP request",
+    ("method", "route"),
+)
+HTTP_REQUEST_QUERIES = REGISTRY.histogram(
+    "http_request_db_queries",
+    "SQL statements per HTTP request",
+    ("method", "route"),
+    buckets=QUERY_COUNT_BUCKETS,
+)
+HTTP_REQUEST_POOL_WAIT_SECONDS = REGISTRY.histogram(
+    "http_request_pool_wait_seconds",
+    "Time waiting for pool connections per HTTP request",
+    ("method", "route"),
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+)
+
+
+def _route_template(request: Request) -> str:
+    # Шаблон пути, а не сам путь: /restaurant/{restaurant_id} - одна серия
+    route = request.scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+async def metrics_middleware(request: Request, call_next) -> Response:
+    stats = RequestStats()
+    # Обработчик запускается в копии контекста, но объект статистики общий
+    request_stats_var.set(stats)
+    started = perf_counter()
+
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        route = _route_template(request)
+        method = request.method
+        HTTP_REQUEST_SECONDS.observe(perf_counter() - started, method=method, route=route, status=status)
+        HTTP_REQUEST_QUERIES.observe(stats.queries, method=method, route=route)
+        HTTP_REQUEST_DB_SECONDS.observe(stats.db_seconds, method=method, route=route)
+        HTTP_REQUEST_POOL_WAIT_SECONDS.observe(stats.pool_wait_seconds, method=method, route=route)
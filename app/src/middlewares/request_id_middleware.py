@@ -0,0 +1,22 @@
+from uuid import uuid4
+
+from fastapi import Request, Response
+
+from src.logger import request_id_var, request_sampled_var, sample_request
+
+
+REQUEST_ID_HEADER = "X-Request-ID"
+
+
+async def request_id_middleware(request: Request, call_next) -> Response:
+    # Id от nginx/клиента сохраняем, чтобы связать логи сервисов между собой
+    request_id = request.headers.get(REQUEST_ID_HEADER) or uuid4().hex
+
+    # Значения не сбрасываются: каждый запрос обрабатывается в своей задаче,
+    # а закрытие сессии в контейнере dishka происходит уже после этого middleware
+    request_id_var.set(request_id)
+    request_sampled_var.set(sample_request())
+
+    response = await call_next(request)
+    response.headers[REQUEST_ID_HEADER] = request_id
+    return response
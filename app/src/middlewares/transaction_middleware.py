@@ -1,50 +1,76 @@
-import traceback
+from typing import Callable, Optional
 
-from dishka import AsyncContainer, FromDishka
-from fastapi.responses import JSONResponse
-from sqlalchemy.exc import SQLAlchemyError
+from dishka import AsyncContainer
 from fastapi import Request, Response
+from starlette.routing import BaseRoute, Match, Mount
+
+from src.application.interfaces.transaction_manager import ITransactionManager, TransactionPolicy
+from src.logger import request_logger
+
+
+TRANSACTION_POLICY_ATTR = "__transaction_policy__"
+WRITE_METHODS = ("POST", "PUT", "PATCH", "DELETE")
+
+
+def transaction_policy(policy: TransactionPolicy) -> Callable:
+    """Декларативно задает политику транзакции для эндпоинта"""
+    def decorator(endpoint: Callable) -> Callable:
+        setattr(endpoint, TRANSACTION_POLICY_ATTR, policy)
+        return endpoint
+
+    return decorator
+
+
+def _find_route(request: Request) -> Optional[BaseRoute]:
+    for route in request.app.router.routes:
+        match, _ = route.matches(request.scope)
+        if match == Match.FULL:
+            return route
 
-from src.application.interfaces.transaction_manager import ITransactionManager
-from src.config import Config, create_config
-from src.ioc.ioc_main import create_container
-from src.logger import logger
-
-
-def _get_isolation_level_for_request(request: Request) -> str:
-    # path = request.url.path
-    method = request.method
-
-    # Клиент может запросить уровень изоляции через заголовок
-    # isolation_header = request.headers.get("X-Transaction-Isolation")
-    # if isolation_header in ["READ COMMITTED", "REPEATABLE READ", "SERIALIZABLE"]:
-    #     return isolation_header
-    
-    # Критичные операции - строгая изоляция
-    # if any(op in path for op in ['/payment', '/transfer', '/balance']):
-    #     return "REPEATABLE READ"
-    
-    # Операции изменения данных - средняя изоляция  
-    if method in ["POST", "PUT", "PATCH", "DELETE"]:
-        return "REPEATABLE READ"  # или None для READ COMMITTED
-    
-    # Операции чтения - уровень по умолчанию
     return None
 
 
+def _get_transaction_policy(request: Request) -> TransactionPolicy:
+    route = _find_route(request)
+
+    # Статика, 404 и preflight-запросы не ходят в БД
+    if route is None or isinstance(route, Mount):
+        return TransactionPolicy.NONE
+
+    policy = getattr(getattr(route, "endpoint", None), TRANSACTION_POLICY_ATTR, None)
+    if policy:
+        return policy
+
+    # Операции изменения данных - средняя изоляция
+    if request.method in WRITE_METHODS:
+        return TransactionPolicy.REPEATABLE_READ
+
+    # Операции чтения - соединение только при первом запросе
+    return TransactionPolicy.LAZY
+
+
 async def transaction_middleware(
     request: Request,
     call_next
 ) -> Response:
-    container: AsyncContainer = request.app.state.dishka_container
-    async with container() as request_container:
-        transaction_manager = await request_container.get(ITransactionManager)
+    policy = _get_transaction_policy(request)
+    if policy == TransactionPolicy.NONE:
+        return await call_next(request)
+
+    # Контейнер запроса создается dishka ContainerMiddleware, поэтому
+    # транзакция открывается на той же сессии, что и у репозиториев
+    request_container: AsyncContainer = request.state.dishka_container
+    transaction_manager = await request_container.get(ITransactionManager)
+
+    request_logger.debug("start transaction with policy: %s", policy.value)
+
+    async with transaction_manager.transaction(policy):
+        response = await call_next(request)
 
-        isolation_level = _get_isolation_level_for_request(request)
-        logger.debug(f"start transaction with isolation level: {isolation_level}")
+        # Ошибки, обработанные exception handlers, не должны коммитить частичные изменения
+        if response.status_code >= 400:
+            await transaction_manager.rollback()
 
-        async with transaction_manager.transaction(isolation_level=isolation_level):
-            response = await call_next(request)
-            logger.debug(f"end transaction")
+        request_logger.debug("end transaction")
 
-            return response
+        return response
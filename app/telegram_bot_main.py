@@ -1,5 +1,6 @@
 from contextlib import asynccontextmanager
 import asyncio
+import signal
 import sys
 
 import uvicorn
@@ -7,18 +8,23 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from dishka.integrations.fastapi import setup_dishka
 from dishka import AsyncContainer
+from telegram import Update
 from telegram.ext import Application
 
 from src.ioc.ioc_telegram import create_telegram_container
+from src.application.interfaces.cache.chat_routing_table import IChatRoutingTable
+from src.infrastructure.drivers.db.notifications import PgListener
 from src.exceptions import register_exception_handlers
-from src.infrastructure.adapters.controllers import telegram_bot_controller
-from src.middlewares import exception_middleware, transaction_middleware
-from src.config import Config, create_config
+from src.infrastructure.adapters.controllers import metrics_controller, telegram_bot_controller, telegram_webhook_controller
+from src.middlewares import exception_middleware, metrics_middleware, request_id_middleware, transaction_middleware
+from src.config import Config, get_config, reload_config
 from src.logger import logger
 
 
 def setup_routers(app: FastAPI) -> None:
     app.include_router(telegram_bot_controller.router, tags=["TelegramBot"])
+    app.include_router(telegram_webhook_controller.router)
+    app.include_router(metrics_controller.router)
 
 
 def setup_middlewares(app: FastAPI, config: Config) -> None:
@@ -31,6 +37,8 @@ def setup_middlewares(app: FastAPI, config: Config) -> None:
     )
     app.middleware("http")(transaction_middleware.transaction_middleware) # 1-й - оборачивает в транзакцию
     app.middleware("http")(exception_middleware.exception_middleware) # затем 2-й - перехватывает все ошибки
+    app.middleware("http")(metrics_middleware.metrics_middleware) # 3-й - время запроса и счетчики БД
+    app.middleware("http")(request_id_middleware.request_id_middleware) # 4-й - id запроса, внешний: его видит и закрытие сессии
 
 
 async def start_telegram_bot(container: AsyncContainer):
@@ -57,10 +65,60 @@ async def start_telegram_bot(container: AsyncContainer):
             await telegram_app.shutdown()
 
 
+async def start_telegram_webhook(telegram_app: Application, config: Config) -> None:
+    """Запускает обработку обновлений из webhook и регистрирует его в Telegram"""
+    await telegram_app.initialize()
+    await telegram_app.start()
+
+    # Каждый воркер регистрирует один и тот же адрес, повторный вызов безопасен
+    await telegram_app.bot.set_webhook(
+        url=config.bot.bot_webhook_url,
+        secret_token=config.bot.bot_webhook_secret.get_secret_value(),
+        allowed_updates=Update.ALL_TYPES,
+    )
+
+    logger.info("Telegram bot webhook registered successfully!")
+
+
+def handle_config_reload() -> None:
+    """SIGHUP: перечитать .env без перезапуска воркера"""
+    config = reload_config()
+    logger.setLevel(config.app.log_level)
+    logger.info("Config reloaded")
+
+
+def install_config_reload() -> None:
+    if sys.platform != "win32":
+        asyncio.get_running_loop().add_signal_handler(signal.SIGHUP, handle_config_reload)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Запускаем Telegram бота в фоне
     container = app.state.dishka_container
+    config: Config = await container.get(Config)
+    install_config_reload()
+
+    # Маршруты ресторан -> чаты загружаются заранее, обновляются по NOTIFY
+    await container.get(PgListener)
+    try:
+        chat_routing: IChatRoutingTable = await container.get(IChatRoutingTable)
+        await chat_routing.refresh()
+    except Exception as e:
+        logger.error(f"Error loading Telegram chat routing: {e}")
+
+    if config.bot.bot_webhook_enabled:
+        # Webhook не удаляем при остановке: другие воркеры продолжают принимать обновления
+        telegram_app: Application = await container.get(Application)
+        await start_telegram_webhook(telegram_app, config)
+
+        yield
+
+        await telegram_app.stop()
+        await telegram_app.shutdown()
+        await container.close()
+        return
+
+    # Запускаем Telegram бота в фоне
     bot_task = asyncio.create_task(start_telegram_bot(container))
 
     yield
@@ -72,9 +130,11 @@ async def lifespan(app: FastAPI):
     except asyncio.CancelledError:
         pass
 
+    await container.close()
+
 
 def create_application() -> FastAPI:
-    config = create_config()
+    config = get_config()
     app = FastAPI(
         root_path="/bot",
         lifespan=lifespan,
@@ -82,9 +142,10 @@ def create_application() -> FastAPI:
     )
 
     container = create_telegram_container()
+    app.state.config = config
     app.state.dishka_container = container
-    setup_dishka(container, app)
     setup_middlewares(app, config)
+    setup_dishka(container, app) # после middleware: контейнер запроса оборачивает транзакцию
     register_exception_handlers(app)
     setup_routers(app)
 
@@ -92,7 +153,7 @@ def create_application() -> FastAPI:
 
 
 if __name__ == "__main__":
-    config = create_config()
+    config = get_config()
 
     if sys.platform == "win32":
         asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
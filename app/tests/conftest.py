@@ -0,0 +1,35 @@
+import asyncio
+from typing import Iterator
+
+import psycopg
+import pytest
+
+from benchmarks.database import recreate_database
+from src.config import get_config
+
+
+@pytest.fixture(scope="module")
+def runner() -> Iterator[asyncio.Runner]:
+    # Приложение, пул и кэши живут в одном цикле событий на весь модуль
+    with asyncio.Runner() as runner:
+        yield runner
+
+
+@pytest.fixture(scope="module")
+def scratch_database(request: pytest.FixtureRequest, runner: asyncio.Runner) -> Iterator[str]:
+    """Отдельная база модуля (его константа DATABASE), в конце удаляется.
+
+    Без Postgres из .env или без права CREATEDB тесты модуля пропускаются.
+    """
+    database = request.module.DATABASE
+    try:
+        runner.run(recreate_database(database))
+    except psycopg.Error as error:
+        pytest.skip(f"Postgres из .env недоступен или у пользователя нет права CREATEDB: {error}")
+
+    # Конфиг кэшируется на процесс: приложение и движки модуля возьмут новую базу
+    get_config().postgres.db = database
+    try:
+        yield database
+    finally:
+        runner.run(recreate_database(database, drop_only=True))
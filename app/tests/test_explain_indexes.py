@@ -0,0 +1,444 @@
+"""Планы горячих запросов: каждый должен идти через свой индекс.
+
+Запуск из директории app (нужен Postgres из .env, пользователь с правом CREATEDB,
+иначе тесты пропускаются):
+    python -m pytest tests/test_explain_indexes.py
+
+Фикстура создает отдельную базу (EXPLAIN_INDEXES_DATABASE, по умолчанию
+vivat_explain_indexes), строит в ней схему, генерирует набор данных
+(рестораны, меню, пользователи, заказы с позициями и ингредиентами) и
+собирает статистику (ANALYZE). Затем для каждой формы запроса из
+репозиториев отдельный тест выполняет EXPLAIN (FORMAT JSON): если в плане
+нет ожидаемого индекса, запрос считается регрессией. В конце база удаляется.
+
+На маленьких таблицах планировщик законно выбирает Seq Scan,
+поэтому SCALE меньше 1 использовать не стоит.
+"""
+import asyncio
+import json
+import os
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, Set, Tuple
+
+import pytest
+from sqlalchemy import select, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from src.config import get_config
+from src.infrastructure.drivers.db.base import Base
+from src.infrastructure.drivers.db.database import create_engine
+from src.infrastructure.drivers.db.tables import (
+    City,
+    Food,
+    FoodVariant,
+    Ingredient,
+    MenuCategory,
+    Order,
+    OrderItem,
+    RefreshToken,
+    Restaurant,
+    UserAddress,
+    WorkingHours,
+    food_characteristic_variant_association,
+    order_item_added_ingredient,
+    order_item_removed_ingredient,
+    restaurant_food_disabled,
+    restaurant_telegram_chat_association,
+)
+
+
+DATABASE = os.environ.get("EXPLAIN_INDEXES_DATABASE", "vivat_explain_indexes")
+SCALE = 1.0
+SIZES = {
+    "cities": int(100 * SCALE),
+    "restaurants": int(2000 * SCALE),
+    "categories": 50,
+    "foods": int(5000 * SCALE),
+    "ingredients": 200,
+    "users": int(20000 * SCALE),
+    "orders": int(200000 * SCALE),
+}
+
+PREFIX = "explain-"
+
+# Генерация данных: каждый шаг берет id строк, созданных предыдущими шагами
+GENERATE_SQL = [
+    """
+    INSERT INTO city (name, latitude, longitude)
+    SELECT 'explain-city-' || i, 44.9 + i / 1000.0, 34.1 + i / 1000.0
+    FROM generate_series(1, :cities) i
+    """,
+    """
+    WITH c AS (SELECT array_agg(id) AS ids FROM city WHERE name LIKE 'explain-%')
+    INSERT INTO restaurant (
+        city_id, name, phone, address, delivery_price, latitude, longitude,
+        has_delivery, has_takeaway, has_dine_in, is_active
+    )
+    SELECT
+        c.ids[1 + i % array_length(c.ids, 1)], 'explain-restaurant-' || i, '+79780000000',
+        'address ' || i, 0, 44.9 + random(), 34.1 + random(), true, true, false, i % 10 <> 0
+    FROM generate_series(1, :restaurants) i, c
+    """,
+    """
+    INSERT INTO working_hours (restaurant_id, day_of_week, opens_at, closes_at, is_holiday)
+    SELECT r.id, d, '09:00'::time, '22:00'::time, false
+    FROM restaurant r, generate_series(0, 6) d
+    WHERE r.name LIKE 'explain-%'
+    """,
+    """
+    INSERT INTO menu_category (name, display_order, need_addings)
+    SELECT 'explain-category-' || i, i, i % 2 = 0
+    FROM generate_series(1, :categories) i
+    """,
+    """
+    INSERT INTO restaurant_category (restaurant_id, category_id)
+    SELECT r.id, m.id
+    FROM restaurant r, menu_category m
+    WHERE r.name LIKE 'explain-%' AND m.name LIKE 'explain-%'
+    """,
+    """
+    WITH m AS (SELECT array_agg(id) AS ids FROM menu_category WHERE name LIKE 'explain-%')
+    INSERT INTO food (category_id, name)
+    SELECT m.ids[1 + i % array_length(m.ids, 1)], 'explain-food-' || i
+    FROM generate_series(1, :foods) i, m
+    """,
+    """
+    INSERT INTO food_variant (food_id, price, ingredient_price_modifier, is_active)
+    SELECT f.id, 300 + v * 100, 1 + v * 0.5, true
+    FROM food f, generate_series(0, 1) v
+    WHERE f.name LIKE 'explain-%'
+    """,
+    """
+    INSERT INTO food_characteristic (measure_value)
+    SELECT 'explain-' || i FROM generate_series(1, 3) i
+    """,
+    """
+    INSERT INTO food_characteristic_variant (characteristic_id, variant_id)
+    SELECT (SELECT min(id) FROM food_characteristic WHERE measure_value LIKE 'explain-%'), v.id
+    FROM food_variant v JOIN food f ON f.id = v.food_id
+    WHERE f.name LIKE 'explain-%'
+    """,
+    """
+    INSERT INTO ingredient (name, price, is_available)
+    SELECT 'explain-ingredient-' || i, 50 + i, true
+    FROM generate_series(1, :ingredients) i
+    """,
+    """
+    WITH g AS (SELECT array_agg(id) AS ids FROM ingredient WHERE name LIKE 'explain-%')
+    INSERT INTO food_ingredient (food_id, ingredient_id, is_adding, is_default)
+    SELECT f.id, g.ids[1 + (f.id * 7 + k) % array_length(g.ids, 1)], k > 2, k <= 2
+    FROM food f, generate_series(0, 4) k, g
+    WHERE f.name LIKE 'explain-%'
+    """,
+    """
+    INSERT INTO restaurant_food_disabled (restaurant_id, food_id)
+    SELECT r.id, f.id
+    FROM restaurant r JOIN food f ON (f.id + r.id) % 50 = 0
+    WHERE r.name LIKE 'explain-%' AND f.name LIKE 'explain-%'
+    """,
+    """
+    INSERT INTO telegram_chat (platform, chat_id, title, is_active, created_at, updated_at)
+    SELECT 'telegram', 'explain-chat-' || i, 'chat ' || i, true, now(), now()
+    FROM generate_series(1, :restaurants) i
+    """,
+    """
+    INSERT INTO restaurant_telegram_chat (restaurant_id, chat_id)
+    SELECT r.id, t.id
+    FROM restaurant r
+    JOIN telegram_chat t ON t.chat_id = 'explain-chat-' || substring(r.name FROM 20)
+    WHERE r.name LIKE 'explain-%'
+    """,
+    """
+    INSERT INTO "user" (name, phone, hashed_password, is_removed, is_banned)
+    SELECT 'explain-user-' || i, '+7999' || lpad(i::text, 7, '0'), 'hash', false, false
+    FROM generate_series(1, :users) i
+    """,
+    """
+    INSERT INTO user_address (user_id, address, is_primary, is_removed)
+    SELECT u.id, 'address ' || u.id, k = 0, false
+    FROM "user" u, generate_series(0, 1) k
+    WHERE u.name LIKE 'explain-%'
+    """,
+    """
+    INSERT INTO refresh_token (user_id, token, is_revoked, expires_at, created_at)
+    SELECT u.id, 'explain-' || u.id || '-' || k, k > 0, now() + interval '7 days', now()
+    FROM "user" u, generate_series(0, 2) k
+    WHERE u.name LIKE 'explain-%'
+    """,
+    """
+    WITH
+        u AS (SELECT array_agg(id ORDER BY id) AS ids FROM "user" WHERE name LIKE 'explain-%'),
+        r AS (SELECT array_agg(id) AS ids FROM restaurant WHERE name LIKE 'explain-%')
+    INSERT INTO "order" (
+        user_id, restaurant_id, address_id, order_action, status,
+        total_price, unique_code, created_at, updated_at
+    )
+    SELECT
+        u.ids[1 + i % array_length(u.ids, 1)],
+        r.ids[1 + i % array_length(r.ids, 1)],
+        NULL, 'takeaway'::order_action_enum, 'done'::order_status_enum,
+        1000, 'X' || i % 1000, now() - i * interval '1 minute', now()
+    FROM generate_series(1, :orders) i, u, r
+    """,
+    """
+    WITH v AS (
+        SELECT array_agg(fv.id) AS ids
+        FROM food_variant fv JOIN food f ON f.id = fv.food_id
+        WHERE f.name LIKE 'explain-%'
+    )
+    INSERT INTO order_item (food_variant_id, order_id, quantity, final_price)
+    SELECT v.ids[1 + (o.id * 3 + k) % array_length(v.ids, 1)], o.id, 1, 500
+    FROM "order" o, generate_series(0, 1) k, v
+    WHERE o.user_id IN (SELECT id FROM "user" WHERE name LIKE 'explain-%')
+    """,
+    """
+    WITH
+        g AS (SELECT array_agg(id) AS ids FROM ingredient WHERE name LIKE 'explain-%'),
+        items AS (
+            SELECT oi.id FROM order_item oi
+            JOIN "order" o ON o.id = oi.order_id
+            JOIN "user" u ON u.id = o.user_id
+            WHERE u.name LIKE 'explain-%'
+        )
+    INSERT INTO __order_item_added_ingredient (order_item_id, added_id)
+    SELECT items.id, g.ids[1 + items.id % array_length(g.ids, 1)]
+    FROM items, g
+    """,
+    """
+    INSERT INTO __order_item_removed_ingredient (order_item_id, removed_id)
+    SELECT order_item_id, added_id
+    FROM __order_item_added_ingredient
+    WHERE order_item_id % 3 = 0
+    """,
+]
+
+ANALYZE_TABLES = [
+    "city", "restaurant", "working_hours", "menu_category", "restaurant_category",
+    "food", "food_variant", "food_characteristic_variant", "ingredient", "food_ingredient",
+    "restaurant_food_disabled", "telegram_chat", "restaurant_telegram_chat", '"user"',
+    "user_address", "refresh_token", '"order"', "order_item",
+    "__order_item_added_ingredient", "__order_item_removed_ingredient",
+]
+
+
+def walk_plan(plan: dict) -> Iterator[dict]:
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from walk_plan(child)
+
+
+async def explain(connection: AsyncConnection, stmt) -> Tuple[Set[str], Set[str]]:
+    """Индексы и таблицы с Seq Scan из плана запроса"""
+    sql = stmt.compile(dialect=connection.dialect, compile_kwargs={"literal_binds": True})
+    result = await connection.execute(text(f"EXPLAIN (FORMAT JSON) {sql}"))
+    plan = result.scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    indexes, seq_scans = set(), set()
+    for node in walk_plan(plan[0]["Plan"]):
+        if "Index Name" in node:
+            indexes.add(node["Index Name"])
+        if node["Node Type"] == "Seq Scan":
+            seq_scans.add(node["Relation Name"])
+
+    return indexes, seq_scans
+
+
+async def sample_ids(connection: AsyncConnection) -> dict:
+    row = (await connection.execute(text(
+        """
+        SELECT
+            (SELECT min(id) FROM "user" WHERE name LIKE 'explain-%') AS user_id,
+            (SELECT min(id) FROM restaurant WHERE name LIKE 'explain-%' AND is_active) AS restaurant_id,
+            (SELECT min(city_id) FROM restaurant WHERE name LIKE 'explain-%') AS city_id,
+            (SELECT min(id) FROM menu_category WHERE name LIKE 'explain-%') AS category_id,
+            (SELECT min(id) FROM food WHERE name LIKE 'explain-%') AS food_id
+        """
+    ))).mappings().one()
+    ids = dict(row)
+
+    order_rows = (await connection.execute(
+        select(Order.id, Order.created_at)
+        .where(Order.user_id == ids["user_id"])
+        .order_by(Order.created_at.desc(), Order.id.desc())
+        .limit(3)
+    )).all()
+    ids["order_ids"] = [row.id for row in order_rows]
+    ids["after"] = (order_rows[-1].created_at, order_rows[-1].id)
+    ids["order_item_ids"] = list((await connection.execute(
+        select(OrderItem.id).where(OrderItem.order_id.in_(ids["order_ids"]))
+    )).scalars())
+    ids["variant_ids"] = list((await connection.execute(
+        select(FoodVariant.id).where(FoodVariant.food_id == ids["food_id"])
+    )).scalars())
+    ids["token"] = f"{PREFIX}{ids['user_id']}-0"
+
+    return ids
+
+
+@dataclass(frozen=True)
+class HotQuery:
+    """Форма запроса из репозитория и индексы, любой из которых должен быть в плане"""
+    build: Callable[[Dict[str, Any]], Any]
+    indexes: Tuple[str, ...]
+
+
+HOT_QUERIES: Dict[str, HotQuery] = {
+    "order history page": HotQuery(
+        lambda ids: select(Order)
+        .where(Order.user_id == ids["user_id"])
+        .order_by(Order.created_at.desc(), Order.id.desc())
+        .limit(21),
+        ("ix_order_user_id_created_at_id",),
+    ),
+    "order history keyset": HotQuery(
+        lambda ids: select(Order)
+        .where(Order.user_id == ids["user_id"])
+        .where(tuple_(Order.created_at, Order.id) < tuple_(*ids["after"]))
+        .order_by(Order.created_at.desc(), Order.id.desc())
+        .limit(21),
+        ("ix_order_user_id_created_at_id",),
+    ),
+    "last order city": HotQuery(
+        lambda ids: select(City)
+        .join(Restaurant, City.id == Restaurant.city_id)
+        .join(Order, Restaurant.id == Order.restaurant_id)
+        .where(Order.user_id == ids["user_id"])
+        .order_by(Order.id.desc())
+        .limit(1),
+        ("ix_order_user_id_created_at_id",),
+    ),
+    "restaurant orders": HotQuery(
+        lambda ids: select(Order)
+        .where(Order.restaurant_id == ids["restaurant_id"])
+        .order_by(Order.created_at.desc())
+        .limit(50),
+        ("ix_order_restaurant_id_created_at",),
+    ),
+    "order items by orders": HotQuery(
+        lambda ids: select(OrderItem).where(OrderItem.order_id.in_(ids["order_ids"])),
+        ("ix_order_item_order_id",),
+    ),
+    "added ingredients by items": HotQuery(
+        lambda ids: select(order_item_added_ingredient.c.order_item_id, Ingredient.name)
+        .join(Ingredient, Ingredient.id == order_item_added_ingredient.c.added_id)
+        .where(order_item_added_ingredient.c.order_item_id.in_(ids["order_item_ids"])),
+        ("ix_order_item_added_ingredient_order_item_id",),
+    ),
+    "removed ingredients by items": HotQuery(
+        lambda ids: select(order_item_removed_ingredient.c.order_item_id, Ingredient.name)
+        .join(Ingredient, Ingredient.id == order_item_removed_ingredient.c.removed_id)
+        .where(order_item_removed_ingredient.c.order_item_id.in_(ids["order_item_ids"])),
+        ("ix_order_item_removed_ingredient_order_item_id",),
+    ),
+    "city restaurants": HotQuery(
+        lambda ids: select(Restaurant)
+        .where(
+            Restaurant.city_id == ids["city_id"],
+            Restaurant.is_active == True,
+            Restaurant.latitude.is_not(None),
+        ),
+        ("ix_restaurant_city_id_active",),
+    ),
+    "working hours by restaurant": HotQuery(
+        lambda ids: select(WorkingHours).where(WorkingHours.restaurant_id.in_([ids["restaurant_id"]])),
+        ("ix_working_hours_restaurant_id_day_of_week",),
+    ),
+    "restaurant categories": HotQuery(
+        lambda ids: select(MenuCategory)
+        .join(MenuCategory.restaurants)
+        .where(Restaurant.id == ids["restaurant_id"])
+        .where(Restaurant.is_active == True)
+        .order_by(MenuCategory.display_order.asc()),
+        ("ix_restaurant_category_restaurant_id",),
+    ),
+    "foods by category": HotQuery(
+        lambda ids: select(Food).where(Food.category_id == ids["category_id"]),
+        ("ix_food_category_id",),
+    ),
+    "variants by food": HotQuery(
+        lambda ids: select(FoodVariant).where(FoodVariant.food_id == ids["food_id"]),
+        ("ix_food_variant_food_id_is_active",),
+    ),
+    "variant characteristics": HotQuery(
+        lambda ids: select(food_characteristic_variant_association)
+        .where(food_characteristic_variant_association.c.variant_id.in_(ids["variant_ids"])),
+        ("ix_food_characteristic_variant_variant_id",),
+    ),
+    "disabled foods by restaurant": HotQuery(
+        lambda ids: select(restaurant_food_disabled.c.food_id)
+        .where(restaurant_food_disabled.c.restaurant_id == ids["restaurant_id"]),
+        ("ix_restaurant_food_disabled_restaurant_id",),
+    ),
+    "restaurant chats": HotQuery(
+        lambda ids: select(restaurant_telegram_chat_association.c.chat_id)
+        .where(restaurant_telegram_chat_association.c.restaurant_id == ids["restaurant_id"]),
+        ("ix_restaurant_telegram_chat_restaurant_id",),
+    ),
+    "refresh token lookup": HotQuery(
+        lambda ids: select(RefreshToken).where(
+            RefreshToken.user_id == ids["user_id"],
+            RefreshToken.token == ids["token"],
+            RefreshToken.is_revoked == False,
+        ),
+        ("ix_refresh_token_user_id_token_active", "refresh_token_token_key"),
+    ),
+    "active refresh tokens": HotQuery(
+        lambda ids: select(RefreshToken).where(
+            RefreshToken.user_id == ids["user_id"],
+            RefreshToken.is_revoked == False,
+        ),
+        ("ix_refresh_token_user_id_token_active",),
+    ),
+    "user addresses": HotQuery(
+        lambda ids: select(UserAddress)
+        .where(UserAddress.user_id == ids["user_id"])
+        .order_by(UserAddress.is_primary.desc()),
+        ("ix_user_address_user_id",),
+    ),
+}
+
+
+@pytest.fixture(scope="module")
+def database(runner: asyncio.Runner, scratch_database: str) -> Iterator[Tuple[AsyncEngine, Dict[str, Any]]]:
+    engine = create_engine(get_config().postgres)
+    ids = runner.run(generate(engine))
+    try:
+        yield engine, ids
+    finally:
+        runner.run(engine.dispose())
+
+
+async def generate(engine: AsyncEngine) -> Dict[str, Any]:
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+        for sql in GENERATE_SQL:
+            params = {key: value for key, value in SIZES.items() if f":{key}" in sql}
+            await connection.execute(text(sql), params)
+
+    # ANALYZE после коммита: планировщик должен видеть статистику сгенерированных данных
+    async with engine.begin() as connection:
+        for table in ANALYZE_TABLES:
+            await connection.execute(text(f"ANALYZE {table}"))
+        return await sample_ids(connection)
+
+
+async def explain_query(engine: AsyncEngine, query: HotQuery, ids: Dict[str, Any]) -> Tuple[Set[str], Set[str]]:
+    async with engine.connect() as connection:
+        return await explain(connection, query.build(ids))
+
+
+@pytest.mark.parametrize("name", list(HOT_QUERIES))
+def test_query_uses_index(
+    runner: asyncio.Runner,
+    database: Tuple[AsyncEngine, Dict[str, Any]],
+    name: str,
+) -> None:
+    engine, ids = database
+    query = HOT_QUERIES[name]
+    indexes, seq_scans = runner.run(explain_query(engine, query, ids))
+    assert indexes & set(query.indexes), (
+        f"expected one of {', '.join(query.indexes)}; "
+        f"plan indexes: {', '.join(sorted(indexes)) or '-'}, seq scans: {', '.join(sorted(seq_scans)) or '-'}"
+    )
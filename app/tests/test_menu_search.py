@@ -0,0 +1,123 @@
+"""Поиск по индексу меню: ранжирование, начало слова, окончания, опечатки и "без".
+
+Индекс собирается из блюд в памяти, БД не нужна:
+    python -m pytest tests/test_menu_search.py
+"""
+from typing import List, Optional
+
+import pytest
+
+from src.application.interfaces.cache.menu_search import MenuSearchIndex, SearchDocument, parse_query
+from src.infrastructure.adapters.cache.menu_search import build_search_index
+
+
+PIZZA = 1
+BURGER = 2
+
+FOODS = [
+    # (Food.id, категория, название, описание)
+    (1, PIZZA, "Пицца Маргарита", "на тонком тесте"),
+    (2, PIZZA, "Пицца грибная", "с шампиньонами"),
+    (3, PIZZA, "Пицца Пепперони", "острая"),
+    (4, PIZZA, "Пицца Деревенская", "с грибами и беконом"),
+    (5, BURGER, "Бургер с беконом", "сочная котлета"),
+    (6, BURGER, "Бургер куриный", "пицца-соус внутри"),
+]
+INGREDIENTS = [
+    (1, "моцарелла"), (1, "томаты"),
+    (2, "моцарелла"), (2, "грибы"),
+    (3, "моцарелла"), (3, "пепперони"), (3, "лук"),
+    (4, "грибы"), (4, "бекон"), (4, "лук"), (4, "чеснок"),
+    (5, "бекон"), (5, "лук"),
+    (6, "курица"), (6, "томаты"),
+]
+# Ресторан 10 - только пиццы, в нем отключена Пепперони; ресторан 20 - бургеры
+RESTAURANT_CATEGORIES = {10: {PIZZA}, 20: {BURGER}}
+DISABLED = [(10, 3)]
+
+
+@pytest.fixture(scope="module")
+def index() -> MenuSearchIndex:
+    documents = [
+        SearchDocument(
+            food_id=food_id,
+            category_id=category_id,
+            name=name,
+            description=description,
+            image_url=None,
+            price_from=500,
+        )
+        for food_id, category_id, name, description in FOODS
+    ]
+    return build_search_index(1, documents, INGREDIENTS, RESTAURANT_CATEGORIES, DISABLED)
+
+
+def found(index: MenuSearchIndex, query: str, restaurant_id: Optional[int] = None) -> List[int]:
+    return [document.food_id for _, document in index.search(query, 20, restaurant_id)]
+
+
+def test_name_outranks_ingredients_and_description(index: MenuSearchIndex) -> None:
+    # Название пиццы - вес 3, "пицца-соус" в описании бургера - вес 1
+    assert found(index, "пицца")[-1] == 6
+    # Бекон в названии бургера выше бекона в составе и описании Деревенской
+    assert found(index, "бекон") == [5, 4]
+
+
+def test_prefix_matches_unfinished_word(index: MenuSearchIndex) -> None:
+    assert found(index, "пиц") == found(index, "пицца")
+    assert found(index, "пицца мар") == [1]
+
+
+def test_stem_matches_other_ending(index: MenuSearchIndex) -> None:
+    # "грибов" нет в меню: основа "гриб" находит "грибная", "грибы" и "грибами"
+    assert sorted(found(index, "грибов")) == [2, 4]
+
+
+def test_one_typo_is_forgiven(index: MenuSearchIndex) -> None:
+    assert found(index, "пеперони") == [3]
+    assert found(index, "моцарела") == found(index, "моцарелла")
+
+
+def test_all_words_are_required(index: MenuSearchIndex) -> None:
+    assert found(index, "пицца с грибами") == found(index, "пицца грибами")
+    assert found(index, "пицца бекон") == [4]
+
+
+def test_without_excludes_matching_foods(index: MenuSearchIndex) -> None:
+    with_mushrooms = found(index, "пицца грибов")
+    without_mushrooms = found(index, "пицца без грибов")
+    assert sorted(with_mushrooms) == [2, 4]
+    # Бургер 6 находится по "пицца-соус" в описании, грибов в нем нет
+    assert sorted(without_mushrooms) == [1, 3, 6]
+
+
+def test_without_applies_to_every_joined_word(index: MenuSearchIndex) -> None:
+    assert sorted(found(index, "пицца без лука и чеснока")) == [1, 2, 6]
+    # Слово после перечисления снова обязательное
+    assert found(index, "пицца без лука моцарелла") == [1, 2]
+
+
+def test_without_at_the_end_is_ignored_while_typing(index: MenuSearchIndex) -> None:
+    assert found(index, "пицца без") == found(index, "пицца")
+
+
+def test_restaurant_filters_categories_and_disabled_foods(index: MenuSearchIndex) -> None:
+    assert sorted(found(index, "пицца", 10)) == [1, 2, 4]
+    assert found(index, "пицца", 20) == [6]
+    assert found(index, "бургер", 10) == []
+
+
+def test_unknown_word_finds_nothing(index: MenuSearchIndex) -> None:
+    assert found(index, "суши") == []
+    assert found(index, "") == []
+
+
+@pytest.mark.parametrize("query, terms, excluded", [
+    ("пицца с грибами", ["пицца", "грибами"], []),
+    ("пицца без грибов", ["пицца"], ["грибов"]),
+    ("без лука и чеснока, с беконом", ["беконом"], ["лука", "чеснока"]),
+    ("с", ["с"], []),
+    ("без", ["без"], []),
+])
+def test_parse_query(query: str, terms: List[str], excluded: List[str]) -> None:
+    assert parse_query(query) == (terms, excluded)
@@ -0,0 +1,345 @@
+"""Бюджет SQL запросов и прочитанных строк для каждого маршрута API.
+
+Запуск из директории app (нужен Postgres из .env, пользователь с правом CREATEDB,
+иначе тесты пропускаются):
+    python -m pytest tests/test_query_budget.py
+
+Фикстура создает отдельную базу (QUERY_BUDGET_DATABASE, по умолчанию
+vivat_query_budget), строит в ней схему, заполняет ее через
+vivat_data_generator.generate_data, регистрирует пользователя и оформляет
+ему ORDERS заказов через POST /order. Затем для каждого маршрута из
+setup_routers отдельный тест делает запрос с холодными кэшами и считает
+SQL запросы и строки, которые вернул Postgres. Превышение бюджета из
+BUDGETS - регрессия, маршрут без бюджета - тоже. Маршруты из WARM_BUDGETS
+дополнительно проверяются повторным запросом: индекс уже в памяти.
+
+Отдельно проверяется, что число запросов не растет вместе с данными
+(N+1): история заказов при 2 и при ORDERS заказах, рестораны города до
+и после добавления EXTRA_RESTAURANTS ресторанов, создание заказа из 1
+и из 5 позиций. В конце база удаляется.
+"""
+import asyncio
+import json
+import os
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterator, Optional, Tuple
+from urllib.parse import quote
+
+import pytest
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from benchmarks.asgi import asgi_request
+from benchmarks.database import add_restaurants, order_body, sample_ids, seed
+from src.application.interfaces.cache.menu_search import IMenuSearch
+from src.application.interfaces.cache.menu_snapshot_cache import IMenuSnapshotCache
+from src.application.interfaces.cache.response_cache import IResponseCache
+from src.application.interfaces.cache.restaurant_locations import IRestaurantLocations
+from src.application.interfaces.cache.restaurant_schedules import IRestaurantSchedules
+from src.application.interfaces.cache.user_auth_cache import IUserAuthCache
+from src.config import get_config
+
+
+DATABASE = os.environ.get("QUERY_BUDGET_DATABASE", "vivat_query_budget")
+ORDERS = 25
+EXTRA_RESTAURANTS = 20
+
+PHONE = "+79785550000"
+PASSWORD = "budget-pass1"
+
+Route = Tuple[str, str]
+
+# Маршрут -> (максимум SQL запросов, максимум строк) на один холодный запрос.
+# Строки считаются по данным generate_data плюс ORDERS заказов по 3 позиции
+BUDGETS: Dict[Route, Tuple[int, int]] = {
+    ("GET", "/city"): (1, 5),
+    ("GET", "/city/{city_id}"): (1, 1),
+    ("GET", "/feature"): (1, 10),
+    ("GET", "/feature/{feature_id}"): (1, 1),
+    ("GET", "/restaurant/{restaurant_id}"): (5, 40),
+    ("GET", "/restaurant/city/{city_id}"): (6, 80), # с загрузкой часов работы
+    ("GET", "/restaurant/nearest"): (1, 5), # сборка сетки координат
+    ("GET", "/category"): (1, 10),
+    ("GET", "/category/restaurant/{restaurant_id}"): (1, 10),
+    ("GET", "/food/{food_id}"): (1, 1),
+    ("GET", "/food_variant/{food_id}"): (1, 10),
+    ("GET", "/food_variant/category/{category_id}"): (2, 500),
+    ("GET", "/ingredient/addings/{category_id}"): (2, 50),
+    # Сборка индекса: блюда, состав, рестораны, их категории и отключенные блюда
+    ("GET", "/search"): (5, 300),
+    ("GET", "/order"): (9, 400),
+    # Заказ проверяется по таблице цен в памяти, в БД - адрес, nextval кода выдачи,
+    # INSERT заказа, позиций, ингредиентов, outbox и pg_notify
+    ("POST", "/order"): (9, 20),
+    ("POST", "/order/quote"): (0, 0),
+    ("GET", "/user_address"): (2, 5),
+    ("POST", "/user_address"): (3, 5),
+    ("PATCH", "/user_address/{address_id}"): (3, 5),
+    ("DELETE", "/user_address/{address_id}"): (6, 5),
+    # INSERT пользователя и вход тем же запросом
+    ("POST", "/auth/register"): (7, 5),
+    ("POST", "/auth/login"): (6, 20),
+    ("POST", "/auth/refresh"): (2, 5),
+    ("POST", "/auth/logout"): (2, 5),
+    ("DELETE", "/users"): (6, 5),
+    ("GET", "/metrics"): (0, 0),
+}
+
+# Маршруты с индексом в памяти: повторный запрос после холодного не ходит в БД
+WARM_BUDGETS: Dict[Route, Tuple[int, int]] = {
+    ("GET", "/restaurant/nearest"): (0, 0),
+    ("GET", "/search"): (0, 0),
+}
+
+
+class QueryCounter:
+    """Считает запросы и строки результата через событие engine"""
+
+    def __init__(self, engine: AsyncEngine) -> None:
+        self.statements = 0
+        self.rows = 0
+        event.listen(engine.sync_engine, "after_cursor_execute", self._after_cursor_execute)
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        self.statements += 1
+        # У psycopg rowcount для SELECT - число строк, полученных клиентом
+        if cursor.description is not None and cursor.rowcount > 0:
+            self.rows += cursor.rowcount
+
+    def reset(self) -> None:
+        self.statements = 0
+        self.rows = 0
+
+
+@dataclass
+class Call:
+    """Запрос, бюджет которого проверяется"""
+    path: str
+    body: Optional[dict] = None
+    cookies: Optional[Dict[str, str]] = None # по умолчанию - пользователь PHONE
+
+
+@dataclass
+class Measurement:
+    status_code: int
+    statements: int
+    rows: int
+
+
+@dataclass
+class BudgetClient:
+    app: Any
+    counter: QueryCounter
+    session_maker: async_sessionmaker[AsyncSession]
+    ids: Dict[str, Any]
+    cookies: Dict[str, str] = field(default_factory=dict)
+    orders_small: int = 0 # запросов GET /order при 2 заказах
+    users: int = 0
+
+    async def clear_caches(self) -> None:
+        # Бюджет считается для холодного пути: ответы, меню и индексы из памяти не должны его скрывать
+        container = self.app.state.dishka_container
+        (await container.get(IResponseCache)).invalidate()
+        (await container.get(IMenuSnapshotCache)).invalidate()
+        (await container.get(IRestaurantSchedules)).invalidate()
+        (await container.get(IRestaurantLocations)).invalidate()
+        (await container.get(IMenuSearch)).invalidate()
+        (await container.get(IUserAuthCache)).clear()
+
+    async def request(self, method: str, call: Call) -> Tuple[int, bytes]:
+        cookies = self.cookies if call.cookies is None else call.cookies
+        status_code, _, body = await asgi_request(self.app, method, call.path, body=call.body, cookies=cookies)
+        return status_code, body
+
+    async def measure(self, method: str, call: Call, cold: bool = True) -> Measurement:
+        if cold:
+            await self.clear_caches()
+        self.counter.reset()
+        status_code, _ = await self.request(method, call)
+        return Measurement(status_code, self.counter.statements, self.counter.rows)
+
+    def register(self, cookies: Dict[str, str]) -> Call:
+        """Регистрация нового пользователя: телефоны не повторяются в пределах базы"""
+        self.users += 1
+        return Call(
+            "/auth/register",
+            {"phone": f"+7978556{self.users:04d}", "password": PASSWORD},
+            cookies,
+        )
+
+    async def add_address(self) -> int:
+        status_code, body = await self.request("POST", Call("/user_address", {"address": "ул. Тестовая, 2"}))
+        assert status_code < 400, f"POST /user_address: статус {status_code}"
+        return json.loads(body)["id"]
+
+
+async def start_client() -> BudgetClient:
+    # Заказ "asap" должен проходить в любое время запуска
+    get_config().app.reject_orders_outside_hours = False
+
+    from main import create_application
+
+    app = create_application()
+    session_maker = await seed(app)
+    client = BudgetClient(
+        app=app,
+        counter=QueryCounter(await app.state.dishka_container.get(AsyncEngine)),
+        session_maker=session_maker,
+        ids=await sample_ids(session_maker),
+    )
+
+    status_code, _ = await client.request("POST", Call("/auth/register", {"phone": PHONE, "password": PASSWORD}))
+    assert status_code < 400, f"Регистрация пользователя: статус {status_code}"
+
+    body = await order_body(session_maker, 3)
+    for _ in range(2):
+        await client.request("POST", Call("/order", body))
+    client.orders_small = (await client.measure("GET", Call("/order"))).statements
+    for _ in range(ORDERS - 2):
+        await client.request("POST", Call("/order", body))
+
+    return client
+
+
+async def stop_client(client: BudgetClient) -> None:
+    await client.app.state.dishka_container.close()
+
+
+async def nearest(client: BudgetClient) -> Call:
+    latitude, longitude = client.ids["coords"]
+    return Call(f"/restaurant/nearest?lat={latitude}&lon={longitude}&action=delivery")
+
+
+async def search(client: BudgetClient) -> Call:
+    return Call(f"/search?q={quote('пиц')}&restaurant_id={client.ids['restaurant_id']}")
+
+
+async def create_order(client: BudgetClient) -> Call:
+    return Call("/order", await order_body(client.session_maker, 1))
+
+
+async def quote_order(client: BudgetClient) -> Call:
+    body = await order_body(client.session_maker, 5)
+    return Call("/order/quote", {"order_list": body["order_list"]})
+
+
+async def add_address(client: BudgetClient) -> Call:
+    return Call("/user_address", {"address": "ул. Тестовая, 1"})
+
+
+async def update_address(client: BudgetClient) -> Call:
+    address_id = await client.add_address()
+    return Call(f"/user_address/{address_id}", {"entrance": "2"})
+
+
+async def delete_address(client: BudgetClient) -> Call:
+    address_id = await client.add_address()
+    return Call(f"/user_address/{address_id}")
+
+
+async def register(client: BudgetClient) -> Call:
+    return client.register({})
+
+
+async def login(client: BudgetClient) -> Call:
+    return Call("/auth/login", {"phone": PHONE, "password": PASSWORD})
+
+
+async def logout(client: BudgetClient) -> Call:
+    # Свой пользователь: выход не должен разлогинить остальные проверки
+    cookies: Dict[str, str] = {}
+    await client.request("POST", client.register(cookies))
+    return Call("/auth/logout", cookies=cookies)
+
+
+async def delete_user(client: BudgetClient) -> Call:
+    cookies: Dict[str, str] = {}
+    await client.request("POST", client.register(cookies))
+    return Call("/users", cookies=cookies)
+
+
+# Маршруты, которым нужно тело, параметры запроса или своя подготовка. Остальные
+# вызываются по шаблону пути с подставленными id из sample_ids
+CALLS: Dict[Route, Callable[[BudgetClient], Awaitable[Call]]] = {
+    ("GET", "/restaurant/nearest"): nearest,
+    ("GET", "/search"): search,
+    ("POST", "/order"): create_order,
+    ("POST", "/order/quote"): quote_order,
+    ("POST", "/user_address"): add_address,
+    ("PATCH", "/user_address/{address_id}"): update_address,
+    ("DELETE", "/user_address/{address_id}"): delete_address,
+    ("POST", "/auth/register"): register,
+    ("POST", "/auth/login"): login,
+    ("POST", "/auth/logout"): logout,
+    ("DELETE", "/users"): delete_user,
+}
+
+
+@pytest.fixture(scope="module")
+def client(runner: asyncio.Runner, scratch_database: str) -> Iterator[BudgetClient]:
+    client = runner.run(start_client())
+    try:
+        yield client
+    finally:
+        runner.run(stop_client(client))
+
+
+def test_every_route_has_budget(client: BudgetClient) -> None:
+    routes = {
+        (method, route.path)
+        for route in client.app.routes
+        if isinstance(route, APIRoute)
+        for method in route.methods
+    }
+    assert sorted(routes - BUDGETS.keys()) == []
+
+
+def prepare_call(runner: asyncio.Runner, client: BudgetClient, method: str, route: str) -> Call:
+    prepare = CALLS.get((method, route))
+    if prepare is None:
+        return Call(route.format(**client.ids))
+    return runner.run(prepare(client))
+
+
+def assert_within(measurement: Measurement, budget: Tuple[int, int]) -> None:
+    max_statements, max_rows = budget
+    assert measurement.status_code < 400, f"status {measurement.status_code}"
+    assert measurement.statements <= max_statements, f"{measurement.statements} > {max_statements} queries"
+    assert measurement.rows <= max_rows, f"{measurement.rows} > {max_rows} rows"
+
+
+@pytest.mark.parametrize("method, route", list(BUDGETS), ids=[f"{method} {route}" for method, route in BUDGETS])
+def test_route_budget(runner: asyncio.Runner, client: BudgetClient, method: str, route: str) -> None:
+    call = prepare_call(runner, client, method, route)
+    assert_within(runner.run(client.measure(method, call)), BUDGETS[(method, route)])
+
+
+@pytest.mark.parametrize(
+    "method, route", list(WARM_BUDGETS), ids=[f"{method} {route}" for method, route in WARM_BUDGETS],
+)
+def test_warm_route_budget(runner: asyncio.Runner, client: BudgetClient, method: str, route: str) -> None:
+    call = prepare_call(runner, client, method, route)
+    # Первый запрос строит индекс, второй должен обойтись без БД
+    runner.run(client.measure(method, call))
+    assert_within(runner.run(client.measure(method, call, cold=False)), WARM_BUDGETS[(method, route)])
+
+
+def test_order_history_is_constant(runner: asyncio.Runner, client: BudgetClient) -> None:
+    large = runner.run(client.measure("GET", Call("/order"))).statements
+    assert large <= client.orders_small, f"GET /order: 2 -> {ORDERS} orders, {client.orders_small} -> {large}"
+
+
+def test_order_positions_are_constant(runner: asyncio.Runner, client: BudgetClient) -> None:
+    small = runner.run(client.measure("POST", runner.run(create_order(client)))).statements
+    body = runner.run(order_body(client.session_maker, 5))
+    large = runner.run(client.measure("POST", Call("/order", body))).statements
+    assert large <= small, f"POST /order: 1 -> 5 positions, {small} -> {large}"
+
+
+def test_city_restaurants_are_constant(runner: asyncio.Runner, client: BudgetClient) -> None:
+    path = f"/restaurant/city/{client.ids['city_id']}"
+    small = runner.run(client.measure("GET", Call(path))).statements
+    runner.run(add_restaurants(client.session_maker, client.ids["city_id"], EXTRA_RESTAURANTS))
+    large = runner.run(client.measure("GET", Call(path))).statements
+    assert large <= small, f"GET /restaurant/city: +{EXTRA_RESTAURANTS} restaurants, {small} -> {large}"
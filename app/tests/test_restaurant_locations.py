@@ -0,0 +1,121 @@
+"""Поиск ближайших ресторанов по сетке координат.
+
+Сетка собирается из ресторанов в памяти, БД не нужна:
+    python -m pytest tests/test_restaurant_locations.py
+"""
+from typing import Iterator, List, Tuple
+
+import pytest
+
+from src.application.interfaces.cache import restaurant_locations
+from src.application.interfaces.cache.restaurant_locations import (
+    MAX_LATITUDE,
+    LocationIndex,
+    RestaurantLocation,
+    distance_km,
+    grid_cell,
+)
+from src.domain.enums.enums import OrderAction
+from src.infrastructure.adapters.cache.restaurant_locations import build_index
+
+
+# Центр Симферополя
+LATITUDE, LONGITUDE = 44.95, 34.10
+
+BOTH = frozenset((OrderAction.DELIVERY, OrderAction.TAKEAWAY))
+TAKEAWAY = frozenset((OrderAction.TAKEAWAY,))
+
+
+def location(restaurant_id: int, latitude: float, longitude: float, actions=BOTH) -> RestaurantLocation:
+    return RestaurantLocation(
+        id=restaurant_id,
+        city_id=1,
+        name=f"restaurant-{restaurant_id}",
+        address=f"address {restaurant_id}",
+        phone="+79780000000",
+        latitude=latitude,
+        longitude=longitude,
+        delivery_price=0,
+        actions=actions,
+    )
+
+
+LOCATIONS = [
+    location(1, LATITUDE + 0.20, LONGITUDE), # ~22 км к северу
+    location(2, LATITUDE, LONGITUDE + 0.01), # ~0.8 км
+    location(3, LATITUDE - 0.05, LONGITUDE - 0.05, TAKEAWAY), # ~6.8 км, только самовывоз
+    location(4, LATITUDE + 0.03, LONGITUDE + 0.03), # ~4 км
+    location(5, 44.62, 33.53), # Севастополь, ~60 км
+]
+
+
+@pytest.fixture(scope="module")
+def index() -> LocationIndex:
+    return build_index(1, LOCATIONS)
+
+
+@pytest.fixture
+def rings(monkeypatch: pytest.MonkeyPatch) -> List[int]:
+    """Номера колец, которые обошел поиск"""
+    visited: List[int] = []
+    ring_cells = restaurant_locations._ring_cells
+
+    def counting(row: int, col: int, ring: int) -> Iterator[Tuple[int, int]]:
+        visited.append(ring)
+        return ring_cells(row, col, ring)
+
+    monkeypatch.setattr(restaurant_locations, "_ring_cells", counting)
+    return visited
+
+
+def ids(found: List[Tuple[float, RestaurantLocation]]) -> List[int]:
+    return [item.id for _, item in found]
+
+
+def test_sorted_by_distance(index: LocationIndex) -> None:
+    found = index.nearest(LATITUDE, LONGITUDE, 10, 100)
+    assert ids(found) == [2, 4, 3, 1, 5]
+    for distance, item in found:
+        assert distance == pytest.approx(distance_km(LATITUDE, LONGITUDE, item.latitude, item.longitude))
+
+
+def test_limit(index: LocationIndex) -> None:
+    assert ids(index.nearest(LATITUDE, LONGITUDE, 2, 100)) == [2, 4]
+
+
+def test_action_filter(index: LocationIndex) -> None:
+    assert ids(index.nearest(LATITUDE, LONGITUDE, 10, 100, OrderAction.DELIVERY)) == [2, 4, 1, 5]
+    assert ids(index.nearest(LATITUDE, LONGITUDE, 10, 100, OrderAction.TAKEAWAY)) == [2, 4, 3, 1, 5]
+    assert index.nearest(LATITUDE, LONGITUDE, 10, 100, OrderAction.INSIDE) == []
+
+
+def test_radius_cut_off(index: LocationIndex) -> None:
+    assert ids(index.nearest(LATITUDE, LONGITUDE, 10, 30)) == [2, 4, 3, 1]
+    assert ids(index.nearest(LATITUDE, LONGITUDE, 10, 5)) == [2, 4]
+    assert index.nearest(LATITUDE + 5, LONGITUDE, 10, 100) == []
+
+
+def test_empty_index() -> None:
+    assert build_index(1, []).nearest(LATITUDE, LONGITUDE, 5, 30) == []
+
+
+def test_stops_once_nearest_are_found(index: LocationIndex, rings: List[int]) -> None:
+    # Ресторан 2 в соседней ячейке: дальше первого кольца он заведомо ближе любого другого
+    assert ids(index.nearest(LATITUDE, LONGITUDE, 1, 100)) == [2]
+    assert max(rings) <= 2
+
+
+def test_stops_at_occupied_cells(index: LocationIndex, rings: List[int]) -> None:
+    # Все рестораны найдены, как только кольца накрыли занятые ячейки: самая
+    # дальняя по сетке - ячейка Севастополя, раньше границы радиуса в 100 км
+    assert len(index.nearest(LATITUDE, LONGITUDE, 10, 100)) == len(LOCATIONS)
+    row, col = grid_cell(LATITUDE, LONGITUDE)
+    far_row, far_col = grid_cell(44.62, 33.53)
+    assert max(rings) == max(abs(row - far_row), abs(col - far_col))
+
+
+def test_rings_are_bounded_near_pole(rings: List[int]) -> None:
+    # Далеко от занятых ячеек обход ограничен радиусом, а не краем сетки
+    far = build_index(1, [location(1, -MAX_LATITUDE, LONGITUDE), location(2, MAX_LATITUDE, LONGITUDE + 90)])
+    assert far.nearest(MAX_LATITUDE, LONGITUDE, 5, 100) == []
+    assert max(rings) <= 120